@@ -0,0 +1,32 @@
+"""add catalog versions
+
+Revision ID: 436280718c5d
+Revises: 31f5be7fd441
+Create Date: 2026-10-19 10:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '436280718c5d'
+down_revision: Union[str, Sequence[str], None] = '31f5be7fd441'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tenants', sa.Column('catalog_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('products', sa.Column('catalog_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_index('ix_products_tenant_catalog_version', 'products', ['tenant_id', 'catalog_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_tenant_catalog_version', table_name='products')
+    op.drop_column('products', 'catalog_version')
+    op.drop_column('tenants', 'catalog_version')
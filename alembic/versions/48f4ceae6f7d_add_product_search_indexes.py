@@ -0,0 +1,38 @@
+"""add product search indexes
+
+Revision ID: 48f4ceae6f7d
+Revises: 436280718c5d
+Create Date: 2026-10-19 11:03:27.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '48f4ceae6f7d'
+down_revision: Union[str, Sequence[str], None] = '436280718c5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # trigramas: ILIKE '%q%' y similarity() usan índice GIN en vez de seq scan
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_products_name_trgm', 'products', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_products_barcode_trgm', 'products', ['barcode'], unique=False,
+        postgresql_using='gin', postgresql_ops={'barcode': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_barcode_trgm', table_name='products')
+    op.drop_index('ix_products_name_trgm', table_name='products')
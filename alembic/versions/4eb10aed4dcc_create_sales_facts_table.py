@@ -0,0 +1,50 @@
+"""create sales facts table
+
+Revision ID: 4eb10aed4dcc
+Revises: b7973c9f514d
+Create Date: 2026-10-19 14:16:33.507412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4eb10aed4dcc'
+down_revision: Union[str, Sequence[str], None] = 'b7973c9f514d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # historial existente: python -m app.scripts.rebuild_sales_facts --all
+    op.create_table(
+        'sales_facts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('payment_method', sa.String(length=20), nullable=False),
+        sa.Column('sale_date', sa.Date(), nullable=False),
+        sa.Column('hour', sa.SmallInteger(), nullable=False),
+        sa.Column('sales_count', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('units', sa.Integer(), nullable=False),
+        sa.Column('voided_count', sa.Integer(), nullable=False),
+        sa.Column('voided_total', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'tenant_id', 'store_id', 'user_id', 'payment_method', 'sale_date', 'hour',
+            name='uq_sales_facts_grain',
+        ),
+    )
+    op.create_index('ix_sales_facts_tenant_date', 'sales_facts', ['tenant_id', 'sale_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sales_facts_tenant_date', table_name='sales_facts')
+    op.drop_table('sales_facts')
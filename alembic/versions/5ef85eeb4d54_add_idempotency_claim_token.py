@@ -0,0 +1,28 @@
+"""add idempotency claim token
+
+Revision ID: 5ef85eeb4d54
+Revises: 99599034513d
+Create Date: 2026-10-19 18:52:07.316094
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5ef85eeb4d54'
+down_revision: Union[str, Sequence[str], None] = '99599034513d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('idempotency_keys', sa.Column('claim_token', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_keys', 'claim_token')
@@ -0,0 +1,29 @@
+"""add idempotency headers
+
+Revision ID: 80d417e74075
+Revises: a59321132b7a
+Create Date: 2026-10-19 21:05:44.127530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '80d417e74075'
+down_revision: Union[str, Sequence[str], None] = 'a59321132b7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('idempotency_keys', sa.Column('headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_keys', 'headers')
@@ -0,0 +1,30 @@
+"""add sales client key
+
+Revision ID: 89b837c8ef67
+Revises: 48f4ceae6f7d
+Create Date: 2026-10-19 11:48:05.231876
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '89b837c8ef67'
+down_revision: Union[str, Sequence[str], None] = '48f4ceae6f7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sales', sa.Column('client_key', sa.String(length=64), nullable=True))
+    op.create_unique_constraint('uq_sales_tenant_client_key', 'sales', ['tenant_id', 'client_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_sales_tenant_client_key', 'sales', type_='unique')
+    op.drop_column('sales', 'client_key')
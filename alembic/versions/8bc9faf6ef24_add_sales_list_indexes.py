@@ -0,0 +1,42 @@
+"""add sales list indexes
+
+Revision ID: 8bc9faf6ef24
+Revises: e559e3899824
+Create Date: 2026-10-19 12:41:17.920533
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8bc9faf6ef24'
+down_revision: Union[str, Sequence[str], None] = 'e559e3899824'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_sales_tenant_store_created_id', 'sales',
+        ['tenant_id', 'store_id', 'created_at', 'id'], unique=False,
+    )
+    op.create_index(
+        'ix_sales_tenant_number_pattern', 'sales', ['tenant_id', 'number'], unique=False,
+        postgresql_ops={'number': 'varchar_pattern_ops'},
+    )
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_sales_number_trgm', 'sales', ['number'], unique=False,
+        postgresql_using='gin', postgresql_ops={'number': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sales_number_trgm', table_name='sales')
+    op.drop_index('ix_sales_tenant_number_pattern', table_name='sales')
+    op.drop_index('ix_sales_tenant_store_created_id', table_name='sales')
@@ -0,0 +1,31 @@
+"""add sales shift_id index
+
+Revision ID: 8f4ad87dc27f
+Revises: 5ef85eeb4d54
+Create Date: 2026-10-19 19:14:36.802251
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4ad87dc27f'
+down_revision: Union[str, Sequence[str], None] = '5ef85eeb4d54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_sales_shift_id', 'sales', ['shift_id'], unique=False,
+        postgresql_where=sa.text('shift_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sales_shift_id', table_name='sales')
@@ -0,0 +1,71 @@
+"""create jobs table
+
+Revision ID: 99599034513d
+Revises: b1c3228c18e9
+Create Date: 2026-10-19 17:41:22.508316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '99599034513d'
+down_revision: Union[str, Sequence[str], None] = 'b1c3228c18e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('priority', sa.SmallInteger(), server_default='0', nullable=False),
+        sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('dedupe_key', sa.String(length=100), nullable=True),
+        sa.Column('progress', sa.SmallInteger(), server_default='0', nullable=False),
+        sa.Column('progress_message', sa.String(length=255), nullable=True),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_jobs_ready', 'jobs', [sa.text('priority DESC'), 'run_at', 'id'], unique=False,
+        postgresql_where=sa.text("status = 'QUEUED'"),
+    )
+    op.create_index(
+        'ix_jobs_running_locked', 'jobs', ['locked_until'], unique=False,
+        postgresql_where=sa.text("status = 'RUNNING'"),
+    )
+    op.create_index(
+        'uq_jobs_pending_dedupe', 'jobs', ['kind', 'dedupe_key'], unique=True,
+        postgresql_where=sa.text("dedupe_key IS NOT NULL AND status IN ('QUEUED', 'RUNNING')"),
+    )
+    op.create_index('ix_jobs_tenant_created', 'jobs', ['tenant_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_tenant_created', table_name='jobs')
+    op.drop_index('uq_jobs_pending_dedupe', table_name='jobs')
+    op.drop_index('ix_jobs_running_locked', table_name='jobs')
+    op.drop_index('ix_jobs_ready', table_name='jobs')
+    op.drop_table('jobs')
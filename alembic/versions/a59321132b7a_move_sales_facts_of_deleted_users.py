@@ -0,0 +1,64 @@
+"""move sales facts of deleted users
+
+Revision ID: a59321132b7a
+Revises: 8f4ad87dc27f
+Create Date: 2026-10-19 20:26:51.734902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a59321132b7a'
+down_revision: Union[str, Sequence[str], None] = '8f4ad87dc27f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # sales.user_id es ON DELETE SET NULL y el grano de sales_facts usa COALESCE(user_id, 0):
+    # al borrar un usuario sus celdas se suman a las de user_id = 0 en la misma transacción,
+    # así las anulaciones posteriores (y rebuild_tenant) caen en la misma celda
+    op.execute("""
+        CREATE FUNCTION sales_facts_user_deleted() RETURNS trigger AS $$
+        BEGIN
+            -- mismo lock que record_sales/record_voids (compartido) frente a rebuild_tenant
+            PERFORM pg_advisory_xact_lock_shared(hashtext('sales_facts'), OLD.tenant_id);
+            WITH moved AS (
+                DELETE FROM sales_facts
+                WHERE tenant_id = OLD.tenant_id AND user_id = OLD.id
+                RETURNING *
+            )
+            INSERT INTO sales_facts (
+                tenant_id, store_id, user_id, payment_method, sale_date, hour,
+                sales_count, total, units, voided_count, voided_total
+            )
+            SELECT tenant_id, store_id, 0, payment_method, sale_date, hour,
+                   sales_count, total, units, voided_count, voided_total
+            FROM moved
+            ORDER BY store_id, payment_method, sale_date, hour
+            ON CONFLICT ON CONSTRAINT uq_sales_facts_grain DO UPDATE SET
+                sales_count = sales_facts.sales_count + EXCLUDED.sales_count,
+                total = sales_facts.total + EXCLUDED.total,
+                units = sales_facts.units + EXCLUDED.units,
+                voided_count = sales_facts.voided_count + EXCLUDED.voided_count,
+                voided_total = sales_facts.voided_total + EXCLUDED.voided_total;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_users_sales_facts
+        AFTER DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION sales_facts_user_deleted()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER trg_users_sales_facts ON users")
+    op.execute("DROP FUNCTION sales_facts_user_deleted()")
@@ -0,0 +1,69 @@
+"""create cash shifts table
+
+Revision ID: b1c3228c18e9
+Revises: e2b30d0a1d6d
+Create Date: 2026-10-19 15:03:48.219067
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c3228c18e9'
+down_revision: Union[str, Sequence[str], None] = 'e2b30d0a1d6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'cash_shifts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('opened_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('closed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('closed_by', sa.Integer(), nullable=True),
+        sa.Column('opening_cash', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('counted_cash', sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column('close_note', sa.String(length=255), nullable=True),
+        sa.Column('ticket_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('cash_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('cash_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+        sa.Column('yape_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('yape_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+        sa.Column('voided_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('voided_cash_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+        sa.Column('voided_yape_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['closed_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_cash_shifts_tenant_id'), 'cash_shifts', ['tenant_id'], unique=False)
+    op.create_index(
+        'uq_cash_shifts_open', 'cash_shifts', ['tenant_id', 'store_id', 'user_id'], unique=True,
+        postgresql_where=sa.text('closed_at IS NULL'),
+    )
+    op.create_index(
+        'ix_cash_shifts_tenant_store_opened', 'cash_shifts', ['tenant_id', 'store_id', 'opened_at'], unique=False,
+    )
+
+    op.add_column('sales', sa.Column('shift_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_sales_shift_id', 'sales', 'cash_shifts', ['shift_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_sales_shift_id', 'sales', type_='foreignkey')
+    op.drop_column('sales', 'shift_id')
+    op.drop_index('ix_cash_shifts_tenant_store_opened', table_name='cash_shifts')
+    op.drop_index('uq_cash_shifts_open', table_name='cash_shifts')
+    op.drop_index(op.f('ix_cash_shifts_tenant_id'), table_name='cash_shifts')
+    op.drop_table('cash_shifts')
@@ -0,0 +1,33 @@
+"""add movements stock index
+
+Revision ID: b7973c9f514d
+Revises: c8e98cfcf006
+Create Date: 2026-10-19 13:47:52.381904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7973c9f514d'
+down_revision: Union[str, Sequence[str], None] = 'c8e98cfcf006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SUM(quantity * direction) por (tenant, store, product) sin leer el heap
+    op.create_index(
+        'ix_inventory_movements_tenant_store_product', 'inventory_movements',
+        ['tenant_id', 'store_id', 'product_id'], unique=False,
+        postgresql_include=['quantity', 'direction'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_movements_tenant_store_product', table_name='inventory_movements')
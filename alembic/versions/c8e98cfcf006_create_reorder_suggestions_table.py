@@ -0,0 +1,53 @@
+"""create reorder suggestions table
+
+Revision ID: c8e98cfcf006
+Revises: 8bc9faf6ef24
+Create Date: 2026-10-19 13:22:09.114270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e98cfcf006'
+down_revision: Union[str, Sequence[str], None] = '8bc9faf6ef24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reorder_suggestions',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('avg_daily_demand', sa.Float(), nullable=False),
+        sa.Column('demand_std', sa.Float(), nullable=False),
+        sa.Column('stock', sa.Integer(), nullable=False),
+        sa.Column('days_of_cover', sa.Float(), nullable=True),
+        sa.Column('safety_stock', sa.Integer(), nullable=False),
+        sa.Column('reorder_point', sa.Integer(), nullable=False),
+        sa.Column('suggested_quantity', sa.Integer(), nullable=False),
+        sa.Column('window_days', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'store_id', 'product_id', name='uq_reorder_suggestions_tenant_store_product'),
+    )
+    op.create_index(
+        'ix_reorder_suggestions_tenant_store_cover', 'reorder_suggestions',
+        ['tenant_id', 'store_id', 'days_of_cover'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reorder_suggestions_tenant_store_cover', table_name='reorder_suggestions')
+    op.drop_table('reorder_suggestions')
@@ -0,0 +1,31 @@
+"""add sales yape operation index
+
+Revision ID: e2b30d0a1d6d
+Revises: 4eb10aed4dcc
+Create Date: 2026-10-19 14:40:26.775190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b30d0a1d6d'
+down_revision: Union[str, Sequence[str], None] = '4eb10aed4dcc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_sales_tenant_yape_operation', 'sales', ['tenant_id', 'yape_operation_number'], unique=False,
+        postgresql_where=sa.text('yape_operation_number IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sales_tenant_yape_operation', table_name='sales')
@@ -13,6 +13,55 @@ class Settings:
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_EXPIRE_MINUTES: int = int(os.getenv("JWT_EXPIRE_MINUTES", "60"))
 
+    # Slow query log (0 = desactivado)
+    SLOW_QUERY_THRESHOLD_MS: int = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+    SLOW_QUERY_LOG_PATH: str = os.getenv("SLOW_QUERY_LOG_PATH", "logs/slow_queries.jsonl")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUPS: int = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+    # fracción de SELECT lentos a los que se les captura EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0"))
+
+    # Cache en proceso de barcode -> producto (TTL 0 = desactivado)
+    BARCODE_CACHE_MAX_PER_TENANT: int = int(os.getenv("BARCODE_CACHE_MAX_PER_TENANT", "5000"))
+    # otros workers no ven las invalidaciones: el TTL acota cuánto puede durar un dato viejo
+    BARCODE_CACHE_TTL_SECONDS: float = float(os.getenv("BARCODE_CACHE_TTL_SECONDS", "60"))
+
+    # Idempotency-Key en endpoints mutantes
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+    # si el proceso dueño muere, la clave se libera pasado este tiempo
+    IDEMPOTENCY_LOCK_SECONDS: int = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+    # cuánto espera un duplicado concurrente al primero antes de responder 409
+    IDEMPOTENCY_WAIT_SECONDS: float = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+    IDEMPOTENCY_MEMORY_ENTRIES: int = int(os.getenv("IDEMPOTENCY_MEMORY_ENTRIES", "10000"))
+
+    # Exportaciones en streaming: filas por fetch del cursor del servidor
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+    # Parquet por tenant y mes para analítica offline (app/services/parquet_export.py)
+    ANALYTICS_EXPORT_DIR: str = os.getenv("ANALYTICS_EXPORT_DIR", "analytics")
+    # reportes /analytics/* con DuckDB embebido sobre ese export (opcional: pip install duckdb)
+    ANALYTICS_ENABLED: bool = os.getenv("ANALYTICS_ENABLED", "false").lower() in ("1", "true", "yes")
+    ANALYTICS_DUCKDB_THREADS: int = int(os.getenv("ANALYTICS_DUCKDB_THREADS", "2"))
+    ANALYTICS_TIMEZONE: str = os.getenv("ANALYTICS_TIMEZONE", "America/Lima")
+
+    # Sugerencias de reposición (app/scripts/compute_reorder.py)
+    REORDER_WINDOW_DAYS: int = int(os.getenv("REORDER_WINDOW_DAYS", "90"))
+    REORDER_LEAD_TIME_DAYS: int = int(os.getenv("REORDER_LEAD_TIME_DAYS", "7"))
+    REORDER_REVIEW_DAYS: int = int(os.getenv("REORDER_REVIEW_DAYS", "7"))
+    # z del nivel de servicio (1.65 ~ 95%)
+    REORDER_SERVICE_Z: float = float(os.getenv("REORDER_SERVICE_Z", "1.65"))
+
+    # Cola de trabajos en segundo plano (app/scripts/run_worker.py)
+    JOBS_WORKER_PROCESSES: int = int(os.getenv("JOBS_WORKER_PROCESSES", "2"))
+    JOBS_POLL_SECONDS: float = float(os.getenv("JOBS_POLL_SECONDS", "2"))
+    # el worker renueva el lock de sus trabajos; si muere, vuelven a la cola pasado este tiempo
+    JOBS_VISIBILITY_TIMEOUT_SECONDS: int = int(os.getenv("JOBS_VISIBILITY_TIMEOUT_SECONDS", "300"))
+    JOBS_MAX_ATTEMPTS: int = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+    # reintento n espera base * 2^(n-1), con tope
+    JOBS_BACKOFF_BASE_SECONDS: int = int(os.getenv("JOBS_BACKOFF_BASE_SECONDS", "30"))
+    JOBS_BACKOFF_MAX_SECONDS: int = int(os.getenv("JOBS_BACKOFF_MAX_SECONDS", "3600"))
+    # trabajos terminados que se conservan para GET /jobs/{id}
+    JOBS_RETENTION_DAYS: int = int(os.getenv("JOBS_RETENTION_DAYS", "7"))
+
     @property
     def DATABASE_URL(self) -> str:
         # psycopg2 driver
@@ -2,12 +2,16 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.slow_query import install_slow_query_log
 
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # evita conexiones muertas
 )
 
+# registra statements lentos (+ EXPLAIN muestreado) en logs/slow_queries.jsonl
+install_slow_query_log(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.request_context import set_tenant_id
 from app.models.user import User
 from typing import List
 from fastapi import Depends, HTTPException, status
@@ -45,6 +46,7 @@ def get_current_user(
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
+    set_tenant_id(user.tenant_id)
     return user
 
 def require_roles(allowed_roles: List[str]):
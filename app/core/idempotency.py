@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import logging
+import time
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services import idempotency as store
+from app.services.idempotency import StoredResponse, memory_store
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 128
+POLL_INTERVAL_SECONDS = 0.1
+
+logger = logging.getLogger("app.idempotency")
+
+# requests en curso en este proceso: los duplicados esperan el Event en vez de
+# consultar la base en bucle
+_inflight: dict[tuple[str, str], asyncio.Event] = {}
+
+
+def _scope(request: Request) -> str | None:
+    # solo se decodifica el JWT (sin DB); la autenticación real la hace el endpoint
+    auth = request.headers.get("authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    sub = payload.get("sub")
+    return f"user:{sub}" if sub else None
+
+
+def _fingerprint(request: Request, body: bytes) -> str:
+    h = hashlib.sha256()
+    h.update(f"{request.method} {request.url.path}?{request.url.query}\n".encode())
+    h.update(body)
+    return h.hexdigest()
+
+
+def _raw_response(content: bytes, status_code: int, headers: list[tuple[str, str]]) -> Response:
+    # lista de pares y no dict: conserva headers repetidos (Set-Cookie, Vary...)
+    response = Response(content=content, status_code=status_code)
+    response.raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+    return response
+
+
+def _replay(stored: StoredResponse, fingerprint: str) -> Response:
+    if stored.fingerprint != fingerprint:
+        return JSONResponse(
+            status_code=422,
+            content={"detail": "Idempotency-Key already used with a different request"},
+        )
+    if stored.headers is None:
+        # respuestas guardadas antes de la columna headers
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type=stored.content_type,
+            headers={"Idempotent-Replayed": "true"},
+        )
+    return _raw_response(stored.body, stored.status_code, [*stored.headers, ("idempotent-replayed", "true")])
+
+
+async def idempotency_middleware(request: Request, call_next):
+    key = request.headers.get("idempotency-key")
+    if request.method not in MUTATING_METHODS or not key:
+        return await call_next(request)
+    if len(key) > MAX_KEY_LENGTH:
+        return JSONResponse(status_code=400, content={"detail": "Idempotency-Key too long"})
+
+    scope = _scope(request)
+    if scope is None:
+        # sin token válido el endpoint responde 401; no hay nada que cachear
+        return await call_next(request)
+
+    body = await request.body()
+    fingerprint = _fingerprint(request, body)
+    ident = (scope, key)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+
+    while True:
+        stored = memory_store.get(ident)
+        if stored is not None:
+            return _replay(stored, fingerprint)
+
+        # duplicado concurrente en este mismo proceso
+        event = _inflight.get(ident)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout=max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                break
+            continue
+
+        event = _inflight[ident] = asyncio.Event()
+        try:
+            outcome, claimed = await run_in_threadpool(
+                store.claim, scope, key, request.method, request.url.path, fingerprint
+            )
+            if outcome == "completed":
+                memory_store.put(ident, claimed)
+                return _replay(claimed, fingerprint)
+            if outcome == "owner":
+                return await _execute(request, call_next, ident, claimed, fingerprint)
+        finally:
+            del _inflight[ident]
+            event.set()
+
+        # otro proceso lo está ejecutando: se consulta la base hasta que termine
+        if time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    return JSONResponse(
+        status_code=409,
+        content={"detail": "A request with this Idempotency-Key is still in progress"},
+    )
+
+
+async def _heartbeat(scope: str, key: str, token: str) -> None:
+    # mientras el request corre la toma no vence (un batch lento no se ejecuta dos veces);
+    # si el proceso muere, el heartbeat se corta y la clave se libera en IDEMPOTENCY_LOCK_SECONDS
+    interval = settings.IDEMPOTENCY_LOCK_SECONDS / 3
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if not await run_in_threadpool(store.heartbeat, scope, key, token):
+                logger.warning("idempotency key %s/%s lost while in progress", scope, key)
+                return
+        except Exception:
+            logger.exception("idempotency heartbeat failed for %s/%s", scope, key)
+
+
+async def _execute(request: Request, call_next, ident: tuple[str, str], token: str, fingerprint: str) -> Response:
+    scope, key = ident
+    beat = asyncio.create_task(_heartbeat(scope, key, token))
+    try:
+        response = await call_next(request)
+        content = b"".join([chunk async for chunk in response.body_iterator])
+    except BaseException:
+        beat.cancel()
+        await run_in_threadpool(store.release, scope, key, token)
+        raise
+    beat.cancel()
+    headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in response.raw_headers]
+
+    if response.status_code >= 500:
+        # los errores del servidor no se cachean: el cliente puede reintentar
+        await run_in_threadpool(store.release, scope, key, token)
+    else:
+        stored = StoredResponse(fingerprint, response.status_code, content, response.headers.get("content-type"), headers)
+        await run_in_threadpool(store.complete, scope, key, token, stored)
+        memory_store.put(ident, stored)
+
+    return _raw_response(content, response.status_code, headers)
@@ -0,0 +1,27 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+# Cursores opacos para keyset pagination: base64(json) de la última fila servida
+
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: tuple[str, ...]) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, dict) or any(k not in values for k in keys):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def like_escape(term: str) -> str:
+    # para usar con .ilike(..., escape="\\")
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
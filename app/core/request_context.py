@@ -0,0 +1,36 @@
+from contextvars import ContextVar, Token
+
+# Contexto por request (ruta y tenant) para logs de bajo nivel (ej: slow queries).
+# Se guarda un dict mutable: las dependencias sync corren en el threadpool con una
+# copia del contexto, así que mutamos el mismo objeto en lugar de hacer .set()
+_request_context: ContextVar[dict | None] = ContextVar("request_context", default=None)
+
+
+def begin_request(method: str, scope: dict) -> Token:
+    # scope es el mismo dict que el router completa con la ruta matcheada
+    return _request_context.set({"method": method, "scope": scope, "tenant_id": None})
+
+
+def end_request(token: Token) -> None:
+    _request_context.reset(token)
+
+
+def set_tenant_id(tenant_id: int) -> None:
+    ctx = _request_context.get()
+    if ctx is not None:
+        ctx["tenant_id"] = tenant_id
+
+
+def _route(ctx: dict) -> str:
+    # plantilla de la ruta (/sales/{sale_id}), no la URL: agrupa todas las ventas en una
+    scope = ctx["scope"]
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path")
+    return f"{ctx['method']} {path}"
+
+
+def get_request_context() -> dict:
+    ctx = _request_context.get()
+    if ctx is None:
+        return {"route": None, "tenant_id": None}
+    return {"route": _route(ctx), "tenant_id": ctx["tenant_id"]}
@@ -0,0 +1,19 @@
+import orjson
+from fastapi.responses import Response
+from sqlalchemy.engine import Result
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        # OPT_UTC_Z: mismo formato de fechas UTC que Pydantic ("...Z")
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def rows_response(result: Result) -> FastJSONResponse:
+    # Fast path para listados grandes: filas -> bytes con orjson, sin construir ni
+    # validar modelos Pydantic. Las columnas deben venir con los nombres del schema
+    # documentado y con tipos JSON nativos (ej: Numeric casteado a Float en SQL).
+    keys = list(result.keys())
+    return FastJSONResponse([dict(zip(keys, row)) for row in result])
@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.request_context import get_request_context
+
+logger = logging.getLogger("app.slow_query")
+
+
+def _param_shape(parameters):
+    # Solo tipos, nunca valores (pueden traer datos de clientes)
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: forma del primer set + cantidad
+            return {"rows": len(parameters), "shape": _param_shape(parameters[0])}
+        return [type(v).__name__ for v in parameters]
+    return None
+
+
+def _should_explain(statement: str, executemany: bool) -> bool:
+    if executemany or settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE <= 0:
+        return False
+    head = statement.lstrip().upper()
+    if not head.startswith("SELECT") or "FOR UPDATE" in head:
+        return False
+    return random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+
+
+def _explain(conn, statement: str, parameters):
+    # Cursor nuevo sobre la misma conexión: el cursor original aún no fue leído.
+    # SAVEPOINT para que un EXPLAIN fallido no deje abortada la transacción de la request
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+            plan = cursor.fetchone()[0]
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as exc:  # el plan es best-effort, nunca rompe la request
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return {"error": str(exc)}
+    except Exception as exc:
+        return {"error": str(exc)}
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _handle_error(exception_context):
+    # el statement falló: no llega a after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    ctx = get_request_context()
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round(elapsed_ms, 2),
+        "statement": statement,
+        "params": _param_shape(parameters),
+        "route": ctx["route"],
+        "tenant_id": ctx["tenant_id"],
+    }
+    if _should_explain(statement, executemany):
+        record["plan"] = _explain(conn, statement, parameters)
+
+    logger.info(json.dumps(record, default=str))
+
+
+def install_slow_query_log(engine: Engine) -> None:
+    if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+        return
+
+    if not logger.handlers:
+        log_dir = os.path.dirname(settings.SLOW_QUERY_LOG_PATH)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        handler = RotatingFileHandler(
+            settings.SLOW_QUERY_LOG_PATH,
+            maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def top_slow_queries(limit: int = 20) -> list[dict]:
+    # Agrega el archivo actual + los rotados (.1, .2, ...) por statement
+    paths = [settings.SLOW_QUERY_LOG_PATH] + [
+        f"{settings.SLOW_QUERY_LOG_PATH}.{i}" for i in range(1, settings.SLOW_QUERY_LOG_BACKUPS + 1)
+    ]
+
+    stats: dict[str, dict] = {}
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                s = stats.setdefault(rec["statement"], {
+                    "statement": rec["statement"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": set(),
+                    "last_seen": None,
+                    "last_plan": None,
+                    "_plan_ts": None,
+                })
+                s["count"] += 1
+                s["total_ms"] += rec["duration_ms"]
+                s["max_ms"] = max(s["max_ms"], rec["duration_ms"])
+                if rec.get("route"):
+                    s["routes"].add(rec["route"])
+                if s["last_seen"] is None or rec["ts"] > s["last_seen"]:
+                    s["last_seen"] = rec["ts"]
+                if rec.get("plan") is not None and (s["_plan_ts"] is None or rec["ts"] > s["_plan_ts"]):
+                    s["_plan_ts"] = rec["ts"]
+                    s["last_plan"] = rec["plan"]
+
+    top = sorted(stats.values(), key=lambda s: s["total_ms"], reverse=True)[:limit]
+    for s in top:
+        s["total_ms"] = round(s["total_ms"], 2)
+        s["avg_ms"] = round(s["total_ms"] / s["count"], 2)
+        s["routes"] = sorted(s["routes"])
+        del s["_plan_ts"]
+    return top
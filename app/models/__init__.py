@@ -8,3 +8,8 @@ from app.models.inventory_movement import InventoryMovement  # noqa: F401
 from app.models.sale import Sale  # noqa: F401
 from app.models.sale_item import SaleItem  # noqa: F401
 
+from app.models.idempotency_key import IdempotencyKey  # noqa: F401
+from app.models.reorder_suggestion import ReorderSuggestion  # noqa: F401
+from app.models.sales_fact import SalesFact  # noqa: F401
+from app.models.cash_shift import CashShift  # noqa: F401
+from app.models.job import Job  # noqa: F401
@@ -0,0 +1,48 @@
+from sqlalchemy import ForeignKey, String, DateTime, func, Numeric, Integer, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class CashShift(Base):
+    # Turno de caja. Los totales se actualizan en la misma transacción que
+    # create_sale / batch / void_sale (app/services/shifts.py): cerrar el turno
+    # e imprimir el reporte Z no recorre las ventas.
+    __tablename__ = "cash_shifts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
+    store_id: Mapped[int] = mapped_column(ForeignKey("stores.id", ondelete="CASCADE"), nullable=False)
+    # cajero dueño del turno
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    opened_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    closed_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    closed_by: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    opening_cash: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    # efectivo contado al cerrar
+    counted_cash: Mapped[float | None] = mapped_column(Numeric(12, 2), nullable=True)
+    close_note: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # ventas registradas en el turno (brutas)
+    ticket_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    cash_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    cash_total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    yape_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    yape_total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+
+    # anulaciones hechas durante el turno (de ventas de este u otro turno ya cerrado)
+    voided_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    voided_cash_total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    voided_yape_total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # un solo turno abierto por cajero y tienda
+        Index(
+            "uq_cash_shifts_open", "tenant_id", "store_id", "user_id",
+            unique=True, postgresql_where=text("closed_at IS NULL"),
+        ),
+        Index("ix_cash_shifts_tenant_store_opened", "tenant_id", "store_id", "opened_at"),
+    )
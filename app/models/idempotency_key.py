@@ -0,0 +1,39 @@
+from sqlalchemy import String, DateTime, func, Integer, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    # quién envía la clave (ej: user:12); la misma clave de otro usuario es otra entrada
+    scope: Mapped[str] = mapped_column(String(64), nullable=False)
+    key: Mapped[str] = mapped_column(String(128), nullable=False)
+
+    method: Mapped[str] = mapped_column(String(10), nullable=False)
+    path: Mapped[str] = mapped_column(String(255), nullable=False)
+    # sha256 de método + ruta + query + body
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    state: Mapped[str] = mapped_column(String(20), nullable=False)  # IN_PROGRESS | COMPLETED
+    # identifica la toma vigente: complete/release/heartbeat de una toma vieja no hacen nada
+    claim_token: Mapped[str | None] = mapped_column(String(32), nullable=True)
+
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # headers originales como lista de [nombre, valor] (se repiten: ej. varios Set-Cookie)
+    headers: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # IN_PROGRESS: vence IDEMPOTENCY_LOCK_SECONDS después del último heartbeat del dueño;
+    # COMPLETED: en IDEMPOTENCY_TTL_SECONDS
+    expires_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import String, ForeignKey, Integer, DateTime, func
+from sqlalchemy import String, ForeignKey, Integer, DateTime, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -50,3 +50,11 @@ class InventoryMovement(Base):
     store = relationship("Store", backref="inventory_movements")
     product = relationship("Product", backref="inventory_movements")
     user = relationship("User", backref="inventory_movements")
+
+    __table_args__ = (
+        # stock por tienda/producto con index-only scan (stock_subquery, /reports/*)
+        Index(
+            "ix_inventory_movements_tenant_store_product", "tenant_id", "store_id", "product_id",
+            postgresql_include=["quantity", "direction"],
+        ),
+    )
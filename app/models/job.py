@@ -0,0 +1,56 @@
+from sqlalchemy import ForeignKey, String, Text, DateTime, func, Integer, SmallInteger, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class Job(Base):
+    # Cola de trabajos en segundo plano (app/services/jobs.py, worker: app/scripts/run_worker.py)
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    # NULL: trabajo de mantenimiento global (no de un tenant)
+    tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="QUEUED")  # QUEUED | RUNNING | DONE | FAILED
+    # mayor = antes
+    priority: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default="0")
+    # no se toma antes de run_at (reintentos con backoff o trabajos programados)
+    run_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    # visibilidad: si el worker muere, el trabajo vuelve a la cola pasado locked_until
+    locked_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    locked_until: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # evita encolar dos veces el mismo trabajo mientras está pendiente (ej: parquet_export:3)
+    dedupe_key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    progress: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default="0")  # 0..100
+    progress_message: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_by: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # claim: solo las filas en cola, en el orden en que se toman
+        Index(
+            "ix_jobs_ready", text("priority DESC"), "run_at", "id",
+            postgresql_where=text("status = 'QUEUED'"),
+        ),
+        Index("ix_jobs_running_locked", "locked_until", postgresql_where=text("status = 'RUNNING'")),
+        Index(
+            "uq_jobs_pending_dedupe", "kind", "dedupe_key", unique=True,
+            postgresql_where=text("dedupe_key IS NOT NULL AND status IN ('QUEUED', 'RUNNING')"),
+        ),
+        Index("ix_jobs_tenant_created", "tenant_id", "created_at"),
+    )
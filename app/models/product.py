@@ -1,4 +1,4 @@
-from sqlalchemy import String, Boolean, ForeignKey, Numeric, UniqueConstraint
+from sqlalchemy import String, Boolean, ForeignKey, Numeric, UniqueConstraint, BigInteger, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -25,9 +25,17 @@ class Product(Base):
 
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
 
+    # versión del catálogo del tenant en la que cambió este producto por última vez
+    catalog_version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
     tenant = relationship("Tenant", backref="products")
 
     __table_args__ = (
         # barcode único por empresa (tenant)
         UniqueConstraint("tenant_id", "barcode", name="uq_products_tenant_barcode"),
+        # GET /products/changes?since=
+        Index("ix_products_tenant_catalog_version", "tenant_id", "catalog_version"),
+        # búsqueda por trigramas (requiere la extensión pg_trgm)
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_products_barcode_trgm", "barcode", postgresql_using="gin", postgresql_ops={"barcode": "gin_trgm_ops"}),
     )
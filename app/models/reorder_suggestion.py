@@ -0,0 +1,36 @@
+from sqlalchemy import ForeignKey, Integer, Float, DateTime, func, UniqueConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ReorderSuggestion(Base):
+    # resultado del job app/scripts/compute_reorder.py (se reemplaza por tienda en cada corrida)
+    __tablename__ = "reorder_suggestions"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    store_id: Mapped[int] = mapped_column(ForeignKey("stores.id", ondelete="CASCADE"), nullable=False)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+
+    # demanda diaria (unidades vendidas, ventas no anuladas) en la ventana
+    avg_daily_demand: Mapped[float] = mapped_column(Float, nullable=False)
+    demand_std: Mapped[float] = mapped_column(Float, nullable=False)
+
+    stock: Mapped[int] = mapped_column(Integer, nullable=False)
+    # NULL: sin demanda en la ventana
+    days_of_cover: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    safety_stock: Mapped[int] = mapped_column(Integer, nullable=False)
+    reorder_point: Mapped[int] = mapped_column(Integer, nullable=False)
+    suggested_quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    window_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    computed_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "store_id", "product_id", name="uq_reorder_suggestions_tenant_store_product"),
+        # GET /inventory/reorder-suggestions: lo más urgente primero
+        Index("ix_reorder_suggestions_tenant_store_cover", "tenant_id", "store_id", "days_of_cover"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String, Boolean, DateTime, func, Numeric, Integer
+from sqlalchemy import ForeignKey, String, Boolean, DateTime, func, Numeric, Integer, UniqueConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -25,4 +25,31 @@ class Sale(Base):
 
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+    # clave de idempotencia del POS (ventas sincronizadas offline vía /sales/batch)
+    client_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    # turno de caja en el que se registró (NULL: venta sin turno abierto)
+    shift_id: Mapped[int | None] = mapped_column(ForeignKey("cash_shifts.id", ondelete="SET NULL"), nullable=True)
+
     items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # un reintento con la misma clave nunca crea otra venta
+        UniqueConstraint("tenant_id", "client_key", name="uq_sales_tenant_client_key"),
+        # GET /sales: filtro por tienda + keyset (created_at, id)
+        Index("ix_sales_tenant_store_created_id", "tenant_id", "store_id", "created_at", "id"),
+        # number exacto y por prefijo (LIKE 'x%')
+        Index(
+            "ix_sales_tenant_number_pattern", "tenant_id", "number",
+            postgresql_ops={"number": "varchar_pattern_ops"},
+        ),
+        # number contiene (ILIKE '%x%'), requiere pg_trgm
+        Index("ix_sales_number_trgm", "number", postgresql_using="gin", postgresql_ops={"number": "gin_trgm_ops"}),
+        # conciliación Yape: búsqueda por número de operación (solo filas que lo tienen)
+        Index(
+            "ix_sales_tenant_yape_operation", "tenant_id", "yape_operation_number",
+            postgresql_where=text("yape_operation_number IS NOT NULL"),
+        ),
+        # FK a cash_shifts (ON DELETE SET NULL) y ventas de un turno
+        Index("ix_sales_shift_id", "shift_id", postgresql_where=text("shift_id IS NOT NULL")),
+    )
@@ -0,0 +1,39 @@
+from sqlalchemy import String, Integer, Date, Numeric, SmallInteger, UniqueConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class SalesFact(Base):
+    # Ventas pre-agregadas por tienda/vendedor/medio de pago/día/hora (hora local).
+    # Se mantiene en la misma transacción que create_sale / batch / void_sale
+    # (app/services/sales_facts.py) y se puede reconstruir con app/scripts/rebuild_sales_facts.py
+    __tablename__ = "sales_facts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    tenant_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    store_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # 0 = venta sin usuario (usuario eliminado); así el grano no tiene NULLs. Al borrar un
+    # usuario el trigger trg_users_sales_facts pasa sus celdas a 0 en la misma transacción
+    # (sales.user_id queda NULL por el SET NULL y las anulaciones restan de la celda 0)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    payment_method: Mapped[str] = mapped_column(String(20), nullable=False)
+    sale_date: Mapped[Date] = mapped_column(Date, nullable=False)
+    hour: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    # ventas vigentes (una anulación las resta)
+    sales_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    voided_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    voided_total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "store_id", "user_id", "payment_method", "sale_date", "hour",
+            name="uq_sales_facts_grain",
+        ),
+        Index("ix_sales_facts_tenant_date", "tenant_id", "sale_date"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, BigInteger
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
@@ -8,3 +8,6 @@ class Tenant(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(150), nullable=False, unique=True)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+
+    # se incrementa con cada cambio del catálogo (ETag / sync incremental de los POS)
+    catalog_version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
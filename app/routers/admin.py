@@ -1,9 +1,24 @@
-from fastapi import APIRouter, Depends
-from app.core.dependencies import require_roles
+from fastapi import APIRouter, Depends, Query
+from app.core.dependencies import require_roles, require_super_admin
+from app.core.slow_query import top_slow_queries
 from app.models.user import User
+from app.services.barcode_cache import barcode_cache
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 @router.get("/ping")
 def admin_ping(current_user: User = Depends(require_roles(["ADMIN"]))):
     return {"message": "Admin access granted"}
+
+# Top statements lentos por tiempo total (SUPER_ADMIN, es información de toda la plataforma)
+@router.get("/slow-queries")
+def slow_queries(
+    limit: int = Query(default=20, ge=1, le=200),
+    current_user: User = Depends(require_super_admin),
+):
+    return top_slow_queries(limit)
+
+# Métricas del cache de barcodes de este proceso (SUPER_ADMIN)
+@router.get("/barcode-cache")
+def barcode_cache_stats(current_user: User = Depends(require_super_admin)):
+    return barcode_cache.stats()
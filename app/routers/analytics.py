@@ -0,0 +1,48 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_roles
+from app.models.user import User
+from app.services.analytics import REPORTS, run_report
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+# Reportes pesados (multi-año) sobre el export Parquet con DuckDB embebido:
+# no tocan Postgres. La respuesta incluye "watermark" (último mes exportado).
+
+
+@router.get("/reports")
+def list_reports(
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    return {"reports": sorted(REPORTS)}
+
+
+@router.get("/{report}")
+def get_report(
+    report: str,
+    store_id: int | None = Query(default=None),
+    date_from: date | None = Query(default=None),
+    date_to: date | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    if report not in REPORTS:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    result = run_report(current_user.tenant_id, report, store_id, date_from, date_to)
+
+    if report == "sales-by-seller":
+        # nombres desde Postgres (una consulta chica por ids)
+        ids = [r["user_id"] for r in result["rows"] if r["user_id"] is not None]
+        names = dict(db.execute(
+            select(User.id, User.full_name).where(User.tenant_id == current_user.tenant_id, User.id.in_(ids))
+        ).all()) if ids else {}
+        for r in result["rows"]:
+            r["user_name"] = names.get(r["user_id"])
+
+    return result
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 from sqlalchemy import cast, Date
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
@@ -10,6 +10,7 @@ from app.models.sale import Sale
 from app.models.sale_item import SaleItem
 from app.models.product import Product
 from app.models.inventory_movement import InventoryMovement
+from app.models.store import Store
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -196,3 +197,113 @@ def sales_series(
 
     rows = db.execute(stmt).mappings().all()
     return list(rows)
+
+
+def _delta_pct(current: float, previous: float) -> float | None:
+    if not previous:
+        return None
+    return round((current - previous) / previous * 100, 2)
+
+
+@router.get("/stores")
+def dashboard_stores(
+    low_stock_threshold: int = Query(default=5, ge=0, le=9999),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    tenant_id = current_user.tenant_id
+
+    now = datetime.now()
+    today = _start_of_today()
+    yesterday = today - timedelta(days=1)
+    month = _start_of_month()
+    last_month = (month - timedelta(days=1)).replace(day=1)
+    # mismo tramo del período anterior: ayer hasta esta hora, mes pasado hasta este día/hora
+    yesterday_cut = now - timedelta(days=1)
+    last_month_cut = min(last_month + (now - month), month)
+
+    # =========================
+    # Ventas: un GROUP BY store_id desde el inicio del mes pasado, métricas con FILTER
+    # =========================
+    ok = Sale.is_voided == False
+
+    def _sum(*conds):
+        return func.coalesce(func.sum(Sale.total).filter(*conds), 0)
+
+    sales_rows = db.execute(
+        select(
+            Sale.store_id,
+            _sum(ok, Sale.created_at >= today).label("sales_today"),
+            _sum(ok, Sale.created_at >= yesterday, Sale.created_at < yesterday_cut).label("sales_yesterday_to_time"),
+            _sum(ok, Sale.created_at >= month).label("sales_month"),
+            _sum(ok, Sale.created_at >= last_month, Sale.created_at < last_month_cut).label("sales_last_month_to_date"),
+            _sum(Sale.is_voided == True, Sale.created_at >= month).label("voided_month"),
+            func.count().filter(ok, Sale.created_at >= today).label("tickets_today"),
+            func.count().filter(ok, Sale.created_at >= month).label("tickets_month"),
+            func.count().filter(ok, Sale.created_at >= last_month, Sale.created_at < last_month_cut).label("tickets_last_month_to_date"),
+        )
+        .where(Sale.tenant_id == tenant_id)
+        .where(Sale.created_at >= last_month)
+        .group_by(Sale.store_id)
+    ).mappings().all()
+    sales_by_store = {r["store_id"]: r for r in sales_rows}
+
+    # =========================
+    # Stock crítico: un GROUP BY store_id sobre el stock por (tienda, producto activo).
+    # Un producto sin movimientos en la tienda tiene stock 0 (también es crítico),
+    # por eso se cuentan los que están POR ENCIMA del umbral y se restan del total.
+    # =========================
+    products_total = db.execute(
+        select(func.count(Product.id)).where(Product.tenant_id == tenant_id, Product.is_active == True)
+    ).scalar_one()
+
+    stock_subq = (
+        select(
+            InventoryMovement.store_id.label("store_id"),
+            InventoryMovement.product_id.label("product_id"),
+            func.sum(InventoryMovement.quantity * InventoryMovement.direction).label("stock"),
+        )
+        .where(InventoryMovement.tenant_id == tenant_id)
+        .group_by(InventoryMovement.store_id, InventoryMovement.product_id)
+        .subquery()
+    )
+    above_rows = db.execute(
+        select(stock_subq.c.store_id, func.count().label("above"))
+        .join(Product, Product.id == stock_subq.c.product_id)
+        .where(Product.is_active == True, stock_subq.c.stock > low_stock_threshold)
+        .group_by(stock_subq.c.store_id)
+    ).all()
+    above_by_store = {r.store_id: r.above for r in above_rows}
+
+    stores = db.execute(
+        select(Store.id, Store.name).where(Store.tenant_id == tenant_id).order_by(Store.id)
+    ).all()
+
+    out = []
+    for store in stores:
+        r = sales_by_store.get(store.id, {})
+        sales_today = float(r.get("sales_today", 0))
+        sales_yesterday = float(r.get("sales_yesterday_to_time", 0))
+        sales_month = float(r.get("sales_month", 0))
+        sales_last_month = float(r.get("sales_last_month_to_date", 0))
+        tickets_month = int(r.get("tickets_month", 0))
+        tickets_last_month = int(r.get("tickets_last_month_to_date", 0))
+        avg_ticket = round(sales_month / tickets_month, 2) if tickets_month else 0.0
+        avg_ticket_last = round(sales_last_month / tickets_last_month, 2) if tickets_last_month else 0.0
+
+        out.append({
+            "store_id": store.id,
+            "name": store.name,
+            "sales_today": sales_today,
+            "sales_today_delta_pct": _delta_pct(sales_today, sales_yesterday),
+            "sales_month": sales_month,
+            "sales_month_delta_pct": _delta_pct(sales_month, sales_last_month),
+            "voided_month": float(r.get("voided_month", 0)),
+            "tickets_today": int(r.get("tickets_today", 0)),
+            "tickets_month": tickets_month,
+            "avg_ticket_month": avg_ticket,
+            "avg_ticket_delta_pct": _delta_pct(avg_ticket, avg_ticket_last),
+            "low_stock_count": int(products_total - above_by_store.get(store.id, 0)),
+        })
+
+    return out
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_roles
+from app.models.user import User
+from app.services.exports import (
+    MEDIA_TYPES,
+    sales_export_query,
+    movements_export_query,
+    stream_export,
+)
+from app.services.jobs import enqueue
+from app.services.parquet_export import load_manifest
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+def _export_response(stmt, fmt: str, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.now():%Y%m%d-%H%M%S}.{fmt}"
+    return StreamingResponse(
+        stream_export(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# SALES: ventas (level=sale) o líneas de venta (level=item) (ADMIN)
+@router.get("/sales")
+def export_sales(
+    store_id: int | None = Query(None),
+    date_from: datetime | None = Query(None),
+    date_to: datetime | None = Query(None),
+    level: str = Query(default="sale", pattern="^(sale|item)$"),
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    stmt = sales_export_query(current_user.tenant_id, store_id, date_from, date_to, level)
+    return _export_response(stmt, format, "sales" if level == "sale" else "sale-items")
+
+
+# MOVEMENTS: kardex completo (ADMIN, ALMACEN)
+@router.get("/movements")
+def export_movements(
+    store_id: int | None = Query(None),
+    date_from: datetime | None = Query(None),
+    date_to: datetime | None = Query(None),
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(require_roles(["ADMIN", "ALMACEN"])),
+):
+    stmt = movements_export_query(current_user.tenant_id, store_id, date_from, date_to)
+    return _export_response(stmt, format, "movements")
+
+
+# PARQUET: export incremental por mes para analítica (ADMIN)
+@router.post("/parquet", status_code=status.HTTP_202_ACCEPTED)
+def schedule_parquet_export(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    # lo corre el worker (app/scripts/run_worker.py); si ya hay uno pendiente, devuelve ese
+    job_id = enqueue(
+        db, "parquet_export", current_user.tenant_id,
+        dedupe_key=f"parquet_export:{current_user.tenant_id}", created_by=current_user.id,
+    )
+    db.commit()
+    return {"status": "queued", "job_id": job_id, "manifest": load_manifest(current_user.tenant_id)}
+
+
+@router.get("/parquet")
+def get_parquet_manifest(
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    return load_manifest(current_user.tenant_id)
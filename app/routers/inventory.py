@@ -1,15 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, func
+from sqlalchemy import select, func, cast, Float
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import require_roles
 from app.models.inventory_movement import InventoryMovement
 from app.models.product import Product
+from app.models.reorder_suggestion import ReorderSuggestion
 from app.models.store import Store
 from app.models.user import User
 from app.core.dependencies import get_current_user
-from app.schemas.inventory import MovementCreate, MovementResponse, StockResponse, ProductStockResponse
+from app.core.pagination import encode_cursor, decode_cursor, like_escape
+from app.core.responses import rows_response
+from app.schemas.inventory import (
+    MovementCreate,
+    MovementResponse,
+    StockResponse,
+    ProductStockResponse,
+    ReorderSuggestionResponse,
+    StockMatrixResponse,
+)
+from app.services.barcode_cache import lookup_product_by_barcode
 from app.services.stock import get_stock
 
 router = APIRouter(prefix="/inventory", tags=["Inventory"])
@@ -73,33 +84,27 @@ def create_movement(
 
 
 @router.get("/stock", response_model=list[ProductStockResponse])
-
-def get_stock(
+def list_stock(
     store_id: int = Query(...),
     product_id: int | None = Query(None),
     search: str | None = Query(None),
+    fast: bool = Query(False, description="Serializa las filas directo con orjson (mismo esquema)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Base query
-    if search:
-        s = f"%{search.strip()}%"
-        query = query.where(
-            (Product.name.ilike(s)) | (Product.barcode.ilike(s))
-        )
-        
     stock_expr = func.coalesce(
         func.sum(InventoryMovement.quantity * InventoryMovement.direction),
         0
     ).label("stock")
 
+    # Base query (columnas con los nombres de ProductStockResponse)
     query = (
         select(
-            Product.id,
+            Product.id.label("product_id"),
             Product.name,
             Product.barcode,
             Product.category,
-            Product.price,
+            cast(Product.price, Float).label("price"),
             stock_expr,
         )
         .outerjoin(
@@ -112,24 +117,33 @@ def get_stock(
         .group_by(Product.id)
     )
 
+    if search:
+        s = f"%{search.strip()}%"
+        query = query.where(
+            (Product.name.ilike(s)) | (Product.barcode.ilike(s))
+        )
+
     # Si viene product_id → filtramos
     if product_id:
         query = query.where(Product.id == product_id)
 
+    if fast:
+        return rows_response(db.execute(query))
+
     results = db.execute(query).all()
 
     return [
         ProductStockResponse(
-            product_id=row.id,
+            product_id=row.product_id,
             name=row.name,
             barcode=row.barcode,
             category=row.category,
-            price=float(row.price),
+            price=row.price,
             stock=int(row.stock),
         )
         for row in results
     ]
-    
+
 @router.get("/stock/by-barcode", response_model=StockResponse)
 def stock_by_barcode(
     store_id: int,
@@ -143,11 +157,129 @@ def stock_by_barcode(
     if not store:
         raise HTTPException(status_code=400, detail="Invalid store_id")
 
-    product_id = db.execute(
-        select(Product.id).where(Product.tenant_id == current_user.tenant_id, Product.barcode == barcode.strip())
-    ).scalar_one_or_none()
-    if not product_id:
+    product = lookup_product_by_barcode(db, current_user.tenant_id, barcode.strip())
+    if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    stock = get_stock(db, current_user.tenant_id, store_id, int(product_id))
-    return {"store_id": store_id, "product_id": int(product_id), "stock": stock}
+    stock = get_stock(db, current_user.tenant_id, store_id, product["id"])
+    return {"store_id": store_id, "product_id": product["id"], "stock": stock}
+
+
+# MATRIX: stock producto × tienda de todo el tenant (ADMIN, ALMACEN)
+@router.get("/stock/matrix", response_model=StockMatrixResponse)
+def stock_matrix(
+    category: str | None = Query(None),
+    search: str | None = Query(None),
+    low_stock_below: int | None = Query(
+        None, ge=1, description="Solo productos con stock < N en alguna tienda (páginas pueden venir incompletas)"
+    ),
+    store_ids: list[int] | None = Query(None),
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: str | None = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "ALMACEN"])),
+):
+    tenant_id = current_user.tenant_id
+
+    stores_q = select(Store.id, Store.name).where(Store.tenant_id == tenant_id)
+    if store_ids:
+        stores_q = stores_q.where(Store.id.in_(store_ids))
+    stores = db.execute(stores_q.order_by(Store.id)).all()
+
+    # página de productos (keyset por id)
+    products_q = select(Product.id, Product.name, Product.barcode, Product.category).where(
+        Product.tenant_id == tenant_id, Product.is_active == True
+    )
+    if category:
+        products_q = products_q.where(Product.category == category)
+    if search:
+        term = f"%{like_escape(search.strip())}%"
+        products_q = products_q.where(Product.name.ilike(term, escape="\\") | Product.barcode.ilike(term, escape="\\"))
+    if cursor:
+        last = decode_cursor(cursor, ("id",))
+        try:
+            last_id = int(last["id"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        products_q = products_q.where(Product.id > last_id)
+    products = db.execute(products_q.order_by(Product.id).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_cursor({"id": products[-1].id})
+
+    # un solo GROUP BY (producto, tienda) para toda la página
+    cells = {}
+    if products and stores:
+        rows = db.execute(
+            select(
+                InventoryMovement.product_id,
+                InventoryMovement.store_id,
+                func.sum(InventoryMovement.quantity * InventoryMovement.direction).label("stock"),
+            )
+            .where(
+                InventoryMovement.tenant_id == tenant_id,
+                InventoryMovement.product_id.in_([p.id for p in products]),
+                InventoryMovement.store_id.in_([s.id for s in stores]),
+            )
+            .group_by(InventoryMovement.product_id, InventoryMovement.store_id)
+        ).all()
+        cells = {(r.product_id, r.store_id): int(r.stock) for r in rows}
+
+    out = {"product_ids": [], "names": [], "barcodes": [], "categories": [], "stock": []}
+    for p in products:
+        row = [cells.get((p.id, s.id), 0) for s in stores]
+        if low_stock_below is not None and not any(v < low_stock_below for v in row):
+            continue
+        out["product_ids"].append(p.id)
+        out["names"].append(p.name)
+        out["barcodes"].append(p.barcode)
+        out["categories"].append(p.category)
+        out["stock"].append(row)
+
+    return {"stores": [{"id": s.id, "name": s.name} for s in stores], **out, "next_cursor": next_cursor}
+
+
+# REORDER: sugerencias de reposición calculadas por app/scripts/compute_reorder.py (ADMIN, ALMACEN)
+@router.get("/reorder-suggestions", response_model=list[ReorderSuggestionResponse])
+def reorder_suggestions(
+    store_id: int = Query(...),
+    only_below_reorder_point: bool = Query(True),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "ALMACEN"])),
+):
+    q = (
+        select(
+            ReorderSuggestion.product_id,
+            Product.name,
+            Product.barcode,
+            ReorderSuggestion.stock,
+            ReorderSuggestion.avg_daily_demand,
+            ReorderSuggestion.demand_std,
+            ReorderSuggestion.days_of_cover,
+            ReorderSuggestion.safety_stock,
+            ReorderSuggestion.reorder_point,
+            ReorderSuggestion.suggested_quantity,
+            ReorderSuggestion.computed_at,
+        )
+        .join(Product, Product.id == ReorderSuggestion.product_id)
+        .where(
+            ReorderSuggestion.tenant_id == current_user.tenant_id,
+            ReorderSuggestion.store_id == store_id,
+        )
+    )
+
+    if only_below_reorder_point:
+        q = q.where(ReorderSuggestion.stock <= ReorderSuggestion.reorder_point)
+
+    # lo que se agota antes primero; sin demanda (cover NULL) al final
+    q = (
+        q.order_by(ReorderSuggestion.days_of_cover.asc().nulls_last(), ReorderSuggestion.product_id)
+        .limit(limit)
+        .offset(offset)
+    )
+
+    return db.execute(q).all()
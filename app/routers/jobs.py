@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, desc
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_roles
+from app.models.job import Job
+from app.models.user import User
+from app.schemas.jobs import JobResponse
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+# LIST trabajos recientes del tenant (ADMIN)
+@router.get("", response_model=list[JobResponse])
+def list_jobs(
+    kind: str | None = Query(None),
+    status: str | None = Query(None, pattern="^(QUEUED|RUNNING|DONE|FAILED)$"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    stmt = select(Job).where(Job.tenant_id == current_user.tenant_id)
+    if kind:
+        stmt = stmt.where(Job.kind == kind)
+    if status:
+        stmt = stmt.where(Job.status == status)
+    return db.execute(stmt.order_by(desc(Job.created_at), desc(Job.id)).limit(limit)).scalars().all()
+
+
+# GET estado / progreso de un trabajo (ADMIN)
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    job = db.execute(
+        select(Job).where(Job.id == job_id, Job.tenant_id == current_user.tenant_id)
+    ).scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,16 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
+from sqlalchemy import select, cast, Float, case, func, literal, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import require_roles
+from app.core.pagination import encode_cursor, decode_cursor, like_escape
+from app.core.responses import rows_response
 from app.models.product import Product
 from app.models.user import User
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductResponse,
+    ProductChangesResponse,
+    ProductSearchResponse,
+)
+from app.services.barcode_cache import barcode_cache, lookup_product_by_barcode
+from app.services.catalog import bump_catalog_version, get_catalog_version, catalog_etag, etag_matches
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
+# columnas de ProductResponse para el fast path (orjson)
+PRODUCT_RESPONSE_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.category,
+    Product.barcode,
+    cast(Product.price, Float).label("price"),
+    Product.image_url,
+    Product.is_active,
+)
+
 # CREATE product (ADMIN, ALMACEN)
 
 @router.post("", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
@@ -27,6 +48,7 @@ def create_product(
         price=payload.price,
         image_url=payload.image_url,
         is_active=True,
+        catalog_version=bump_catalog_version(db, current_user.tenant_id),
     )
     db.add(product)
     try:
@@ -35,6 +57,7 @@ def create_product(
         db.rollback()
         raise HTTPException(status_code=409, detail="Barcode already exists for this tenant")
 
+    barcode_cache.invalidate(current_user.tenant_id, product.barcode)
     db.refresh(product)
     return product
 
@@ -42,19 +65,123 @@ def create_product(
 
 @router.get("", response_model=list[ProductResponse])
 def list_products(
+    response: Response,
     q: str | None = None,
+    fast: bool = Query(False, description="Serializa las filas directo con orjson (mismo esquema)"),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles(["ADMIN", "ALMACEN", "VENDEDOR"])),
 ):
-    stmt = select(Product).where(Product.tenant_id == current_user.tenant_id)
+    # catálogo sin cambios → 304 sin tocar la tabla de productos
+    version = get_catalog_version(db, current_user.tenant_id)
+    headers = {
+        "ETag": catalog_etag(current_user.tenant_id, version, q.strip() if q else ""),
+        "X-Catalog-Version": str(version),
+        "Cache-Control": "private, no-cache",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    filters = [Product.tenant_id == current_user.tenant_id]
 
     if q:
         like = f"%{q.strip()}%"
-        stmt = stmt.where((Product.name.ilike(like)) | (Product.barcode.ilike(like)))
+        filters.append((Product.name.ilike(like)) | (Product.barcode.ilike(like)))
+
+    if fast:
+        fast_response = rows_response(
+            db.execute(select(*PRODUCT_RESPONSE_COLUMNS).where(*filters).order_by(Product.id.desc()))
+        )
+        fast_response.headers.update(headers)
+        return fast_response
 
-    products = db.execute(stmt.order_by(Product.id.desc())).scalars().all()
+    response.headers.update(headers)
+    products = db.execute(select(Product).where(*filters).order_by(Product.id.desc())).scalars().all()
     return products
 
+# DELTA SYNC del catálogo (ADMIN, ALMACEN, VENDEDOR)
+
+@router.get("/changes", response_model=ProductChangesResponse)
+def product_changes(
+    since: int = Query(..., ge=0, description="Última versión sincronizada (X-Catalog-Version)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "ALMACEN", "VENDEDOR"])),
+):
+    version = get_catalog_version(db, current_user.tenant_id)
+    if since >= version:
+        return {"version": version, "products": []}
+
+    products = db.execute(
+        select(Product)
+        .where(
+            Product.tenant_id == current_user.tenant_id,
+            Product.catalog_version > since,
+            Product.catalog_version <= version,
+        )
+        .order_by(Product.catalog_version, Product.id)
+    ).scalars().all()
+
+    return {"version": version, "products": products}
+
+# SEARCH typeahead paginado (ADMIN, ALMACEN, VENDEDOR)
+
+@router.get("/search", response_model=ProductSearchResponse)
+def search_products(
+    q: str = Query(..., min_length=3, max_length=80),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    include_inactive: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "ALMACEN", "VENDEDOR"])),
+):
+    term = q.strip()
+    if len(term) < 3:
+        raise HTTPException(status_code=400, detail="q must have at least 3 characters")
+
+    contains = f"%{like_escape(term)}%"
+    prefix = f"{like_escape(term)}%"
+
+    # ranking: barcode exacto > prefijo de barcode > prefijo de nombre > resto,
+    # desempate por similitud de trigramas con el nombre
+    rank = cast(
+        case(
+            (Product.barcode == term, 3.0),
+            (Product.barcode.like(prefix, escape="\\"), 2.0),
+            (Product.name.ilike(prefix, escape="\\"), 1.0),
+            else_=0.0,
+        )
+        + func.similarity(Product.name, term),
+        Float,
+    )
+
+    # ILIKE '%q%' sobre name/barcode se resuelve con los índices GIN pg_trgm
+    stmt = select(Product, rank.label("rank")).where(
+        Product.tenant_id == current_user.tenant_id,
+        (Product.name.ilike(contains, escape="\\")) | (Product.barcode.ilike(contains, escape="\\")),
+    )
+    if not include_inactive:
+        stmt = stmt.where(Product.is_active == True)
+
+    if cursor:
+        last = decode_cursor(cursor, ("rank", "id"))
+        try:
+            last_rank = float(last["rank"])
+            last_id = int(last["id"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(
+            tuple_(rank, Product.id) < tuple_(literal(last_rank, Float), literal(last_id))
+        )
+
+    rows = db.execute(stmt.order_by(rank.desc(), Product.id.desc()).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"rank": rows[-1].rank, "id": rows[-1].Product.id})
+
+    return {"items": [row.Product for row in rows], "next_cursor": next_cursor}
+
 # GET product by barcode (ADMIN, ALMACEN, VENDEDOR)
 
 @router.get("/by-barcode/{barcode}", response_model=ProductResponse)
@@ -63,15 +190,10 @@ def get_by_barcode(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles(["ADMIN", "ALMACEN", "VENDEDOR"])),
 ):
-    product = db.execute(
-        select(Product).where(
-            Product.tenant_id == current_user.tenant_id,
-            Product.barcode == barcode.strip(),
-            Product.is_active == True,
-        )
-    ).scalar_one_or_none()
+    # cache en proceso: el lookup por barcode se hace en cada beep del scanner
+    product = lookup_product_by_barcode(db, current_user.tenant_id, barcode.strip())
 
-    if not product:
+    if not product or not product["is_active"]:
         raise HTTPException(status_code=404, detail="Product not found")
 
     return product
@@ -92,6 +214,8 @@ def update_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
+    old_barcode = product.barcode
+
     if payload.name is not None:
         product.name = payload.name
     if payload.category is not None:
@@ -105,11 +229,14 @@ def update_product(
     if payload.is_active is not None:
         product.is_active = payload.is_active
 
+    product.catalog_version = bump_catalog_version(db, current_user.tenant_id)
+
     try:
         db.commit()
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=409, detail="Barcode already exists for this tenant")
 
+    barcode_cache.invalidate(current_user.tenant_id, old_barcode, product.barcode)
     db.refresh(product)
     return product
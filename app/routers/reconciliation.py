@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_roles
+from app.models.user import User
+from app.services.yape_reconciliation import load_statement, reconcile
+
+router = APIRouter(prefix="/reconciliation", tags=["Reconciliation"])
+
+
+# YAPE: concilia ventas YAPE contra el extracto (CSV con número de operación y monto) (ADMIN)
+@router.post("/yape")
+def reconcile_yape(
+    file: UploadFile = File(..., description="CSV con columnas operation_number y amount"),
+    date_from: datetime | None = Query(None),
+    date_to: datetime | None = Query(None),
+    store_id: int | None = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    # el extracto va a una tabla temporal y se cruza en SQL; no se guarda nada
+    loaded = load_statement(db, file.file)
+    result = reconcile(db, current_user.tenant_id, date_from, date_to, store_id)
+    db.rollback()  # descarta la tabla temporal
+
+    result["summary"]["statement_rows"] = loaded["rows_loaded"]
+    result["invalid_rows"] = loaded["invalid_rows"]
+    return result
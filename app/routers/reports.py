@@ -0,0 +1,237 @@
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, func, cast, Float, Integer, literal
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_roles
+from app.core.pagination import encode_cursor, decode_cursor
+from app.models.product import Product
+from app.models.sale import Sale
+from app.models.sale_item import SaleItem
+from app.models.sales_fact import SalesFact
+from app.models.store import Store
+from app.models.user import User
+from app.schemas.reports import ValuationResponse, TurnoverResponse, SalesBreakdownResponse
+from app.services.stock import stock_subquery
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+# Reportes por tienda paginados por product_id (keyset). Cada página: 1 query para
+# los ids y 1 query set-based (GROUP BY) con los agregados de esos productos, así el
+# costo por página no depende del tamaño del catálogo ni de la historia.
+
+
+def _check_store(db: Session, tenant_id: int, store_id: int) -> None:
+    store_ok = db.execute(
+        select(Store.id).where(Store.id == store_id, Store.tenant_id == tenant_id)
+    ).scalar_one_or_none()
+    if not store_ok:
+        raise HTTPException(status_code=400, detail="Invalid store_id")
+
+
+def _product_page(
+    db: Session, tenant_id: int, cursor: str | None, limit: int, include_inactive: bool
+) -> tuple[list[int], str | None]:
+    stmt = select(Product.id).where(Product.tenant_id == tenant_id)
+    if not include_inactive:
+        stmt = stmt.where(Product.is_active == True)
+    if cursor:
+        last = decode_cursor(cursor, ("id",))
+        try:
+            last_id = int(last["id"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(Product.id > last_id)
+
+    ids = db.execute(stmt.order_by(Product.id).limit(limit + 1)).scalars().all()
+    next_cursor = None
+    if len(ids) > limit:
+        ids = ids[:limit]
+        next_cursor = encode_cursor({"id": ids[-1]})
+    return ids, next_cursor
+
+
+# INVENTORY VALUATION: stock × precio por producto (ADMIN, ALMACEN)
+@router.get("/inventory-valuation", response_model=ValuationResponse)
+def inventory_valuation(
+    store_id: int = Query(...),
+    limit: int = Query(500, ge=1, le=2000),
+    cursor: str | None = Query(None),
+    include_inactive: bool = Query(False),
+    include_totals: bool = Query(False, description="Totales de la tienda (recorre todo el kardex)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "ALMACEN"])),
+):
+    tenant_id = current_user.tenant_id
+    _check_store(db, tenant_id, store_id)
+
+    ids, next_cursor = _product_page(db, tenant_id, cursor, limit, include_inactive)
+
+    items = []
+    if ids:
+        stock = stock_subquery(tenant_id, store_id, ids)
+        on_hand = func.coalesce(stock.c.stock, 0)
+        items = db.execute(
+            select(
+                Product.id.label("product_id"),
+                Product.name,
+                Product.barcode,
+                Product.category,
+                cast(Product.price, Float).label("price"),
+                cast(on_hand, Integer).label("on_hand"),
+                cast(Product.price * on_hand, Float).label("value"),
+            )
+            .outerjoin(stock, stock.c.product_id == Product.id)
+            .where(Product.tenant_id == tenant_id, Product.id.in_(ids))
+            .order_by(Product.id)
+        ).mappings().all()
+
+    totals = None
+    if include_totals:
+        stock = stock_subquery(tenant_id, store_id)
+        filters = [Product.tenant_id == tenant_id]
+        if not include_inactive:
+            filters.append(Product.is_active == True)
+        row = db.execute(
+            select(
+                func.count().label("products"),
+                func.coalesce(func.sum(stock.c.stock), 0).label("units"),
+                cast(func.coalesce(func.sum(Product.price * stock.c.stock), 0), Float).label("value"),
+            )
+            .select_from(stock)
+            .join(Product, Product.id == stock.c.product_id)
+            .where(*filters)
+        ).one()
+        totals = {"products": row.products, "units": int(row.units), "value": row.value}
+
+    return {"store_id": store_id, "items": items, "next_cursor": next_cursor, "totals": totals}
+
+
+# TURNOVER: rotación, cobertura y stock muerto por producto (ADMIN, ALMACEN)
+@router.get("/turnover", response_model=TurnoverResponse)
+def turnover(
+    store_id: int = Query(...),
+    window_days: int = Query(90, ge=1, le=730),
+    dead_after_days: int = Query(90, ge=1, le=3650, description="Sin ventas hace más de N días = stock muerto"),
+    only_dead_stock: bool = Query(False, description="Las páginas pueden traer menos de limit filas"),
+    limit: int = Query(500, ge=1, le=2000),
+    cursor: str | None = Query(None),
+    include_inactive: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "ALMACEN"])),
+):
+    tenant_id = current_user.tenant_id
+    _check_store(db, tenant_id, store_id)
+
+    ids, next_cursor = _product_page(db, tenant_id, cursor, limit, include_inactive)
+    if not ids:
+        return {"store_id": store_id, "window_days": window_days, "items": [], "next_cursor": next_cursor}
+
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=window_days)
+
+    stock = stock_subquery(tenant_id, store_id, ids)
+    sold = (
+        select(
+            SaleItem.product_id.label("product_id"),
+            func.coalesce(func.sum(SaleItem.quantity).filter(Sale.created_at >= since), 0).label("units_sold"),
+            func.max(Sale.created_at).label("last_sale_at"),
+        )
+        .join(Sale, Sale.id == SaleItem.sale_id)
+        .where(
+            Sale.tenant_id == tenant_id,
+            Sale.store_id == store_id,
+            Sale.is_voided == False,
+            SaleItem.product_id.in_(ids),
+        )
+        .group_by(SaleItem.product_id)
+        .subquery()
+    )
+
+    on_hand = cast(func.coalesce(stock.c.stock, 0), Integer)
+    units_sold = cast(func.coalesce(sold.c.units_sold, 0), Integer)
+    days_since = cast(func.floor(func.extract("epoch", literal(now) - sold.c.last_sale_at) / 86400), Integer)
+    is_dead = (on_hand > 0) & (
+        sold.c.last_sale_at.is_(None) | (sold.c.last_sale_at < now - timedelta(days=dead_after_days))
+    )
+
+    q = (
+        select(
+            Product.id.label("product_id"),
+            Product.name,
+            Product.barcode,
+            on_hand.label("on_hand"),
+            units_sold.label("units_sold"),
+            (cast(units_sold, Float) / func.nullif(on_hand, 0)).label("turnover"),
+            (cast(on_hand, Float) / func.nullif(cast(units_sold, Float) / window_days, 0)).label("days_of_cover"),
+            sold.c.last_sale_at,
+            days_since.label("days_since_last_sale"),
+            is_dead.label("is_dead_stock"),
+        )
+        .outerjoin(stock, stock.c.product_id == Product.id)
+        .outerjoin(sold, sold.c.product_id == Product.id)
+        .where(Product.tenant_id == tenant_id, Product.id.in_(ids))
+        .order_by(Product.id)
+    )
+    if only_dead_stock:
+        q = q.where(is_dead)
+
+    items = db.execute(q).mappings().all()
+    return {"store_id": store_id, "window_days": window_days, "items": items, "next_cursor": next_cursor}
+
+
+# SALES BREAKDOWN: desde sales_facts (pre-agregada por hora), no toca sales (ADMIN)
+@router.get("/sales-breakdown", response_model=SalesBreakdownResponse, response_model_exclude_unset=True)
+def sales_breakdown(
+    dimension: str = Query(..., pattern="^(seller|payment_method|hour_of_week|store)$"),
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    store_id: int | None = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN"])),
+):
+    if dimension == "seller":
+        dims = [SalesFact.user_id.label("user_id"), User.full_name.label("user_name")]
+    elif dimension == "payment_method":
+        dims = [SalesFact.payment_method.label("payment_method")]
+    elif dimension == "hour_of_week":
+        # 1 = lunes ... 7 = domingo (hora local)
+        dims = [cast(func.extract("isodow", SalesFact.sale_date), Integer).label("day_of_week"), SalesFact.hour.label("hour")]
+    else:
+        dims = [SalesFact.store_id.label("store_id"), Store.name.label("store_name")]
+
+    total = func.sum(SalesFact.total)
+    sales_count = func.sum(SalesFact.sales_count)
+    stmt = select(
+        *dims,
+        cast(sales_count, Integer).label("sales_count"),
+        cast(total, Float).label("total"),
+        cast(func.sum(SalesFact.units), Integer).label("units"),
+        cast(total / func.nullif(sales_count, 0), Float).label("avg_ticket"),
+        cast(func.sum(SalesFact.voided_count), Integer).label("voided_count"),
+        cast(func.sum(SalesFact.voided_total), Float).label("voided_total"),
+    ).where(SalesFact.tenant_id == current_user.tenant_id)
+
+    if dimension == "seller":
+        stmt = stmt.outerjoin(User, User.id == SalesFact.user_id)
+    elif dimension == "store":
+        stmt = stmt.join(Store, Store.id == SalesFact.store_id)
+
+    if store_id is not None:
+        stmt = stmt.where(SalesFact.store_id == store_id)
+    if date_from:
+        stmt = stmt.where(SalesFact.sale_date >= date_from)
+    if date_to:
+        stmt = stmt.where(SalesFact.sale_date <= date_to)
+
+    stmt = stmt.group_by(*dims)
+    if dimension == "hour_of_week":
+        stmt = stmt.order_by(*dims)
+    else:
+        stmt = stmt.order_by(total.desc())
+
+    rows = db.execute(stmt).mappings().all()
+    # dict por fila: solo las columnas de la dimensión quedan "set" (exclude_unset)
+    return {"dimension": dimension, "date_from": date_from, "date_to": date_to, "rows": [dict(r) for r in rows]}
@@ -1,24 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, desc
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select, desc, cast, Float, func, literal, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload, joinedload
 from datetime import datetime
 
 
 from app.core.database import get_db
 from app.core.dependencies import require_roles
+from app.core.pagination import encode_cursor, decode_cursor, like_escape
+from app.core.responses import FastJSONResponse
 from app.models.inventory_movement import InventoryMovement
 from app.models.product import Product
 from app.models.sale import Sale
 from app.models.sale_item import SaleItem
 from app.models.store import Store
 from app.models.user import User
-from app.schemas.sales import SaleCreate, SaleResponse, SaleListItem
-from app.services.stock import get_stock
-from app.services.sales_number import generate_sale_number
+from app.schemas.sales import (
+    SaleCreate,
+    SaleResponse,
+    SaleListItem,
+    SaleQuoteRequest,
+    SaleQuoteResponse,
+    SaleBatchRequest,
+    SaleBatchResponse,
+)
+from app.services.stock import stock_subquery
+from app.services.sales_facts import record_sales, record_voids
+from app.services.sales_number import generate_sale_number, generate_sale_numbers
+from app.services.shifts import record_shift_sales, record_shift_batch, record_shift_void
 from app.schemas.sales import SaleVoidRequest
 
 router = APIRouter(prefix="/sales", tags=["Sales"])
 
+# columnas de SaleListItem para el fast path (orjson)
+SALE_LIST_COLUMNS = (
+    Sale.id,
+    Sale.number,
+    Sale.store_id,
+    Sale.payment_method,
+    Sale.yape_operation_number,
+    cast(Sale.total, Float).label("total"),
+    Sale.created_at,
+)
+
+
+def _merge_items(items) -> dict[int, int]:
+    # Consolidar items por product_id (si repiten el mismo producto)
+    merged = {}
+    for it in items:
+        if it.quantity <= 0:
+            raise HTTPException(status_code=400, detail="quantity must be > 0")
+        merged[it.product_id] = merged.get(it.product_id, 0) + it.quantity
+    return merged
+
+
+def _load_lines(db: Session, tenant_id: int, store_id: int, product_ids: list[int]) -> dict:
+    # productos del tenant + stock en la tienda, en una sola query
+    stock = stock_subquery(tenant_id, store_id, product_ids)
+    rows = db.execute(
+        select(
+            Product.id,
+            Product.name,
+            Product.price,
+            func.coalesce(stock.c.stock, 0).label("stock"),
+        )
+        .outerjoin(stock, stock.c.product_id == Product.id)
+        .where(Product.tenant_id == tenant_id, Product.id.in_(product_ids))
+    ).all()
+    return {row.id: row for row in rows}
+
+
+def _load_sale(db: Session, tenant_id: int, sale_id: int) -> Sale | None:
+    return db.execute(
+        select(Sale)
+        .options(joinedload(Sale.items))
+        .where(Sale.id == sale_id, Sale.tenant_id == tenant_id)
+    ).unique().scalar_one_or_none()
+
 
 @router.post("", response_model=SaleResponse, status_code=status.HTTP_201_CREATED)
 def create_sale(
@@ -47,38 +105,34 @@ def create_sale(
     if payload.payment_method == "YAPE" and (not payload.yape_operation_number or not payload.yape_operation_number.strip()):
         raise HTTPException(status_code=400, detail="yape_operation_number is required for YAPE")
 
-    # Consolidar items por product_id (si repiten el mismo producto)
-    merged = {}
-    for it in payload.items:
-        if it.quantity <= 0:
-            raise HTTPException(status_code=400, detail="quantity must be > 0")
-        merged[it.product_id] = merged.get(it.product_id, 0) + it.quantity
+    merged = _merge_items(payload.items)
 
     # validar productos y stock antes de guardar
-    products = db.execute(
-        select(Product).where(Product.tenant_id == current_user.tenant_id, Product.id.in_(list(merged.keys())))
-    ).scalars().all()
+    products = _load_lines(db, current_user.tenant_id, payload.store_id, list(merged.keys()))
 
     if len(products) != len(merged):
         raise HTTPException(status_code=400, detail="One or more products are invalid")
 
     # Stock check
-    for p in products:
-        available = get_stock(db, current_user.tenant_id, payload.store_id, p.id)
-        required = merged[p.id]
-        if available < required:
+    for p in products.values():
+        if p.stock < merged[p.id]:
             raise HTTPException(status_code=409, detail=f"Insufficient stock for product_id={p.id}")
 
     # calcular totales
     total = 0.0
     items_to_create: list[SaleItem] = []
-    for p in products:
+    for p in products.values():
         qty = merged[p.id]
         unit_price = float(p.price)
         subtotal = unit_price * qty
         total += subtotal
         items_to_create.append(SaleItem(product_id=p.id, quantity=qty, unit_price=unit_price, subtotal=subtotal))
 
+    # totales del turno de caja abierto (misma transacción que la venta)
+    shift_id = record_shift_sales(
+        db, current_user.tenant_id, payload.store_id, current_user.id, [(payload.payment_method, round(total, 2))]
+    )
+
     sale = Sale(
         tenant_id=current_user.tenant_id,
         store_id=payload.store_id,
@@ -88,6 +142,7 @@ def create_sale(
         yape_operation_number=payload.yape_operation_number.strip() if payload.yape_operation_number else None,
         total=round(total, 2),
         is_voided=False,
+        shift_id=shift_id,
     )
     sale.items = items_to_create
 
@@ -107,46 +162,348 @@ def create_sale(
             created_by=current_user.id,
         )
         db.add(mv)
+    record_sales(db, [sale.id])
     db.commit()
-    db.refresh(sale)
 
-    return sale
+    # venta + items en un solo SELECT (en vez de refresh + lazy load de items)
+    return _load_sale(db, current_user.tenant_id, sale.id)
+
+def _sale_payload(sale: Sale) -> dict:
+    # SaleResponse a partir de objetos en memoria (evita recargar items tras el commit)
+    return {
+        "id": sale.id,
+        "number": sale.number,
+        "store_id": sale.store_id,
+        "payment_method": sale.payment_method,
+        "yape_operation_number": sale.yape_operation_number,
+        "total": float(sale.total),
+        "items": [
+            {
+                "product_id": it.product_id,
+                "quantity": it.quantity,
+                "unit_price": float(it.unit_price),
+                "subtotal": float(it.subtotal),
+            }
+            for it in sale.items
+        ],
+    }
+
+
+# BATCH: sincroniza ventas offline del POS con claves de idempotencia (ADMIN, VENDEDOR)
+@router.post("/batch", response_model=SaleBatchResponse)
+def create_sales_batch(
+    payload: SaleBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
+):
+    tenant_id = current_user.tenant_id
+    results: list[dict | None] = [None] * len(payload.sales)
+
+    # 1) claves ya registradas → devolver la venta original
+    keys = list({entry.client_key for entry in payload.sales})
+    existing = {
+        sale.client_key: sale
+        for sale in db.execute(
+            select(Sale)
+            .options(selectinload(Sale.items))
+            .where(Sale.tenant_id == tenant_id, Sale.client_key.in_(keys))
+        ).scalars()
+    }
+
+    # 2) validaciones sin DB; las claves repetidas dentro del batch se resuelven al final
+    pending: list[tuple[int, object, dict[int, int]]] = []
+    first_index: dict[str, int] = {}
+    for i, entry in enumerate(payload.sales):
+        if entry.client_key in existing:
+            results[i] = {"status": "duplicate", "status_code": 200, "sale": _sale_payload(existing[entry.client_key])}
+            continue
+        if entry.client_key in first_index:
+            continue
+        first_index[entry.client_key] = i
+        try:
+            if not entry.items:
+                raise HTTPException(status_code=400, detail="Sale must have at least 1 item")
+            if entry.payment_method == "YAPE" and (not entry.yape_operation_number or not entry.yape_operation_number.strip()):
+                raise HTTPException(status_code=400, detail="yape_operation_number is required for YAPE")
+            pending.append((i, entry, _merge_items(entry.items)))
+        except HTTPException as exc:
+            results[i] = {"status": "error", "status_code": exc.status_code, "detail": exc.detail}
+
+    # 3) tiendas, precios y stock de todo el batch en 3 queries
+    store_ids = {entry.store_id for _, entry, _ in pending}
+    product_ids = {pid for _, _, merged in pending for pid in merged}
+    valid_stores = set(
+        db.execute(select(Store.id).where(Store.tenant_id == tenant_id, Store.id.in_(store_ids))).scalars()
+    ) if store_ids else set()
+    prices = dict(
+        db.execute(select(Product.id, Product.price).where(Product.tenant_id == tenant_id, Product.id.in_(product_ids))).all()
+    ) if product_ids else {}
+    available = {
+        (row.store_id, row.product_id): int(row.stock)
+        for row in db.execute(
+            select(
+                InventoryMovement.store_id,
+                InventoryMovement.product_id,
+                func.sum(InventoryMovement.quantity * InventoryMovement.direction).label("stock"),
+            )
+            .where(
+                InventoryMovement.tenant_id == tenant_id,
+                InventoryMovement.store_id.in_(valid_stores),
+                InventoryMovement.product_id.in_(product_ids),
+            )
+            .group_by(InventoryMovement.store_id, InventoryMovement.product_id)
+        )
+    } if valid_stores and product_ids else {}
+
+    # 4) aplicar en orden de llegada descontando el stock en memoria
+    accepted: list[tuple[int, object, dict[int, int]]] = []
+    for i, entry, merged in pending:
+        if entry.store_id not in valid_stores:
+            results[i] = {"status": "error", "status_code": 400, "detail": "Invalid store_id"}
+            continue
+        if any(pid not in prices for pid in merged):
+            results[i] = {"status": "error", "status_code": 400, "detail": "One or more products are invalid"}
+            continue
+        short = next((pid for pid, qty in merged.items() if available.get((entry.store_id, pid), 0) < qty), None)
+        if short is not None:
+            results[i] = {"status": "error", "status_code": 409, "detail": f"Insufficient stock for product_id={short}"}
+            continue
+        for pid, qty in merged.items():
+            available[(entry.store_id, pid)] = available.get((entry.store_id, pid), 0) - qty
+        accepted.append((i, entry, merged))
+
+    # 5) inserts en bloque: ventas+items en un flush, kardex en otro
+    sales: list[tuple[int, Sale]] = []
+    numbers = generate_sale_numbers(db, tenant_id, len(accepted)) if accepted else []
+    for (i, entry, merged), number in zip(accepted, numbers):
+        items = [
+            SaleItem(product_id=pid, quantity=qty, unit_price=float(prices[pid]), subtotal=float(prices[pid]) * qty)
+            for pid, qty in merged.items()
+        ]
+        sale = Sale(
+            tenant_id=tenant_id,
+            store_id=entry.store_id,
+            user_id=current_user.id,
+            number=number,
+            payment_method=entry.payment_method,
+            yape_operation_number=entry.yape_operation_number.strip() if entry.yape_operation_number else None,
+            total=round(sum(it.subtotal for it in items), 2),
+            is_voided=False,
+            client_key=entry.client_key,
+        )
+        sale.items = items
+        sales.append((i, sale))
+
+    if sales:
+        # un UPDATE por tienda al turno abierto del usuario
+        shifts = record_shift_batch(db, tenant_id, current_user.id, [sale for _, sale in sales])
+        for _, sale in sales:
+            sale.shift_id = shifts.get(sale.store_id)
+        db.add_all([sale for _, sale in sales])
+        db.flush()
+        db.add_all([
+            InventoryMovement(
+                tenant_id=tenant_id,
+                store_id=sale.store_id,
+                product_id=item.product_id,
+                movement_type="OUT",
+                quantity=item.quantity,
+                direction=-1,
+                note=f"Sale {sale.number}",
+                created_by=current_user.id,
+            )
+            for _, sale in sales
+            for item in sale.items
+        ])
+        record_sales(db, [sale.id for _, sale in sales])
+        for i, sale in sales:
+            results[i] = {"status": "created", "status_code": 201, "sale": _sale_payload(sale)}
+        try:
+            db.commit()
+        except IntegrityError:
+            # otro request con las mismas claves ganó la carrera: el reintento las verá como duplicadas
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Concurrent batch with the same client keys, retry")
+
+    # claves repetidas dentro del mismo batch → mismo resultado que su primera aparición
+    for i, entry in enumerate(payload.sales):
+        if results[i] is None:
+            first = results[first_index[entry.client_key]]
+            results[i] = {**first, "status": "duplicate", "status_code": 200} if first["status"] == "created" else dict(first)
+
+    for i, entry in enumerate(payload.sales):
+        results[i]["client_key"] = entry.client_key
+
+    return {
+        "created": sum(1 for r in results if r["status"] == "created"),
+        "duplicates": sum(1 for r in results if r["status"] == "duplicate"),
+        "errors": sum(1 for r in results if r["status"] == "error"),
+        "results": results,
+    }
+
+# QUOTE: valida y totaliza un carrito sin escribir nada (ADMIN, VENDEDOR)
+@router.post("/quote", response_model=SaleQuoteResponse)
+def quote_sale(
+    payload: SaleQuoteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
+):
+    store_ok = db.execute(
+        select(Store.id).where(Store.id == payload.store_id, Store.tenant_id == current_user.tenant_id)
+    ).scalar_one_or_none()
+    if not store_ok:
+        raise HTTPException(status_code=400, detail="Invalid store_id")
+
+    merged = _merge_items(payload.items)
+    products = _load_lines(db, current_user.tenant_id, payload.store_id, list(merged.keys())) if merged else {}
+
+    total = 0.0
+    lines = []
+    for product_id, qty in merged.items():
+        p = products.get(product_id)
+        if p is None:
+            lines.append({"product_id": product_id, "quantity": qty, "valid": False, "available": 0, "in_stock": False})
+            continue
+        unit_price = float(p.price)
+        subtotal = unit_price * qty
+        total += subtotal
+        lines.append({
+            "product_id": product_id,
+            "name": p.name,
+            "quantity": qty,
+            "unit_price": unit_price,
+            "subtotal": round(subtotal, 2),
+            "valid": True,
+            "available": int(p.stock),
+            "in_stock": p.stock >= qty,
+        })
+
+    return {
+        "store_id": payload.store_id,
+        "lines": lines,
+        "total": round(total, 2),
+        "can_checkout": bool(lines) and all(line["valid"] and line["in_stock"] for line in lines),
+    }
 
 @router.get("", response_model=list[SaleListItem])
 def list_sales(
+    response: Response,
     store_id: int = Query(...),
     date_from: datetime | None = Query(None),
     date_to: datetime | None = Query(None),
     payment_method: str | None = Query(None),
     number: str | None = Query(None),
+    number_match: str = Query(default="contains", pattern="^(exact|prefix|contains)$"),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="X-Next-Cursor de la página anterior"),
+    offset: int = Query(0, ge=0, deprecated=True),
+    include_total: bool = Query(False, description="Devuelve X-Total-Count"),
+    fast: bool = Query(False, description="Serializa las filas directo con orjson (mismo esquema)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
 ):
-    q = (
-        select(Sale)
-        .where(
-            Sale.tenant_id == current_user.tenant_id,
-            Sale.store_id == store_id,
-        )
-    )
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset")
+
+    # tenant + store + rango de fechas + orden (created_at, id) salen del índice
+    # ix_sales_tenant_store_created_id
+    filters = [
+        Sale.tenant_id == current_user.tenant_id,
+        Sale.store_id == store_id,
+    ]
 
     if payment_method:
-        q = q.where(Sale.payment_method == payment_method)
+        filters.append(Sale.payment_method == payment_method)
 
     if number:
-        q = q.where(Sale.number.ilike(f"%{number}%"))
+        term = number.strip()
+        if number_match == "exact":
+            filters.append(Sale.number == term)
+        elif number_match == "prefix":
+            # LIKE 'x%' usa ix_sales_tenant_number_pattern (varchar_pattern_ops)
+            filters.append(Sale.number.like(f"{like_escape(term)}%", escape="\\"))
+        else:
+            # ILIKE '%x%' usa el índice GIN de trigramas
+            filters.append(Sale.number.ilike(f"%{like_escape(term)}%", escape="\\"))
 
     if date_from:
-        q = q.where(Sale.created_at >= date_from)
+        filters.append(Sale.created_at >= date_from)
 
     if date_to:
-        q = q.where(Sale.created_at <= date_to)
+        filters.append(Sale.created_at <= date_to)
+
+    columns = list(SALE_LIST_COLUMNS if fast else (Sale,))
+    if include_total:
+        # mismo round trip: subconsulta escalar (InitPlan, se evalúa una vez)
+        columns.append(select(func.count()).select_from(Sale).where(*filters).scalar_subquery().label("total_count"))
+
+    q = select(*columns).where(*filters)
+
+    if cursor:
+        last = decode_cursor(cursor, ("created_at", "id"))
+        try:
+            last_created_at = datetime.fromisoformat(last["created_at"])
+            last_id = int(last["id"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        q = q.where(tuple_(Sale.created_at, Sale.id) < tuple_(literal(last_created_at), literal(last_id)))
+
+    q = q.order_by(desc(Sale.created_at), desc(Sale.id)).limit(limit + 1)
+    if offset:
+        q = q.offset(offset)
+
+    result = db.execute(q)
+    keys = [k for k in result.keys() if k != "total_count"]
+    rows = result.all()
+
+    headers = {}
+    if include_total:
+        if rows:
+            headers["X-Total-Count"] = str(rows[0].total_count)
+        else:
+            headers["X-Total-Count"] = str(
+                db.execute(select(func.count()).select_from(Sale).where(*filters)).scalar_one()
+            )
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1] if fast else rows[-1].Sale
+        headers["X-Next-Cursor"] = encode_cursor({"created_at": last_row.created_at.isoformat(), "id": last_row.id})
+
+    if fast:
+        fast_response = FastJSONResponse([{k: getattr(row, k) for k in keys} for row in rows])
+        fast_response.headers.update(headers)
+        return fast_response
+
+    response.headers.update(headers)
+    return [row.Sale for row in rows]
+
+# RECEIPTS: varias ventas con sus items para reimpresión (2 queries en total)
+@router.get("/receipts", response_model=list[SaleResponse])
+def get_receipts(
+    ids: list[int] = Query(..., min_length=1, max_length=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
+):
+    """Recibos completos (venta + items) de varias ventas: GET /sales/receipts?ids=1&ids=2.
+
+    Es una ruta aparte y no un parámetro ids en GET /sales: el listado exige store_id y
+    responde SaleListItem (sin items, paginado por cursor). Con ids el mismo endpoint
+    tendría dos esquemas de respuesta distintos en el contrato OpenAPI.
+    """
+    sales = db.execute(
+        select(Sale)
+        .options(selectinload(Sale.items))
+        .where(Sale.tenant_id == current_user.tenant_id, Sale.id.in_(set(ids)))
+    ).scalars().all()
 
-    q = q.order_by(desc(Sale.created_at)).limit(limit).offset(offset)
+    by_id = {sale.id: sale for sale in sales}
+    missing = [sale_id for sale_id in ids if sale_id not in by_id]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Sales not found: {missing}")
 
-    return db.execute(q).scalars().all()
+    # mismo orden que ids (sin repetir)
+    return [by_id[sale_id] for sale_id in dict.fromkeys(ids)]
 
 @router.get("/{sale_id}", response_model=SaleResponse)
 def get_sale(
@@ -154,10 +511,7 @@ def get_sale(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
 ):
-    sale = db.execute(
-        select(Sale)
-        .where(Sale.id == sale_id, Sale.tenant_id == current_user.tenant_id)
-    ).scalar_one_or_none()
+    sale = _load_sale(db, current_user.tenant_id, sale_id)
 
     if not sale:
         raise HTTPException(status_code=404, detail="Sale not found")
@@ -173,12 +527,12 @@ def void_sale(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles(["ADMIN"])),
 ):
-    # 1) Buscar venta del tenant
+    # 1) Buscar venta del tenant (bloqueada: dos anulaciones simultáneas no revierten dos veces)
     sale = db.execute(
         select(Sale).where(
             Sale.id == sale_id,
             Sale.tenant_id == current_user.tenant_id
-        )
+        ).with_for_update()
     ).scalar_one_or_none()
 
     if not sale:
@@ -215,6 +569,10 @@ def void_sale(
             )
         )
 
+    db.flush()
+    # mismo orden de locks que create_sale/batch: fila del turno y después sales_facts
+    record_shift_void(db, sale, current_user.id)
+    record_voids(db, [sale.id])
     db.commit()
 
     return {
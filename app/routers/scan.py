@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select, func, cast, Float
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_roles
+from app.models.product import Product
+from app.models.store import Store
+from app.models.user import User
+from app.schemas.scan import ScanRequest, ScanResponse
+from app.services.stock import stock_subquery
+
+router = APIRouter(prefix="/scan", tags=["Scan"])
+
+
+# SCAN: producto + stock de varios barcodes en una sola query (ADMIN, ALMACEN, VENDEDOR)
+@router.post("", response_model=ScanResponse)
+def scan(
+    payload: ScanRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "ALMACEN", "VENDEDOR"])),
+):
+    store = db.execute(
+        select(Store.id).where(Store.id == payload.store_id, Store.tenant_id == current_user.tenant_id)
+    ).scalar_one_or_none()
+    if not store:
+        raise HTTPException(status_code=400, detail="Invalid store_id")
+
+    # sin duplicados, respetando el orden de escaneo
+    barcodes = list(dict.fromkeys(b.strip() for b in payload.barcodes if b.strip()))
+    if not barcodes:
+        raise HTTPException(status_code=400, detail="barcodes must not be empty")
+
+    matched_ids = select(Product.id).where(
+        Product.tenant_id == current_user.tenant_id,
+        Product.barcode.in_(barcodes),
+    )
+    stock = stock_subquery(current_user.tenant_id, payload.store_id, matched_ids)
+
+    rows = db.execute(
+        select(
+            Product.id,
+            Product.name,
+            Product.category,
+            Product.barcode,
+            cast(Product.price, Float).label("price"),
+            Product.image_url,
+            Product.is_active,
+            func.coalesce(stock.c.stock, 0).label("stock"),
+        )
+        .outerjoin(stock, stock.c.product_id == Product.id)
+        .where(
+            Product.tenant_id == current_user.tenant_id,
+            Product.barcode.in_(barcodes),
+        )
+    ).mappings().all()
+
+    by_barcode = {row["barcode"]: row for row in rows}
+    items = []
+    for barcode in barcodes:
+        row = by_barcode.get(barcode)
+        if row is None:
+            items.append({"barcode": barcode, "found": False})
+            continue
+        product = dict(row)
+        stock_value = int(product.pop("stock"))
+        items.append({"barcode": barcode, "found": True, "product": product, "stock": stock_value})
+
+    return {"store_id": payload.store_id, "items": items}
@@ -0,0 +1,117 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_roles
+from app.models.cash_shift import CashShift
+from app.models.role import Role
+from app.models.store import Store
+from app.models.user import User
+from app.schemas.shifts import ShiftOpen, ShiftClose, ZReport
+from app.services.shifts import z_report
+
+router = APIRouter(prefix="/shifts", tags=["Cash shifts"])
+
+
+def _get_shift(db: Session, tenant_id: int, shift_id: int, for_update: bool = False) -> CashShift:
+    stmt = select(CashShift).where(CashShift.id == shift_id, CashShift.tenant_id == tenant_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    shift = db.execute(stmt).scalar_one_or_none()
+    if not shift:
+        raise HTTPException(status_code=404, detail="Shift not found")
+    return shift
+
+
+def _is_admin(db: Session, user: User) -> bool:
+    role_name = db.execute(select(Role.name).where(Role.id == user.role_id)).scalar_one_or_none()
+    return role_name == "ADMIN"
+
+
+# OPEN turno de caja del usuario en una tienda (ADMIN, VENDEDOR)
+@router.post("/open", response_model=ZReport, status_code=status.HTTP_201_CREATED)
+def open_shift(
+    payload: ShiftOpen,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
+):
+    store_ok = db.execute(
+        select(Store.id).where(Store.id == payload.store_id, Store.tenant_id == current_user.tenant_id)
+    ).scalar_one_or_none()
+    if not store_ok:
+        raise HTTPException(status_code=400, detail="Invalid store_id")
+
+    shift = CashShift(
+        tenant_id=current_user.tenant_id,
+        store_id=payload.store_id,
+        user_id=current_user.id,
+        opening_cash=round(payload.opening_cash, 2),
+    )
+    db.add(shift)
+    try:
+        db.commit()
+    except IntegrityError:
+        # uq_cash_shifts_open: ya tiene un turno abierto en esta tienda
+        db.rollback()
+        raise HTTPException(status_code=409, detail="You already have an open shift in this store")
+    db.refresh(shift)
+    return z_report(shift)
+
+
+# CURRENT turno abierto del usuario (ADMIN, VENDEDOR)
+@router.get("/current", response_model=ZReport)
+def current_shift(
+    store_id: int = Query(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
+):
+    shift = db.execute(
+        select(CashShift).where(
+            CashShift.tenant_id == current_user.tenant_id,
+            CashShift.store_id == store_id,
+            CashShift.user_id == current_user.id,
+            CashShift.closed_at.is_(None),
+        )
+    ).scalar_one_or_none()
+    if not shift:
+        raise HTTPException(status_code=404, detail="No open shift")
+    return z_report(shift)
+
+
+# CLOSE turno: el dueño del turno o un ADMIN. Devuelve el reporte Z
+@router.post("/{shift_id}/close", response_model=ZReport)
+def close_shift(
+    shift_id: int,
+    payload: ShiftClose,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
+):
+    # FOR UPDATE: espera a las ventas en curso del turno (tienen la fila bloqueada)
+    shift = _get_shift(db, current_user.tenant_id, shift_id, for_update=True)
+    if shift.user_id != current_user.id and not _is_admin(db, current_user):
+        raise HTTPException(status_code=403, detail="You cannot close another user's shift")
+    if shift.closed_at is not None:
+        raise HTTPException(status_code=409, detail="Shift already closed")
+
+    shift.closed_at = func.now()
+    shift.closed_by = current_user.id
+    shift.counted_cash = round(payload.counted_cash, 2)
+    shift.close_note = payload.note.strip() if payload.note else None
+    db.commit()
+    db.refresh(shift)
+    return z_report(shift)
+
+
+# Z-REPORT de un turno (abierto: parcial / X). Un VENDEDOR solo ve los suyos
+@router.get("/{shift_id}/z-report", response_model=ZReport)
+def get_z_report(
+    shift_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles(["ADMIN", "VENDEDOR"])),
+):
+    shift = _get_shift(db, current_user.tenant_id, shift_id)
+    if shift.user_id != current_user.id and not _is_admin(db, current_user):
+        raise HTTPException(status_code=403, detail="You cannot see another user's shift")
+    return z_report(shift)
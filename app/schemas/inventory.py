@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, Literal
+from datetime import datetime
 
 
 class MovementCreate(BaseModel):
@@ -34,6 +35,39 @@ class ProductStockResponse(BaseModel):
     product_id: int
     name: str
     barcode: str
-    category: str
+    category: Optional[str] = None
     price: float
-    stock: int
\ No newline at end of file
+    stock: int
+
+class ReorderSuggestionResponse(BaseModel):
+    product_id: int
+    name: str
+    barcode: str
+    stock: int
+    avg_daily_demand: float
+    demand_std: float
+    days_of_cover: Optional[float]
+    safety_stock: int
+    reorder_point: int
+    suggested_quantity: int
+    computed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class StockMatrixStore(BaseModel):
+    id: int
+    name: str
+
+
+class StockMatrixResponse(BaseModel):
+    # columnar: stores una sola vez; stock[i][j] = producto i en stores[j]
+    stores: list[StockMatrixStore]
+    product_ids: list[int]
+    names: list[str]
+    barcodes: list[str]
+    categories: list[Optional[str]]
+    stock: list[list[int]]
+    # None cuando no hay más productos
+    next_cursor: Optional[str] = None
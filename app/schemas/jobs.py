@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str
+    progress: int
+    progress_message: Optional[str]
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    result: Optional[dict[str, Any]]
+    last_error: Optional[str]
+
+    class Config:
+        from_attributes = True
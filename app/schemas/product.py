@@ -30,3 +30,16 @@ class ProductResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProductChangesResponse(BaseModel):
+    # versión actual del catálogo: usarla como `since` en el siguiente sync
+    version: int
+    # incluye desactivados (is_active=false) para que el POS los quite
+    products: list[ProductResponse]
+
+
+class ProductSearchResponse(BaseModel):
+    items: list[ProductResponse]
+    # None cuando no hay más resultados
+    next_cursor: Optional[str] = None
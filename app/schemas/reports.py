@@ -0,0 +1,75 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+
+
+class ValuationItem(BaseModel):
+    product_id: int
+    name: str
+    barcode: str
+    category: Optional[str]
+    price: float
+    on_hand: int
+    value: float
+
+
+class ValuationTotals(BaseModel):
+    products: int
+    units: int
+    value: float
+
+
+class ValuationResponse(BaseModel):
+    store_id: int
+    items: list[ValuationItem]
+    # None cuando no hay más páginas
+    next_cursor: Optional[str] = None
+    # solo con include_totals=true
+    totals: Optional[ValuationTotals] = None
+
+
+class TurnoverItem(BaseModel):
+    product_id: int
+    name: str
+    barcode: str
+    on_hand: int
+    units_sold: int
+    # unidades vendidas en la ventana / stock actual (None sin stock)
+    turnover: Optional[float]
+    days_of_cover: Optional[float]
+    last_sale_at: Optional[datetime]
+    days_since_last_sale: Optional[int]
+    is_dead_stock: bool
+
+
+class TurnoverResponse(BaseModel):
+    store_id: int
+    window_days: int
+    items: list[TurnoverItem]
+    next_cursor: Optional[str] = None
+
+
+class SalesBreakdownRow(BaseModel):
+    # columnas de la dimensión pedida (las demás no se envían)
+    user_id: Optional[int] = None
+    user_name: Optional[str] = None
+    payment_method: Optional[str] = None
+    # 1 = lunes ... 7 = domingo (hora local)
+    day_of_week: Optional[int] = None
+    hour: Optional[int] = None
+    store_id: Optional[int] = None
+    store_name: Optional[str] = None
+
+    sales_count: int
+    total: float
+    units: int
+    avg_ticket: Optional[float]
+    voided_count: int
+    voided_total: float
+
+
+class SalesBreakdownResponse(BaseModel):
+    dimension: str
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    rows: list[SalesBreakdownRow]
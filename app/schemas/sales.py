@@ -50,4 +50,52 @@ class SaleListItem(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SaleQuoteRequest(BaseModel):
+    store_id: int
+    items: list[SaleItemCreate]
+
+
+class SaleQuoteLine(BaseModel):
+    product_id: int
+    name: Optional[str] = None
+    # cantidad consolidada (suma de líneas repetidas del mismo producto)
+    quantity: int
+    unit_price: Optional[float] = None
+    subtotal: Optional[float] = None
+    valid: bool
+    available: int
+    in_stock: bool
+
+
+class SaleQuoteResponse(BaseModel):
+    store_id: int
+    lines: list[SaleQuoteLine]
+    total: float
+    can_checkout: bool
+
+
+class SaleBatchEntry(SaleCreate):
+    # generado por el POS al registrar la venta offline; se reenvía igual en cada reintento
+    client_key: str = Field(..., min_length=8, max_length=64)
+
+
+class SaleBatchRequest(BaseModel):
+    sales: list[SaleBatchEntry] = Field(..., min_length=1, max_length=500)
+
+
+class SaleBatchResult(BaseModel):
+    client_key: str
+    status: Literal["created", "duplicate", "error"]
+    status_code: int
+    detail: Optional[str] = None
+    sale: Optional[SaleResponse] = None
+
+
+class SaleBatchResponse(BaseModel):
+    created: int
+    duplicates: int
+    errors: int
+    # mismo orden que `sales` en el request
+    results: list[SaleBatchResult]
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from app.schemas.product import ProductResponse
+
+
+class ScanRequest(BaseModel):
+    store_id: int
+    barcodes: list[str] = Field(..., min_length=1, max_length=500)
+
+
+class ScanItem(BaseModel):
+    barcode: str
+    found: bool
+    product: Optional[ProductResponse] = None
+    stock: Optional[int] = None
+
+
+class ScanResponse(BaseModel):
+    store_id: int
+    # mismo orden que los barcodes enviados (sin duplicados)
+    items: list[ScanItem]
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ShiftOpen(BaseModel):
+    store_id: int
+    opening_cash: float = Field(0, ge=0)
+
+
+class ShiftClose(BaseModel):
+    counted_cash: float = Field(..., ge=0)
+    note: Optional[str] = Field(None, max_length=255)
+
+
+class ZReport(BaseModel):
+    shift_id: int
+    store_id: int
+    user_id: Optional[int]
+    opened_at: datetime
+    closed_at: Optional[datetime]
+    closed_by: Optional[int]
+    is_open: bool
+    ticket_count: int
+    cash_count: int
+    cash_total: float
+    yape_count: int
+    yape_total: float
+    gross_total: float
+    voided_count: int
+    voided_cash_total: float
+    voided_yape_total: float
+    # bruto - anuladas
+    net_total: float
+    opening_cash: float
+    # apertura + efectivo vendido - efectivo devuelto por anulaciones
+    expected_cash: float
+    counted_cash: Optional[float]
+    # contado - esperado (negativo = faltante)
+    cash_difference: Optional[float]
+    close_note: Optional[str]
@@ -0,0 +1,56 @@
+"""Calcula demanda diaria, cobertura y punto de reorden por tienda/producto.
+
+Uso:
+    python -m app.scripts.compute_reorder --all
+    python -m app.scripts.compute_reorder --tenant-id 3 --window-days 120 --lead-time-days 10
+
+Lee sale_items/sales de la ventana por lotes desde un cursor del servidor y arma
+la matriz producto x día con np.bincount; el resultado reemplaza las filas de
+reorder_suggestions de cada tienda. Pensado para correr de noche por cron.
+"""
+import argparse
+import time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.tenant import Tenant
+from app.services.reorder import compute_tenant
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sugerencias de reposición por tienda/producto")
+    parser.add_argument("--tenant-id", type=int, action="append", default=[])
+    parser.add_argument("--all", action="store_true", help="todos los tenants activos")
+    parser.add_argument("--window-days", type=int, default=settings.REORDER_WINDOW_DAYS)
+    parser.add_argument("--lead-time-days", type=int, default=settings.REORDER_LEAD_TIME_DAYS)
+    parser.add_argument("--review-days", type=int, default=settings.REORDER_REVIEW_DAYS)
+    parser.add_argument("--service-z", type=float, default=settings.REORDER_SERVICE_Z)
+    args = parser.parse_args()
+
+    tenant_ids = list(args.tenant_id)
+    if args.all:
+        db = SessionLocal()
+        try:
+            tenant_ids = db.execute(select(Tenant.id).where(Tenant.is_active == True).order_by(Tenant.id)).scalars().all()
+        finally:
+            db.close()
+    if not tenant_ids:
+        parser.error("--tenant-id o --all")
+
+    for tenant_id in tenant_ids:
+        started = time.perf_counter()
+        per_store = compute_tenant(
+            tenant_id,
+            window_days=args.window_days,
+            lead_time_days=args.lead_time_days,
+            review_days=args.review_days,
+            service_z=args.service_z,
+        )
+        print(f"tenant {tenant_id}: {sum(per_store.values())} sugerencias en {len(per_store)} tiendas "
+              f"({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Encola trabajos para el worker (app/scripts/run_worker.py).
+
+Uso:
+    python -m app.scripts.enqueue_job parquet_export --all
+    python -m app.scripts.enqueue_job reorder_suggestions --tenant-id 3 --payload '{"window_days": 120}'
+    python -m app.scripts.enqueue_job idempotency_purge
+
+Para cron: encolar es instantáneo y el trabajo pesado corre en los workers.
+"""
+import argparse
+import json
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.tenant import Tenant
+from app.services.jobs import GLOBAL_KINDS, HANDLERS, enqueue
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encola un trabajo")
+    parser.add_argument("kind", choices=sorted(HANDLERS))
+    parser.add_argument("--tenant-id", type=int, action="append", default=[])
+    parser.add_argument("--all", action="store_true", help="uno por tenant activo")
+    parser.add_argument("--payload", default="{}", help="JSON")
+    parser.add_argument("--priority", type=int, default=0)
+    args = parser.parse_args()
+
+    is_global = args.kind in GLOBAL_KINDS
+    if is_global and (args.tenant_id or args.all):
+        parser.error(f"{args.kind} es global: no lleva --tenant-id ni --all")
+    if not is_global and not (args.tenant_id or args.all):
+        parser.error(f"{args.kind} requiere --tenant-id o --all")
+
+    payload = json.loads(args.payload)
+    db = SessionLocal()
+    try:
+        tenant_ids = list(args.tenant_id)
+        if args.all:
+            tenant_ids = db.execute(select(Tenant.id).where(Tenant.is_active == True).order_by(Tenant.id)).scalars().all()
+
+        for tenant_id in [None] if is_global else tenant_ids:
+            dedupe = f"{args.kind}:{tenant_id}" if tenant_id is not None else args.kind
+            job_id = enqueue(db, args.kind, tenant_id, payload, priority=args.priority, dedupe_key=dedupe)
+            print(f"{args.kind} tenant {tenant_id}: job {job_id}")
+        db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
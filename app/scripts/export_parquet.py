@@ -0,0 +1,51 @@
+"""Exporta el historial de ventas/kardex de cada tenant a Parquet particionado por mes.
+
+Uso:
+    python -m app.scripts.export_parquet --all                 # incremental, todos los tenants
+    python -m app.scripts.export_parquet --tenant-id 3
+    python -m app.scripts.export_parquet --tenant-id 3 --rebuild-month 2026-03
+    python -m app.scripts.export_parquet --tenant-id 3 --full  # borra y reexporta todo
+
+Pensado para correr por cron poco después de fin de mes. Ver el layout en
+app/services/parquet_export.py.
+"""
+import argparse
+import time
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.tenant import Tenant
+from app.services.parquet_export import export_tenant
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export Parquet incremental por tenant")
+    parser.add_argument("--tenant-id", type=int, action="append", default=[])
+    parser.add_argument("--all", action="store_true", help="todos los tenants activos")
+    parser.add_argument("--rebuild-month", action="append", default=[], help="YYYY-MM a reescribir")
+    parser.add_argument("--full", action="store_true", help="borra el export del tenant y lo rehace")
+    args = parser.parse_args()
+
+    tenant_ids = list(args.tenant_id)
+    if args.all:
+        db = SessionLocal()
+        try:
+            tenant_ids = db.execute(select(Tenant.id).where(Tenant.is_active == True).order_by(Tenant.id)).scalars().all()
+        finally:
+            db.close()
+    if not tenant_ids:
+        parser.error("--tenant-id o --all")
+
+    for tenant_id in tenant_ids:
+        started = time.perf_counter()
+        res = export_tenant(tenant_id, rebuild_months=args.rebuild_month, full=args.full)
+        if res.get("skipped"):
+            print(f"tenant {tenant_id}: otro export en curso, se omite")
+            continue
+        print(f"tenant {tenant_id}: {len(res['months'])} meses nuevos {res['months']}, "
+              f"filas {res['rows']} en {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
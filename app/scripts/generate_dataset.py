@@ -0,0 +1,410 @@
+"""Genera un dataset multi-tenant sintético a escala para benchmarks.
+
+Uso:
+    python -m app.scripts.generate_dataset --tenants 100 --stores 20 --products 20000 \\
+        --sales 10000000 --movements 50000000 --workers 8
+
+- Best-sellers sesgados (Zipf), estacionalidad semanal y horaria, tiendas con
+  volúmenes distintos, ~1.5% de ventas anuladas y ~35% de pagos YAPE.
+- Cada venta genera sus OUT en el kardex (y ADJ +1 si se anuló), cada par
+  tienda/producto tiene un IN inicial que cubre lo vendido, y el resto del
+  presupuesto de --movements se reparte en reposiciones.
+- Carga con COPY, un worker (proceso) por tenant. Los ids se reservan por bloques
+  en las secuencias, así las filas hijas se escriben sin RETURNING.
+"""
+import argparse
+import io
+import time
+from datetime import date, datetime, timedelta
+from multiprocessing import Pool
+
+import numpy as np
+
+from app.core.database import engine
+from app.core.security import hash_password
+from app.scripts.seed_roles import DEFAULT_ROLES
+
+BENCH_PASSWORD = "Bench123!"
+CHUNK_ROWS = 200_000
+
+BRANDS = ["Aurora", "Bella", "Cielo", "Dulce", "Esencia", "Flor", "Gala", "Luna", "Mia", "Nácar",
+          "Oasis", "Perla", "Rosa", "Sol", "Vida", "Zafiro"]
+LINES = ["Hidratante", "Mate", "Nutritivo", "Reparador", "Suave", "Intenso", "Natural", "Pro",
+         "Clásico", "Brillo", "Seda", "Fresh"]
+TYPES = [
+    ("Labial", "Maquillaje"), ("Base", "Maquillaje"), ("Rímel", "Maquillaje"), ("Sombra", "Maquillaje"),
+    ("Delineador", "Maquillaje"), ("Rubor", "Maquillaje"), ("Shampoo", "Cabello"),
+    ("Acondicionador", "Cabello"), ("Tinte", "Cabello"), ("Crema facial", "Cuidado de la piel"),
+    ("Sérum", "Cuidado de la piel"), ("Protector solar", "Cuidado de la piel"),
+    ("Jabón", "Cuidado corporal"), ("Loción", "Cuidado corporal"), ("Perfume", "Fragancias"),
+    ("Colonia", "Fragancias"), ("Esmalte", "Uñas"), ("Quitaesmalte", "Uñas"),
+]
+SIZES = ["15ml", "30ml", "50ml", "100ml", "200ml", "250ml", "400ml", "1und"]
+
+# lunes..domingo y horas de tienda (picos al mediodía y por la tarde)
+WEEKDAY_WEIGHTS = np.array([1.0, 0.95, 0.95, 1.0, 1.15, 1.35, 1.1])
+HOUR_WEIGHTS = np.array(
+    [0, 0, 0, 0, 0, 0, 0, 0.2, 0.5, 1.0, 1.5, 2.2, 2.8, 2.4, 1.6, 1.4, 1.7, 2.3, 2.9, 2.6, 1.8, 0.9, 0.3, 0]
+)
+
+
+# =========================
+# helpers de carga
+# =========================
+
+def _csv(value) -> str:
+    # None -> NULL en COPY csv; los textos generados no tienen comas ni comillas
+    return "" if value is None else str(value)
+
+
+def copy_rows(cur, table: str, columns: list[str], rows) -> int:
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    buf = io.StringIO()
+    n = 0
+    for row in rows:
+        buf.write(",".join(_csv(v) for v in row))
+        buf.write("\n")
+        n += 1
+        if n % CHUNK_ROWS == 0:
+            buf.seek(0)
+            cur.copy_expert(sql, buf)
+            buf = io.StringIO()
+    if buf.tell():
+        buf.seek(0)
+        cur.copy_expert(sql, buf)
+    return n
+
+
+def reserve_ids(conn, table: str, n: int) -> int:
+    # Reserva [first, first + n) moviendo la secuencia; serializado con advisory lock
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"generate_dataset:{table}",))
+        cur.execute("SELECT pg_get_serial_sequence(%s, 'id')", (table,))
+        seq = cur.fetchone()[0]
+        cur.execute(f"SELECT GREATEST((SELECT COALESCE(MAX(id), 0) FROM {table}), (SELECT last_value FROM {seq}))")
+        base = int(cur.fetchone()[0])
+        if n > 0:
+            cur.execute("SELECT setval(%s, %s)", (seq, base + n))
+    conn.commit()
+    return base + 1
+
+
+def _timestamps(start: datetime, seconds: np.ndarray) -> np.ndarray:
+    # segundos desde start -> 'YYYY-MM-DDTHH:MM:SS' (hora local de la sesión)
+    ts = np.datetime64(start, "s") + seconds.astype("timedelta64[s]")
+    return np.datetime_as_string(ts, unit="s")
+
+
+# =========================
+# worker por tenant
+# =========================
+
+def _init_worker():
+    # cada proceso usa conexiones propias (no las heredadas del padre)
+    engine.dispose(close=False)
+
+
+def _split_budget(total: int, parts: int) -> list[int]:
+    base, extra = divmod(total, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+def generate_tenant(spec: dict) -> dict:
+    started = time.perf_counter()
+    rng = np.random.default_rng(spec["seed"])
+    tenant_id = spec["tenant_id"]
+    store_ids = np.array(spec["store_ids"])
+    seller_ids = np.array(spec["seller_ids"])
+    n_products = spec["products"]
+    n_sales = spec["sales"]
+    days = spec["days"]
+    start = datetime.combine(date.today() - timedelta(days=days), datetime.min.time())
+
+    conn = engine.raw_connection()
+    try:
+        # ---------- productos ----------
+        product_first = reserve_ids(conn, "products", n_products)
+        product_ids = np.arange(product_first, product_first + n_products)
+        brand = rng.integers(0, len(BRANDS), n_products)
+        line = rng.integers(0, len(LINES), n_products)
+        ptype = rng.integers(0, len(TYPES), n_products)
+        size = rng.integers(0, len(SIZES), n_products)
+        prices = np.round(np.exp(rng.normal(3.3, 0.6, n_products))) + 0.9
+        active = rng.random(n_products) < 0.97
+
+        # popularidad Zipf: pocos productos concentran la mayoría de ventas
+        ranks = rng.permutation(n_products)
+        popularity = 1.0 / (ranks + 1) ** spec["zipf"]
+        popularity /= popularity.sum()
+
+        with conn.cursor() as cur:
+            cur.execute("SET synchronous_commit = off")
+            copy_rows(
+                cur, "products",
+                ["id", "tenant_id", "name", "category", "barcode", "price", "is_active"],
+                (
+                    (
+                        int(pid), tenant_id,
+                        f"{BRANDS[b]} {LINES[l]} {TYPES[t][0]} {SIZES[z]}",
+                        TYPES[t][1],
+                        f"77{tenant_id % 100000:05d}{i:06d}",
+                        f"{pr:.2f}",
+                        "true" if a else "false",
+                    )
+                    for i, (pid, b, l, t, z, pr, a) in enumerate(zip(
+                        product_ids.tolist(), brand.tolist(), line.tolist(), ptype.tolist(),
+                        size.tolist(), prices.tolist(), active.tolist(),
+                    ))
+                ),
+            )
+
+        # ---------- ventas ----------
+        day_of_week = (np.arange(days) + start.weekday()) % 7
+        trend = np.linspace(0.85, 1.15, days)  # el negocio crece durante el periodo
+        day_p = WEEKDAY_WEIGHTS[day_of_week] * trend
+        day_p /= day_p.sum()
+        hour_p = HOUR_WEIGHTS / HOUR_WEIGHTS.sum()
+
+        seconds = (
+            rng.choice(days, n_sales, p=day_p) * 86400
+            + rng.choice(24, n_sales, p=hour_p) * 3600
+            + rng.integers(0, 3600, n_sales)
+        )
+        seconds.sort()  # ids crecientes en el tiempo, como en producción
+        sale_ts = _timestamps(start, seconds).tolist()
+
+        store_w = np.exp(rng.normal(0, 0.5, len(store_ids)))
+        sale_store_idx = rng.choice(len(store_ids), n_sales, p=store_w / store_w.sum())
+        is_yape = rng.random(n_sales) < 0.35
+        is_voided = rng.random(n_sales) < 0.015
+        yape_ops = rng.integers(10_000_000, 100_000_000, n_sales)
+
+        items_per_sale = np.minimum(1 + rng.poisson(1.4, n_sales), 10)
+        n_items = int(items_per_sale.sum())
+        item_sale_idx = np.repeat(np.arange(n_sales), items_per_sale)
+        item_product_idx = rng.choice(n_products, n_items, p=popularity)
+        item_qty = np.minimum(rng.geometric(0.75, n_items), 6)
+        item_price = prices[item_product_idx]
+        item_subtotal = np.round(item_price * item_qty, 2)
+        sale_total = np.round(np.bincount(item_sale_idx, weights=item_subtotal, minlength=n_sales), 2)
+
+        sale_first = reserve_ids(conn, "sales", n_sales)
+        sale_ids = np.arange(sale_first, sale_first + n_sales)
+        item_first = reserve_ids(conn, "sale_items", n_items)
+        numbers = [f"V-{i:06d}" for i in range(1, n_sales + 1)]
+
+        with conn.cursor() as cur:
+            cur.execute("SET synchronous_commit = off")
+            copy_rows(
+                cur, "sales",
+                ["id", "tenant_id", "store_id", "user_id", "number", "payment_method",
+                 "yape_operation_number", "total", "is_voided", "created_at"],
+                (
+                    (sid, tenant_id, int(store_ids[si]), int(seller_ids[si]), num,
+                     "YAPE" if y else "CASH", op if y else None, f"{tot:.2f}",
+                     "true" if v else "false", ts)
+                    for sid, si, num, y, op, tot, v, ts in zip(
+                        sale_ids.tolist(), sale_store_idx.tolist(), numbers, is_yape.tolist(),
+                        yape_ops.tolist(), sale_total.tolist(), is_voided.tolist(), sale_ts,
+                    )
+                ),
+            )
+            copy_rows(
+                cur, "sale_items",
+                ["id", "sale_id", "product_id", "quantity", "unit_price", "subtotal"],
+                (
+                    (iid, sale_first + s, product_first + p, q, f"{pr:.2f}", f"{st:.2f}")
+                    for iid, s, p, q, pr, st in zip(
+                        range(item_first, item_first + n_items), item_sale_idx.tolist(),
+                        item_product_idx.tolist(), item_qty.tolist(), item_price.tolist(),
+                        item_subtotal.tolist(),
+                    )
+                ),
+            )
+
+        # ---------- kardex ----------
+        n_stores = len(store_ids)
+        item_store_idx = sale_store_idx[item_sale_idx]
+        item_voided = is_voided[item_sale_idx]
+        pair = item_store_idx * n_products + item_product_idx
+        net_out = np.bincount(pair, weights=item_qty * np.where(item_voided, 0, 1), minlength=n_stores * n_products)
+        initial_in = net_out.astype(np.int64) + rng.integers(5, 60, n_stores * n_products)
+
+        n_void_items = int(item_voided.sum())
+        n_restock = max(0, spec["movements"] - n_items - n_void_items - n_stores * n_products)
+        restock_pair = (
+            rng.choice(n_stores, n_restock) * n_products + rng.choice(n_products, n_restock, p=popularity)
+        )
+        restock_qty = rng.integers(1, 25, n_restock)
+        restock_ts = _timestamps(start, np.sort(rng.integers(0, days * 86400, n_restock)))
+
+        n_movements = n_items + n_void_items + n_stores * n_products + n_restock
+        mv_first = reserve_ids(conn, "inventory_movements", n_movements)
+        start_ts = _timestamps(start, np.zeros(1, dtype=np.int64))[0]
+        admin_id = spec["admin_id"]
+        item_number = [numbers[s] for s in item_sale_idx.tolist()]
+        void_ts = _timestamps(start, seconds[item_sale_idx[item_voided]] + 600).tolist()
+
+        def movement_rows():
+            mid = mv_first
+            # IN inicial por tienda/producto
+            for pr, qty in enumerate(initial_in.tolist()):
+                yield (mid, tenant_id, int(store_ids[pr // n_products]), product_first + pr % n_products,
+                       "IN", qty, 1, "Stock inicial", admin_id, start_ts)
+                mid += 1
+            # OUT por ítem vendido
+            for si, p, q, num, s in zip(item_store_idx.tolist(), item_product_idx.tolist(), item_qty.tolist(),
+                                        item_number, item_sale_idx.tolist()):
+                yield (mid, tenant_id, int(store_ids[si]), product_first + p, "OUT", q, -1,
+                       f"Sale {num}", int(seller_ids[si]), sale_ts[s])
+                mid += 1
+            # ADJ +1 de ventas anuladas
+            voided_idx = np.flatnonzero(item_voided)
+            for k, i in enumerate(voided_idx.tolist()):
+                si = item_store_idx[i]
+                yield (mid, tenant_id, int(store_ids[si]), product_first + int(item_product_idx[i]), "ADJ",
+                       int(item_qty[i]), 1, f"VOID {item_number[i]}: generado", admin_id, void_ts[k])
+                mid += 1
+            # reposiciones
+            for pr, qty, ts in zip(restock_pair.tolist(), restock_qty.tolist(), restock_ts.tolist()):
+                yield (mid, tenant_id, int(store_ids[pr // n_products]), product_first + pr % n_products,
+                       "IN", qty, 1, "Reposición", admin_id, ts)
+                mid += 1
+
+        with conn.cursor() as cur:
+            cur.execute("SET synchronous_commit = off")
+            copy_rows(
+                cur, "inventory_movements",
+                ["id", "tenant_id", "store_id", "product_id", "movement_type", "quantity",
+                 "direction", "note", "created_by", "created_at"],
+                movement_rows(),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "tenant_id": tenant_id,
+        "products": n_products,
+        "sales": n_sales,
+        "sale_items": n_items,
+        "movements": n_movements,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+# =========================
+# proceso principal
+# =========================
+
+def create_tenants(args, password_hash: str) -> list[dict]:
+    tag = args.tag or datetime.now().strftime("%Y%m%d%H%M%S")
+    n_t = args.tenants
+    n_s = args.stores
+    n_roles = len(DEFAULT_ROLES)
+
+    conn = engine.raw_connection()
+    try:
+        tenant_first = reserve_ids(conn, "tenants", n_t)
+        role_first = reserve_ids(conn, "roles", n_t * n_roles)
+        store_first = reserve_ids(conn, "stores", n_t * n_s)
+        user_first = reserve_ids(conn, "users", n_t * (1 + n_s))
+
+        sales_split = _split_budget(args.sales, n_t)
+        movements_split = _split_budget(args.movements, n_t)
+        specs = []
+        tenants, roles, stores, users = [], [], [], []
+        for t in range(n_t):
+            tenant_id = tenant_first + t
+            tenants.append((tenant_id, f"Bench {tag} #{t + 1}", "true"))
+
+            role_ids = {}
+            for r, (name, desc) in enumerate(DEFAULT_ROLES):
+                role_ids[name] = role_first + t * n_roles + r
+                roles.append((role_ids[name], tenant_id, name, desc))
+
+            store_ids = [store_first + t * n_s + s for s in range(n_s)]
+            for s, store_id in enumerate(store_ids):
+                stores.append((store_id, tenant_id, f"Tienda {s + 1}", f"Av. Benchmark {100 + s}", "true"))
+
+            base_user = user_first + t * (1 + n_s)
+            users.append((base_user, tenant_id, role_ids["ADMIN"], None, "Admin Bench",
+                          f"admin@bench{tenant_id}.local", password_hash, "true"))
+            seller_ids = []
+            for s, store_id in enumerate(store_ids):
+                uid = base_user + 1 + s
+                seller_ids.append(uid)
+                users.append((uid, tenant_id, role_ids["VENDEDOR"], store_id, f"Vendedor {s + 1}",
+                              f"vendedor{s + 1}@bench{tenant_id}.local", password_hash, "true"))
+
+            specs.append({
+                "tenant_id": tenant_id,
+                "store_ids": store_ids,
+                "seller_ids": seller_ids,
+                "admin_id": base_user,
+                "products": args.products,
+                "sales": sales_split[t],
+                "movements": movements_split[t],
+                "days": args.days,
+                "zipf": args.zipf,
+                "seed": args.seed * 100_003 + t,
+            })
+
+        with conn.cursor() as cur:
+            copy_rows(cur, "tenants", ["id", "name", "is_active"], tenants)
+            copy_rows(cur, "roles", ["id", "tenant_id", "name", "description"], roles)
+            copy_rows(cur, "stores", ["id", "tenant_id", "name", "address", "is_active"], stores)
+            copy_rows(
+                cur, "users",
+                ["id", "tenant_id", "role_id", "store_id", "full_name", "email", "password_hash", "is_active"],
+                users,
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    return specs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un dataset sintético multi-tenant")
+    parser.add_argument("--tenants", type=int, default=2)
+    parser.add_argument("--stores", type=int, default=3, help="tiendas por tenant")
+    parser.add_argument("--products", type=int, default=2000, help="productos por tenant")
+    parser.add_argument("--sales", type=int, default=50_000, help="ventas en total")
+    parser.add_argument("--movements", type=int, default=200_000, help="movimientos de kardex en total (mínimo)")
+    parser.add_argument("--days", type=int, default=365, help="historia en días hasta hoy")
+    parser.add_argument("--zipf", type=float, default=1.1, help="sesgo de best-sellers")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--tag", default=None, help="sufijo para los nombres de tenant")
+    parser.add_argument("--no-analyze", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    specs = create_tenants(args, hash_password(BENCH_PASSWORD))
+    print(f"{len(specs)} tenants creados ({args.stores} tiendas c/u). Generando datos...")
+
+    totals = {"products": 0, "sales": 0, "sale_items": 0, "movements": 0}
+    with Pool(processes=args.workers, initializer=_init_worker) as pool:
+        for res in pool.imap_unordered(generate_tenant, specs):
+            for k in totals:
+                totals[k] += res[k]
+            print(f"  tenant {res['tenant_id']}: {res['sales']} ventas, "
+                  f"{res['movements']} movimientos en {res['seconds']}s")
+
+    if not args.no_analyze:
+        conn = engine.raw_connection()
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                for table in ("products", "sales", "sale_items", "inventory_movements"):
+                    cur.execute(f"ANALYZE {table}")
+        finally:
+            conn.close()
+
+    print(f"Listo en {time.perf_counter() - started:.1f}s: {totals}")
+    print(f"Login de ejemplo: admin@bench{specs[0]['tenant_id']}.local / {BENCH_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Reconstruye sales_facts desde sales/sale_items.
+
+Uso:
+    python -m app.scripts.rebuild_sales_facts --all
+    python -m app.scripts.rebuild_sales_facts --tenant-id 3
+
+Necesario una vez después de la migración (historial previo) o si se cambia
+ANALYTICS_TIMEZONE. Mientras corre frena las ventas del tenant que reconstruye
+(lock advisory por tenant); los demás tenants siguen vendiendo.
+"""
+import argparse
+import time
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.tenant import Tenant
+from app.services.sales_facts import rebuild_tenant
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye la tabla sales_facts")
+    parser.add_argument("--tenant-id", type=int, action="append", default=[])
+    parser.add_argument("--all", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        tenant_ids = list(args.tenant_id)
+        if args.all:
+            tenant_ids = db.execute(select(Tenant.id).order_by(Tenant.id)).scalars().all()
+        if not tenant_ids:
+            parser.error("--tenant-id o --all")
+
+        for tenant_id in tenant_ids:
+            started = time.perf_counter()
+            cells = rebuild_tenant(db, tenant_id)
+            print(f"tenant {tenant_id}: {cells} celdas en {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
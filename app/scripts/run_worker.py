@@ -0,0 +1,105 @@
+"""Worker de la cola de trabajos (tabla jobs).
+
+Uso:
+    python -m app.scripts.run_worker                     # JOBS_WORKER_PROCESSES procesos
+    python -m app.scripts.run_worker --processes 4
+    python -m app.scripts.run_worker --once             # vacía la cola y termina (cron)
+
+El proceso principal toma trabajos con FOR UPDATE SKIP LOCKED (se pueden correr
+varios workers, en uno o varios servidores), los ejecuta en un pool de procesos
+y renueva su lock mientras corren. SIGTERM/SIGINT: deja de tomar trabajos y
+espera a que terminen los que están corriendo.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.jobs import claim, fail, heartbeat, reap, run_job
+
+logger = logging.getLogger("app.jobs")
+
+
+def _init_child():
+    # Ctrl+C llega a todo el grupo: los hijos terminan su trabajo, el padre decide
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker de la cola de trabajos")
+    parser.add_argument("--processes", type=int, default=settings.JOBS_WORKER_PROCESSES)
+    parser.add_argument("--once", action="store_true", help="termina cuando no quedan trabajos listos")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        logger.info("worker %s: stopping, waiting for running jobs", worker)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # spawn: los hijos crean su propio engine (no heredan conexiones abiertas del padre)
+    mp = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=args.processes, mp_context=mp, initializer=_init_child)
+    running = {}
+    last_heartbeat = last_reap = 0.0
+    heartbeat_every = settings.JOBS_VISIBILITY_TIMEOUT_SECONDS / 3
+
+    db = SessionLocal()
+    try:
+        while running or not stopping:
+            broken = False
+            for future in [f for f in running if f.done()]:
+                job = running.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    logger.info("job %s (%s): %s", job["id"], job["kind"], future.result())
+                    continue
+                # el proceso murió (OOM, segfault): el trabajo se reintenta con backoff
+                logger.error("job %s (%s): worker process error %r", job["id"], job["kind"], exc)
+                fail(db, job["id"], job["attempts"], repr(exc))
+                broken = broken or isinstance(exc, BrokenProcessPool)
+            if broken and not running:
+                pool.shutdown(wait=False)
+                pool = ProcessPoolExecutor(max_workers=args.processes, mp_context=mp, initializer=_init_child)
+
+            now = time.monotonic()
+            if now - last_reap >= settings.JOBS_VISIBILITY_TIMEOUT_SECONDS / 2:
+                requeued = reap(db)
+                if requeued:
+                    logger.warning("requeued %s jobs with expired visibility", requeued)
+                last_reap = now
+            if running and now - last_heartbeat >= heartbeat_every:
+                heartbeat(db, worker, [job["id"] for job in running.values()])
+                last_heartbeat = now
+
+            free = args.processes - len(running)
+            jobs = claim(db, worker, free) if free > 0 and not stopping and not broken else []
+            for job in jobs:
+                running[pool.submit(run_job, job)] = job
+
+            if not running and not jobs:
+                if args.once:
+                    break
+                time.sleep(settings.JOBS_POLL_SECONDS)
+            elif running:
+                wait(running, timeout=settings.JOBS_POLL_SECONDS, return_when=FIRST_COMPLETED)
+    finally:
+        pool.shutdown(wait=True)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+from datetime import date
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services.parquet_export import tenant_dir, load_manifest
+
+try:
+    import duckdb
+except ImportError:  # backend opcional: sin duckdb los reportes responden 503
+    duckdb = None
+
+# Reportes soportados. Cada uno recibe el WHERE común (tienda, fechas, no anuladas)
+# sobre la vista indicada en "source".
+REPORTS = {
+    "sales-by-month": {
+        "source": "sales",
+        "sql": """
+            SELECT month,
+                   count(*) AS sales_count,
+                   CAST(sum(total) AS DOUBLE) AS revenue
+            FROM sales
+            WHERE {where}
+            GROUP BY month
+            ORDER BY month
+        """,
+    },
+    "sales-by-category": {
+        "source": "sale_items",
+        "sql": """
+            SELECT coalesce(p.category, 'Sin categoría') AS category,
+                   sum(i.quantity) AS units,
+                   CAST(sum(i.subtotal) AS DOUBLE) AS revenue
+            FROM sale_items i
+            LEFT JOIN products p ON p.id = i.product_id
+            WHERE {where}
+            GROUP BY 1
+            ORDER BY revenue DESC
+        """,
+    },
+    "sales-by-hour": {
+        "source": "sales",
+        "sql": """
+            SELECT hour(created_at) AS hour,
+                   count(*) AS sales_count,
+                   CAST(sum(total) AS DOUBLE) AS revenue
+            FROM sales
+            WHERE {where}
+            GROUP BY 1
+            ORDER BY 1
+        """,
+    },
+    "sales-by-seller": {
+        "source": "sales",
+        "sql": """
+            SELECT user_id,
+                   count(*) AS sales_count,
+                   CAST(sum(total) AS DOUBLE) AS revenue
+            FROM sales
+            WHERE {where}
+            GROUP BY user_id
+            ORDER BY revenue DESC
+        """,
+    },
+    "movements-by-month": {
+        "source": "movements",
+        "sql": """
+            SELECT month,
+                   movement_type,
+                   sum(quantity * direction) AS units
+            FROM movements
+            WHERE {where}
+            GROUP BY month, movement_type
+            ORDER BY month, movement_type
+        """,
+    },
+}
+
+
+def ensure_available() -> None:
+    if not settings.ANALYTICS_ENABLED or duckdb is None:
+        raise HTTPException(status_code=503, detail="Analytics backend is not enabled")
+
+
+def watermark(manifest: dict) -> dict:
+    # los datos cubren hasta el último mes cerrado exportado (inclusive)
+    months = manifest.get("months") or []
+    return {
+        "through_month": months[-1] if months else None,
+        "exported_at": manifest.get("exported_at"),
+    }
+
+
+def _connect(tenant_id: int):
+    base = tenant_dir(tenant_id)
+    con = duckdb.connect(database=":memory:")
+    con.execute(f"SET threads = {int(settings.ANALYTICS_DUCKDB_THREADS)}")
+    # horas y fechas de los reportes en hora local de las tiendas
+    tz = settings.ANALYTICS_TIMEZONE.replace("'", "''")
+    con.execute(f"SET TimeZone = '{tz}'")
+    for name in ("sales", "sale_items", "movements"):
+        path = os.path.join(base, name, "*", "*.parquet").replace("'", "''")
+        # hive_partitioning agrega la columna month (poda de particiones por mes)
+        con.execute(
+            f"CREATE VIEW {name} AS SELECT * FROM read_parquet("
+            f"'{path}', hive_partitioning = true, hive_types = {{'month': VARCHAR}})"
+        )
+    products = os.path.join(base, "products", "products.parquet").replace("'", "''")
+    con.execute(f"CREATE VIEW products AS SELECT * FROM read_parquet('{products}')")
+    return con
+
+
+def run_report(
+    tenant_id: int,
+    report: str,
+    store_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> dict:
+    ensure_available()
+    manifest = load_manifest(tenant_id)
+    if not manifest["months"]:
+        raise HTTPException(status_code=409, detail="No analytics export for this tenant yet")
+
+    spec = REPORTS[report]
+    alias = "i." if spec["source"] == "sale_items" else ""
+    # el kardex no tiene anuladas (la anulación es un ADJ propio)
+    where = ["true"] if spec["source"] == "movements" else [f"NOT {alias}is_voided"]
+    params: dict = {}
+    if store_id is not None:
+        where.append(f"{alias}store_id = $store_id")
+        params["store_id"] = store_id
+    if date_from:
+        # month primero: DuckDB descarta las particiones fuera de rango sin leerlas
+        where.append(f"{alias}month >= $month_from AND {alias}created_at >= $date_from")
+        params["month_from"] = f"{date_from:%Y-%m}"
+        params["date_from"] = date_from
+    if date_to:
+        where.append(f"{alias}month <= $month_to AND CAST({alias}created_at AS DATE) <= $date_to")
+        params["month_to"] = f"{date_to:%Y-%m}"
+        params["date_to"] = date_to
+
+    con = _connect(tenant_id)
+    try:
+        cur = con.execute(spec["sql"].format(where=" AND ".join(where)), params)
+        keys = [d[0] for d in cur.description]
+        rows = [dict(zip(keys, row)) for row in cur.fetchall()]
+    finally:
+        con.close()
+
+    return {"report": report, "watermark": watermark(manifest), "rows": rows}
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select, cast, Float
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.product import Product
+
+# registro compacto con los campos de ProductResponse
+_RECORD_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.category,
+    Product.barcode,
+    cast(Product.price, Float).label("price"),
+    Product.image_url,
+    Product.is_active,
+)
+
+
+class BarcodeCache:
+    # LRU por tenant (barcode -> producto) con TTL. Cada invalidación sube la
+    # "generación" del tenant: una lectura que empezó antes no puede volver a
+    # guardar el dato viejo.
+
+    def __init__(self, max_per_tenant: int, ttl_seconds: float):
+        self.max_per_tenant = max_per_tenant
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[int, OrderedDict] = {}
+        self._generation: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_per_tenant > 0
+
+    def get(self, tenant_id: int, barcode: str) -> tuple[dict | None, int]:
+        now = time.monotonic()
+        with self._lock:
+            generation = self._generation.get(tenant_id, 0)
+            entries = self._entries.get(tenant_id)
+            entry = entries.get(barcode) if entries else None
+            if entry is not None and entry[0] > now:
+                entries.move_to_end(barcode)
+                self.hits += 1
+                return entry[1], generation
+            if entry is not None:
+                del entries[barcode]
+            self.misses += 1
+            return None, generation
+
+    def put(self, tenant_id: int, barcode: str, record: dict, generation: int) -> None:
+        with self._lock:
+            if self._generation.get(tenant_id, 0) != generation:
+                return
+            entries = self._entries.setdefault(tenant_id, OrderedDict())
+            entries[barcode] = (time.monotonic() + self.ttl_seconds, record)
+            entries.move_to_end(barcode)
+            while len(entries) > self.max_per_tenant:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tenant_id: int, *barcodes: str) -> None:
+        with self._lock:
+            self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+            entries = self._entries.get(tenant_id)
+            if entries:
+                for barcode in barcodes:
+                    entries.pop(barcode, None)
+            self.invalidations += 1
+
+    def invalidate_tenant(self, tenant_id: int) -> None:
+        # para imports masivos del catálogo
+        with self._lock:
+            self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+            self._entries.pop(tenant_id, None)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "tenants": len(self._entries),
+                "entries": sum(len(e) for e in self._entries.values()),
+                "max_per_tenant": self.max_per_tenant,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+barcode_cache = BarcodeCache(settings.BARCODE_CACHE_MAX_PER_TENANT, settings.BARCODE_CACHE_TTL_SECONDS)
+
+
+def lookup_product_by_barcode(db: Session, tenant_id: int, barcode: str) -> dict | None:
+    # Devuelve el producto (activo o no) con los campos de ProductResponse
+    if barcode_cache.enabled:
+        record, generation = barcode_cache.get(tenant_id, barcode)
+        if record is not None:
+            return record
+
+    row = db.execute(
+        select(*_RECORD_COLUMNS).where(Product.tenant_id == tenant_id, Product.barcode == barcode)
+    ).mappings().one_or_none()
+    if row is None:
+        return None
+
+    record = dict(row)
+    if barcode_cache.enabled:
+        barcode_cache.put(tenant_id, barcode, record, generation)
+    return record
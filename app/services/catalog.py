@@ -0,0 +1,42 @@
+import hashlib
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.tenant import Tenant
+
+
+def get_catalog_version(db: Session, tenant_id: int) -> int:
+    version = db.execute(
+        select(Tenant.catalog_version).where(Tenant.id == tenant_id)
+    ).scalar_one()
+    return int(version)
+
+
+def bump_catalog_version(db: Session, tenant_id: int) -> int:
+    # Llamar en la misma transacción que el cambio del producto (create/update/import).
+    # El UPDATE bloquea la fila del tenant hasta el commit: las versiones se
+    # confirman en orden y un cliente nunca se salta un cambio en /products/changes
+    version = db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(catalog_version=Tenant.catalog_version + 1)
+        .returning(Tenant.catalog_version)
+    ).scalar_one()
+    return int(version)
+
+
+def catalog_etag(tenant_id: int, version: int, variant: str = "") -> str:
+    # ETag fuerte: misma versión + mismos filtros = mismo documento
+    digest = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:10]
+    return f'"{tenant_id}-{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # If-None-Match usa comparación débil (RFC 9110)
+    return etag in candidates or f"W/{etag}" in candidates
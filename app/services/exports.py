@@ -0,0 +1,140 @@
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator
+
+import orjson
+from sqlalchemy import select, Select
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+from app.models.sale import Sale
+from app.models.sale_item import SaleItem
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def sales_export_query(
+    tenant_id: int,
+    store_id: int | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    level: str = "sale",
+) -> Select:
+    if level == "item":
+        stmt = (
+            select(
+                Sale.id.label("sale_id"),
+                Sale.number,
+                Sale.store_id,
+                Sale.created_at,
+                Sale.payment_method,
+                Sale.is_voided,
+                SaleItem.product_id,
+                Product.barcode,
+                Product.name.label("product_name"),
+                SaleItem.quantity,
+                SaleItem.unit_price,
+                SaleItem.subtotal,
+            )
+            .join(SaleItem, SaleItem.sale_id == Sale.id)
+            .join(Product, Product.id == SaleItem.product_id)
+            .order_by(Sale.id, SaleItem.id)
+        )
+    else:
+        stmt = select(
+            Sale.id,
+            Sale.number,
+            Sale.store_id,
+            Sale.user_id,
+            Sale.created_at,
+            Sale.payment_method,
+            Sale.yape_operation_number,
+            Sale.total,
+            Sale.is_voided,
+        ).order_by(Sale.id)
+
+    stmt = stmt.where(Sale.tenant_id == tenant_id)
+    if store_id is not None:
+        stmt = stmt.where(Sale.store_id == store_id)
+    if date_from:
+        stmt = stmt.where(Sale.created_at >= date_from)
+    if date_to:
+        stmt = stmt.where(Sale.created_at <= date_to)
+    return stmt
+
+
+def movements_export_query(
+    tenant_id: int,
+    store_id: int | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+) -> Select:
+    stmt = (
+        select(
+            InventoryMovement.id,
+            InventoryMovement.store_id,
+            InventoryMovement.product_id,
+            Product.barcode,
+            Product.name.label("product_name"),
+            InventoryMovement.movement_type,
+            InventoryMovement.quantity,
+            InventoryMovement.direction,
+            InventoryMovement.note,
+            InventoryMovement.created_by,
+            InventoryMovement.created_at,
+        )
+        .join(Product, Product.id == InventoryMovement.product_id)
+        .where(InventoryMovement.tenant_id == tenant_id)
+        .order_by(InventoryMovement.id)
+    )
+    if store_id is not None:
+        stmt = stmt.where(InventoryMovement.store_id == store_id)
+    if date_from:
+        stmt = stmt.where(InventoryMovement.created_at >= date_from)
+    if date_to:
+        stmt = stmt.where(InventoryMovement.created_at <= date_to)
+    return stmt
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+def _csv_chunk(rows) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(
+        [None if v is None else (v.isoformat() if isinstance(v, datetime) else v) for v in row] for row in rows
+    )
+    return buf.getvalue().encode("utf-8")
+
+
+def _ndjson_chunk(keys: list[str], rows) -> bytes:
+    return b"".join(
+        orjson.dumps(dict(zip(keys, row)), default=_json_default, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+
+def stream_export(stmt: Select, fmt: str) -> Iterator[bytes]:
+    # Conexión propia con cursor del lado del servidor (psycopg2 named cursor):
+    # se traen EXPORT_BATCH_SIZE filas por vez y cada lote se escribe y se suelta,
+    # así la memoria no depende del tamaño del export. No usa la sesión del request
+    # porque esta se cierra antes de que termine de enviarse el body.
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE
+        ).execute(stmt)
+        keys = list(result.keys())
+        if fmt == "csv":
+            yield _csv_chunk([keys])
+        for rows in result.partitions():
+            yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(keys, rows)
@@ -0,0 +1,180 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    status_code: int
+    body: bytes
+    content_type: str | None
+    # raw headers [(nombre, valor), ...] en latin-1, como los manda ASGI
+    headers: list[tuple[str, str]] | None = None
+
+
+class MemoryStore:
+    # Frente en memoria de las respuestas completadas: los reintentos del mismo
+    # proceso no tocan la base. Acotado por cantidad (LRU) y por TTL.
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, ident: tuple[str, str]) -> StoredResponse | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[ident]
+                return None
+            self._entries.move_to_end(ident)
+            return entry[1]
+
+    def put(self, ident: tuple[str, str], stored: StoredResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[ident] = (time.monotonic() + self.ttl_seconds, stored)
+            self._entries.move_to_end(ident)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+memory_store = MemoryStore(settings.IDEMPOTENCY_MEMORY_ENTRIES, settings.IDEMPOTENCY_TTL_SECONDS)
+
+
+# =========================
+# tabla idempotency_keys (sesión propia, fuera de la transacción del request)
+# =========================
+
+def claim(scope: str, key: str, method: str, path: str, fingerprint: str) -> tuple[str, StoredResponse | str | None]:
+    """Toma la clave para ejecutar el request.
+
+    Devuelve ("owner", token) si este request debe ejecutarse, ("completed", stored)
+    si ya hay respuesta guardada, o ("in_progress", None) si otro la está procesando.
+    El dueño debe renovar la toma con heartbeat() mientras ejecuta.
+    """
+    now = datetime.now(timezone.utc)
+    lock_until = now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+    token = uuid.uuid4().hex
+
+    with SessionLocal() as db:
+        stmt = pg_insert(IdempotencyKey).values(
+            scope=scope, key=key, method=method, path=path,
+            fingerprint=fingerprint, state="IN_PROGRESS", claim_token=token, expires_at=lock_until,
+        )
+        # una clave vencida (respuesta expirada o dueño caído sin heartbeat) se puede volver a tomar
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_idempotency_keys_scope_key",
+            set_={
+                "method": stmt.excluded.method,
+                "path": stmt.excluded.path,
+                "fingerprint": stmt.excluded.fingerprint,
+                "state": "IN_PROGRESS",
+                "claim_token": stmt.excluded.claim_token,
+                "status_code": None,
+                "body": None,
+                "content_type": None,
+                "headers": None,
+                "created_at": func.now(),
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=IdempotencyKey.expires_at <= func.now(),
+        ).returning(IdempotencyKey.id)
+
+        owned = db.execute(stmt).scalar_one_or_none()
+        db.commit()
+        if owned is not None:
+            return "owner", token
+
+        row = db.execute(
+            select(
+                IdempotencyKey.state,
+                IdempotencyKey.fingerprint,
+                IdempotencyKey.status_code,
+                IdempotencyKey.body,
+                IdempotencyKey.content_type,
+                IdempotencyKey.headers,
+            ).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+        ).one_or_none()
+
+    if row is None or row.state != "COMPLETED":
+        # row None: el dueño la liberó entre el INSERT y el SELECT; se reintenta
+        return "in_progress", None
+    headers = [tuple(h) for h in row.headers] if row.headers is not None else None
+    return "completed", StoredResponse(row.fingerprint, row.status_code, row.body, row.content_type, headers)
+
+
+def heartbeat(scope: str, key: str, token: str) -> bool:
+    # el dueño sigue vivo: extiende la toma. False si ya no es suya
+    lock_until = datetime.now(timezone.utc) + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+    with SessionLocal() as db:
+        result = db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.claim_token == token,
+                IdempotencyKey.state == "IN_PROGRESS",
+            )
+            .values(expires_at=lock_until)
+        )
+        db.commit()
+        return result.rowcount > 0
+
+
+def complete(scope: str, key: str, token: str, stored: StoredResponse) -> None:
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+    with SessionLocal() as db:
+        db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.claim_token == token,
+                IdempotencyKey.state == "IN_PROGRESS",
+            )
+            .values(
+                state="COMPLETED",
+                status_code=stored.status_code,
+                body=stored.body,
+                content_type=stored.content_type,
+                headers=[list(h) for h in stored.headers] if stored.headers is not None else None,
+                expires_at=expires_at,
+            )
+        )
+        db.commit()
+
+
+def release(scope: str, key: str, token: str) -> None:
+    # el request falló (5xx/excepción): la clave queda libre para reintentar
+    with SessionLocal() as db:
+        db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.claim_token == token,
+                IdempotencyKey.state == "IN_PROGRESS",
+            )
+        )
+        db.commit()
+
+
+def purge_expired(db) -> int:
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= func.now()))
+    db.commit()
+    return result.rowcount
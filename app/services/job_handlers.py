@@ -0,0 +1,51 @@
+from app.core.database import SessionLocal, engine
+from app.services.jobs import JobContext
+
+# Handlers de la cola (ver HANDLERS en app/services/jobs.py). Corren en los procesos
+# del worker; cada uno abre sus propias conexiones.
+
+
+def parquet_export(ctx: JobContext, tenant_id: int, payload: dict) -> dict:
+    from app.services.parquet_export import export_tenant
+
+    ctx.progress(0, "exporting closed months")
+    result = export_tenant(tenant_id, rebuild_months=payload.get("rebuild_months"), full=bool(payload.get("full")))
+    if result.get("skipped"):
+        # el cron está exportando el mismo tenant: se reintenta con backoff
+        raise RuntimeError(f"Another parquet export of tenant {tenant_id} is running")
+    return result
+
+
+def reorder_suggestions(ctx: JobContext, tenant_id: int, payload: dict) -> dict:
+    from app.services.reorder import compute_store
+
+    params = {k: payload[k] for k in ("window_days", "lead_time_days", "review_days", "service_z") if k in payload}
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM stores WHERE tenant_id = %s ORDER BY id", (tenant_id,))
+            store_ids = [r[0] for r in cur.fetchall()]
+        per_store = {}
+        for n, store_id in enumerate(store_ids):
+            ctx.progress(100 * n // len(store_ids), f"store {store_id}")
+            per_store[str(store_id)] = compute_store(conn, tenant_id, store_id, **params)
+        return {"suggestions": per_store}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def sales_facts_rebuild(ctx: JobContext, tenant_id: int, payload: dict) -> dict:
+    from app.services.sales_facts import rebuild_tenant
+
+    with SessionLocal() as db:
+        return {"cells": rebuild_tenant(db, tenant_id)}
+
+
+def idempotency_purge(ctx: JobContext, tenant_id: int | None, payload: dict) -> dict:
+    from app.services.idempotency import purge_expired
+
+    with SessionLocal() as db:
+        return {"deleted": purge_expired(db)}
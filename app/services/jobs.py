@@ -0,0 +1,236 @@
+import importlib
+import json
+import logging
+import traceback
+from datetime import datetime
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import Job
+
+logger = logging.getLogger("app.jobs")
+
+# kind -> "modulo:funcion". Se importa recién en el proceso del worker: la API no
+# carga numpy/pyarrow por encolar. La función recibe (ctx, tenant_id, payload) y
+# devuelve un dict JSON (queda en jobs.result).
+HANDLERS = {
+    "parquet_export": "app.services.job_handlers:parquet_export",
+    "reorder_suggestions": "app.services.job_handlers:reorder_suggestions",
+    "sales_facts_rebuild": "app.services.job_handlers:sales_facts_rebuild",
+    "idempotency_purge": "app.services.job_handlers:idempotency_purge",
+}
+# trabajos de mantenimiento sin tenant; el resto requiere tenant_id
+GLOBAL_KINDS = {"idempotency_purge"}
+
+# Las filas en cola se toman con FOR UPDATE SKIP LOCKED: varios workers (o procesos)
+# no se esperan entre sí ni toman el mismo trabajo. attempts identifica la toma:
+# complete/fail de una toma vieja (el trabajo venció y lo tomó otro) no hacen nada.
+_CLAIM = """
+    UPDATE jobs SET
+        status = 'RUNNING',
+        attempts = attempts + 1,
+        locked_by = :worker,
+        locked_until = now() + make_interval(secs => :visibility),
+        started_at = now(),
+        progress = 0,
+        progress_message = NULL
+    WHERE id IN (
+        SELECT id FROM jobs
+        WHERE status = 'QUEUED' AND run_at <= now()
+        ORDER BY priority DESC, run_at, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, tenant_id, payload, attempts
+"""
+
+# trabajos de un worker caído: vuelven a la cola o fallan si agotaron los intentos
+_REAP = """
+    UPDATE jobs SET
+        status = CASE WHEN attempts >= max_attempts THEN 'FAILED' ELSE 'QUEUED' END,
+        finished_at = CASE WHEN attempts >= max_attempts THEN now() END,
+        last_error = 'Visibility timeout exceeded (worker ' || coalesce(locked_by, '?') || ')',
+        locked_by = NULL,
+        locked_until = NULL
+    WHERE id IN (
+        SELECT id FROM jobs
+        WHERE status = 'RUNNING' AND locked_until < now()
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    tenant_id: int | None = None,
+    payload: dict | None = None,
+    priority: int = 0,
+    run_at: datetime | None = None,
+    max_attempts: int | None = None,
+    dedupe_key: str | None = None,
+    created_by: int | None = None,
+) -> int:
+    """Encola un trabajo (sin commit: va en la transacción del llamador). Devuelve el id.
+
+    Con dedupe_key, si ya hay uno igual en cola o corriendo devuelve ese id.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    if (tenant_id is None) != (kind in GLOBAL_KINDS):
+        raise ValueError(f"Job kind {kind} {'does not take' if kind in GLOBAL_KINDS else 'requires'} a tenant_id")
+
+    values = {
+        "tenant_id": tenant_id,
+        "kind": kind,
+        "payload": payload or {},
+        "status": "QUEUED",
+        "priority": priority,
+        "max_attempts": max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        "dedupe_key": dedupe_key,
+        "created_by": created_by,
+    }
+    if run_at is not None:
+        values["run_at"] = run_at
+    stmt = pg_insert(Job).values(**values)
+    if dedupe_key is not None:
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=["kind", "dedupe_key"],
+            index_where=text("dedupe_key IS NOT NULL AND status IN ('QUEUED', 'RUNNING')"),
+        )
+    stmt = stmt.returning(Job.id)
+    while True:
+        job_id = db.execute(stmt).scalar_one_or_none()
+        if job_id is not None:
+            return job_id
+        job_id = db.execute(
+            select(Job.id).where(
+                Job.kind == kind,
+                Job.dedupe_key == dedupe_key,
+                Job.status.in_(["QUEUED", "RUNNING"]),
+            )
+        ).scalar_one_or_none()
+        if job_id is not None:
+            return job_id
+        # el pendiente terminó entre el INSERT y el SELECT: se vuelve a insertar
+
+
+def claim(db: Session, worker: str, limit: int) -> list[dict]:
+    rows = db.execute(
+        text(_CLAIM),
+        {"worker": worker, "limit": limit, "visibility": settings.JOBS_VISIBILITY_TIMEOUT_SECONDS},
+    ).mappings().all()
+    db.commit()
+    return [dict(r) for r in rows]
+
+
+def heartbeat(db: Session, worker: str, job_ids: list[int]) -> None:
+    # el worker vivo renueva el lock: la visibilidad solo vence si el proceso muere
+    if job_ids:
+        db.execute(
+            text("""
+                UPDATE jobs SET locked_until = now() + make_interval(secs => :visibility)
+                WHERE id = ANY(:ids) AND status = 'RUNNING' AND locked_by = :worker
+            """),
+            {"ids": list(job_ids), "worker": worker, "visibility": settings.JOBS_VISIBILITY_TIMEOUT_SECONDS},
+        )
+        db.commit()
+
+
+def reap(db: Session) -> int:
+    requeued = db.execute(text(_REAP)).rowcount
+    # limpieza de terminados viejos
+    db.execute(
+        text("""
+            DELETE FROM jobs
+            WHERE status IN ('DONE', 'FAILED') AND finished_at < now() - make_interval(days => :days)
+        """),
+        {"days": settings.JOBS_RETENTION_DAYS},
+    )
+    db.commit()
+    return requeued
+
+
+def set_progress(db: Session, job_id: int, attempt: int, progress: int, message: str | None = None) -> None:
+    db.execute(
+        text("""
+            UPDATE jobs SET progress = :progress, progress_message = :message
+            WHERE id = :id AND attempts = :attempt AND status = 'RUNNING'
+        """),
+        {"id": job_id, "attempt": attempt, "progress": max(0, min(100, int(progress))), "message": message},
+    )
+    db.commit()
+
+
+def complete(db: Session, job_id: int, attempt: int, result: dict | None) -> None:
+    db.execute(
+        text("""
+            UPDATE jobs SET status = 'DONE', progress = 100, result = CAST(:result AS jsonb),
+                   finished_at = now(), locked_by = NULL, locked_until = NULL, last_error = NULL
+            WHERE id = :id AND attempts = :attempt AND status = 'RUNNING'
+        """),
+        {"id": job_id, "attempt": attempt, "result": None if result is None else json.dumps(result, default=str)},
+    )
+    db.commit()
+
+
+def fail(db: Session, job_id: int, attempt: int, error: str) -> None:
+    # reintento con backoff exponencial hasta max_attempts
+    db.execute(
+        text("""
+            UPDATE jobs SET
+                status = CASE WHEN attempts >= max_attempts THEN 'FAILED' ELSE 'QUEUED' END,
+                finished_at = CASE WHEN attempts >= max_attempts THEN now() END,
+                run_at = CASE WHEN attempts >= max_attempts THEN run_at
+                              ELSE now() + make_interval(secs => least(:base * power(2, attempts - 1), :cap)) END,
+                last_error = :error,
+                locked_by = NULL,
+                locked_until = NULL
+            WHERE id = :id AND attempts = :attempt AND status = 'RUNNING'
+        """),
+        {
+            "id": job_id,
+            "attempt": attempt,
+            "error": error[-4000:],
+            "base": settings.JOBS_BACKOFF_BASE_SECONDS,
+            "cap": settings.JOBS_BACKOFF_MAX_SECONDS,
+        },
+    )
+    db.commit()
+
+
+class JobContext:
+    """Lo que recibe el handler: su id y un reporte de progreso para GET /jobs/{id}."""
+
+    def __init__(self, job_id: int, attempt: int):
+        self.job_id = job_id
+        self.attempt = attempt
+
+    def progress(self, progress: int, message: str | None = None) -> None:
+        # sesión propia: no hace commit de la transacción del handler
+        with SessionLocal() as db:
+            set_progress(db, self.job_id, self.attempt, progress, message)
+
+
+def _resolve(kind: str):
+    module, func = HANDLERS[kind].split(":")
+    return getattr(importlib.import_module(module), func)
+
+
+def run_job(job: dict) -> str:
+    """Corre un trabajo tomado (en un proceso del pool) y registra el resultado."""
+    ctx = JobContext(job["id"], job["attempts"])
+    try:
+        result = _resolve(job["kind"])(ctx, job["tenant_id"], job["payload"] or {})
+    except Exception:
+        logger.exception("job %s (%s) failed", job["id"], job["kind"])
+        with SessionLocal() as db:
+            fail(db, job["id"], job["attempts"], traceback.format_exc())
+        return "failed"
+    with SessionLocal() as db:
+        complete(db, job["id"], job["attempts"], result)
+    return "done"
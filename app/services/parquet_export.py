@@ -0,0 +1,223 @@
+import json
+import os
+import shutil
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, func, text, Select
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+from app.models.sale import Sale
+from app.models.sale_item import SaleItem
+
+# Layout (hive, particionado por mes):
+#   {ANALYTICS_EXPORT_DIR}/tenant_{id}/sales/month=2026-01/part-0.parquet
+#   {ANALYTICS_EXPORT_DIR}/tenant_{id}/sale_items/month=2026-01/part-0.parquet
+#   {ANALYTICS_EXPORT_DIR}/tenant_{id}/movements/month=2026-01/part-0.parquet
+#   {ANALYTICS_EXPORT_DIR}/tenant_{id}/products/products.parquet   (snapshot, se reescribe)
+#   {ANALYTICS_EXPORT_DIR}/tenant_{id}/_manifest.json
+# Solo se exportan meses cerrados: un mes escrito no cambia y la siguiente corrida
+# agrega únicamente los meses nuevos. Los meses se cortan en ANALYTICS_TIMEZONE, la
+# misma zona con la que /analytics filtra y agrupa (month=... coincide con la fecha local).
+
+MONEY = pa.decimal128(12, 2)
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+SCHEMAS = {
+    "sales": pa.schema([
+        ("id", pa.int64()),
+        ("number", pa.string()),
+        ("store_id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("created_at", TIMESTAMP),
+        ("payment_method", pa.string()),
+        ("total", MONEY),
+        ("is_voided", pa.bool_()),
+    ]),
+    "sale_items": pa.schema([
+        ("id", pa.int64()),
+        ("sale_id", pa.int64()),
+        ("store_id", pa.int64()),
+        ("created_at", TIMESTAMP),
+        ("is_voided", pa.bool_()),
+        ("product_id", pa.int64()),
+        ("quantity", pa.int32()),
+        ("unit_price", MONEY),
+        ("subtotal", MONEY),
+    ]),
+    "movements": pa.schema([
+        ("id", pa.int64()),
+        ("store_id", pa.int64()),
+        ("product_id", pa.int64()),
+        ("movement_type", pa.string()),
+        ("quantity", pa.int32()),
+        ("direction", pa.int32()),
+        ("created_by", pa.int64()),
+        ("created_at", TIMESTAMP),
+    ]),
+    "products": pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string()),
+        ("category", pa.string()),
+        ("barcode", pa.string()),
+        ("price", MONEY),
+        ("is_active", pa.bool_()),
+    ]),
+}
+
+PARTITIONED_TABLES = ("sales", "sale_items", "movements")
+
+
+def tenant_dir(tenant_id: int) -> str:
+    return os.path.join(settings.ANALYTICS_EXPORT_DIR, f"tenant_{tenant_id}")
+
+
+def load_manifest(tenant_id: int) -> dict:
+    path = os.path.join(tenant_dir(tenant_id), "_manifest.json")
+    if not os.path.exists(path):
+        return {"tenant_id": tenant_id, "months": [], "products_exported_at": None, "exported_at": None}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(tenant_id: int, manifest: dict) -> None:
+    path = os.path.join(tenant_dir(tenant_id), "_manifest.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _month_start(d: date) -> datetime:
+    # inicio del mes en hora local (aware): Postgres compara contra timestamptz sin ambigüedad
+    return datetime(d.year, d.month, 1, tzinfo=ZoneInfo(settings.ANALYTICS_TIMEZONE))
+
+
+def _next_month(d: datetime) -> datetime:
+    return datetime(d.year + d.month // 12, d.month % 12 + 1, 1, tzinfo=d.tzinfo)
+
+
+def _queries(tenant_id: int, start: datetime, end: datetime) -> dict[str, Select]:
+    return {
+        "sales": select(
+            Sale.id, Sale.number, Sale.store_id, Sale.user_id, Sale.created_at,
+            Sale.payment_method, Sale.total, Sale.is_voided,
+        ).where(
+            Sale.tenant_id == tenant_id, Sale.created_at >= start, Sale.created_at < end,
+        ).order_by(Sale.id),
+        "sale_items": select(
+            SaleItem.id, SaleItem.sale_id, Sale.store_id, Sale.created_at, Sale.is_voided,
+            SaleItem.product_id, SaleItem.quantity, SaleItem.unit_price, SaleItem.subtotal,
+        ).join(Sale, Sale.id == SaleItem.sale_id).where(
+            Sale.tenant_id == tenant_id, Sale.created_at >= start, Sale.created_at < end,
+        ).order_by(SaleItem.id),
+        "movements": select(
+            InventoryMovement.id, InventoryMovement.store_id, InventoryMovement.product_id,
+            InventoryMovement.movement_type, InventoryMovement.quantity, InventoryMovement.direction,
+            InventoryMovement.created_by, InventoryMovement.created_at,
+        ).where(
+            InventoryMovement.tenant_id == tenant_id,
+            InventoryMovement.created_at >= start,
+            InventoryMovement.created_at < end,
+        ).order_by(InventoryMovement.id),
+    }
+
+
+def _write_parquet(conn, stmt: Select, schema: pa.Schema, path: str) -> int:
+    # filas del cursor del servidor -> RecordBatch por lote -> ParquetWriter;
+    # se escribe a un .tmp y se renombra, nunca queda un archivo a medias
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    rows_written = 0
+    result = conn.execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE).execute(stmt)
+    with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+        for rows in result.partitions():
+            columns = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema,
+            )
+            writer.write_batch(batch)
+            rows_written += len(rows)
+    os.replace(tmp, path)
+    return rows_written
+
+
+def _first_month(conn, tenant_id: int) -> datetime | None:
+    first = conn.execute(
+        select(func.least(
+            select(func.min(Sale.created_at)).where(Sale.tenant_id == tenant_id).scalar_subquery(),
+            select(func.min(InventoryMovement.created_at)).where(InventoryMovement.tenant_id == tenant_id).scalar_subquery(),
+        ))
+    ).scalar_one_or_none()
+    return _month_start(first.astimezone(ZoneInfo(settings.ANALYTICS_TIMEZONE))) if first else None
+
+
+def export_tenant(tenant_id: int, rebuild_months: list[str] | None = None, full: bool = False) -> dict:
+    """Exporta los meses cerrados que faltan (y rebuild_months, ej: ["2026-03"]).
+
+    full=True borra el export del tenant (con el lock tomado) y lo rehace.
+
+    Devuelve {"months": [...meses escritos], "rows": {tabla: filas}} o
+    {"skipped": True} si otro proceso ya está exportando el tenant. Las anulaciones
+    de ventas de un mes ya exportado solo se reflejan reconstruyendo ese mes.
+    """
+    with engine.connect() as conn:
+        # un export por tenant a la vez (endpoint y cron pueden coincidir)
+        locked = conn.execute(
+            text("SELECT pg_try_advisory_lock(hashtext('parquet_export'), :tid)"), {"tid": tenant_id}
+        ).scalar_one()
+        if not locked:
+            return {"skipped": True}
+        try:
+            if full:
+                drop_tenant_export(tenant_id)
+            return _export_tenant(conn, tenant_id, rebuild_months)
+        finally:
+            conn.rollback()
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext('parquet_export'), :tid)"), {"tid": tenant_id})
+
+
+def _export_tenant(conn, tenant_id: int, rebuild_months: list[str] | None) -> dict:
+    manifest = load_manifest(tenant_id)
+    done = set(manifest["months"]) - set(rebuild_months or [])
+    current_month = _month_start(datetime.now(ZoneInfo(settings.ANALYTICS_TIMEZONE)))
+    base = tenant_dir(tenant_id)
+    written = []
+    rows = {name: 0 for name in (*PARTITIONED_TABLES, "products")}
+
+    month = _first_month(conn, tenant_id)
+    while month is not None and month < current_month:
+        label = f"{month:%Y-%m}"
+        end = _next_month(month)
+        if label not in done:
+            for name, stmt in _queries(tenant_id, month, end).items():
+                partition = os.path.join(base, name, f"month={label}")
+                rows[name] += _write_parquet(conn, stmt, SCHEMAS[name], os.path.join(partition, "part-0.parquet"))
+            written.append(label)
+            # el manifest se guarda por mes: si se corta, lo ya escrito no se repite
+            manifest["months"] = sorted(done | set(written))
+            manifest["exported_at"] = datetime.now().isoformat(timespec="seconds")
+            _save_manifest(tenant_id, manifest)
+        month = end
+
+    products = select(
+        Product.id, Product.name, Product.category, Product.barcode, Product.price, Product.is_active,
+    ).where(Product.tenant_id == tenant_id).order_by(Product.id)
+    rows["products"] = _write_parquet(
+        conn, products, SCHEMAS["products"], os.path.join(base, "products", "products.parquet")
+    )
+
+    manifest["products_exported_at"] = datetime.now().isoformat(timespec="seconds")
+    manifest["exported_at"] = manifest["products_exported_at"]
+    _save_manifest(tenant_id, manifest)
+    return {"months": written, "rows": rows}
+
+
+def drop_tenant_export(tenant_id: int) -> None:
+    shutil.rmtree(tenant_dir(tenant_id), ignore_errors=True)
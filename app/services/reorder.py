@@ -0,0 +1,175 @@
+import io
+import math
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import engine
+
+CHUNK_ROWS = 500_000
+
+_DEMAND_SQL = """
+    SELECT i.product_id, CAST(s.created_at AT TIME ZONE %(tz)s AS DATE) - %(start)s, i.quantity
+    FROM sale_items i
+    JOIN sales s ON s.id = i.sale_id
+    WHERE s.tenant_id = %(tenant_id)s AND s.store_id = %(store_id)s AND NOT s.is_voided
+      AND s.created_at >= %(start_ts)s AND s.created_at < %(end_ts)s
+"""
+
+_STOCK_SQL = """
+    SELECT product_id, SUM(quantity * direction)
+    FROM inventory_movements
+    WHERE tenant_id = %(tenant_id)s AND store_id = %(store_id)s
+    GROUP BY product_id
+"""
+
+COLUMNS = [
+    "tenant_id", "store_id", "product_id", "avg_daily_demand", "demand_std", "stock",
+    "days_of_cover", "safety_stock", "reorder_point", "suggested_quantity", "window_days",
+]
+
+
+def _dense(ids: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # posición de cada id en el arreglo ordenado ids (+ máscara de los que existen)
+    pos = np.searchsorted(ids, values)
+    found = pos < len(ids)
+    found[found] = ids[pos[found]] == values[found]
+    return pos, found
+
+
+def daily_demand(conn, tenant_id: int, store_id: int, product_ids: np.ndarray, start: date, days: int) -> np.ndarray:
+    """Matriz (productos x días) de unidades vendidas, armada por lotes con bincount."""
+    n = len(product_ids)
+    demand = np.zeros(n * days, dtype=np.float64)
+    # días en hora local (ANALYTICS_TIMEZONE, igual que sales_facts); los límites como
+    # timestamptz de medianoche local para seguir usando el índice por created_at
+    tz = ZoneInfo(settings.ANALYTICS_TIMEZONE)
+    params = {
+        "tenant_id": tenant_id,
+        "store_id": store_id,
+        "tz": settings.ANALYTICS_TIMEZONE,
+        "start": start,
+        "start_ts": datetime.combine(start, time.min, tzinfo=tz),
+        "end_ts": datetime.combine(start + timedelta(days=days), time.min, tzinfo=tz),
+    }
+
+    # cursor con nombre (del lado del servidor): la memoria depende de CHUNK_ROWS, no del historial
+    with conn.cursor(name=f"reorder_demand_{tenant_id}_{store_id}") as cur:
+        cur.itersize = CHUNK_ROWS
+        cur.execute(_DEMAND_SQL, params)
+        while True:
+            rows = cur.fetchmany(CHUNK_ROWS)
+            if not rows:
+                break
+            chunk = np.asarray(rows, dtype=np.int64)
+            pos, found = _dense(product_ids, chunk[:, 0])
+            day = chunk[:, 1]
+            ok = found & (day >= 0) & (day < days)
+            demand += np.bincount(pos[ok] * days + day[ok], weights=chunk[ok, 2], minlength=n * days)
+
+    return demand.reshape(n, days)
+
+
+def current_stock(conn, tenant_id: int, store_id: int, product_ids: np.ndarray) -> np.ndarray:
+    stock = np.zeros(len(product_ids), dtype=np.int64)
+    with conn.cursor() as cur:
+        cur.execute(_STOCK_SQL, {"tenant_id": tenant_id, "store_id": store_id})
+        rows = cur.fetchall()
+    if rows:
+        arr = np.asarray(rows, dtype=np.int64)
+        pos, found = _dense(product_ids, arr[:, 0])
+        stock[pos[found]] = arr[found, 1]
+    return stock
+
+
+def reorder_policy(demand: np.ndarray, stock: np.ndarray, lead_time_days: int, review_days: int, service_z: float) -> dict:
+    # punto de reorden = demanda en el lead time + stock de seguridad (z * σ * √L);
+    # sugerido = lo que falta para cubrir lead time + período de revisión
+    days = demand.shape[1]
+    avg = demand.mean(axis=1)
+    std = demand.std(axis=1, ddof=1) if days > 1 else np.zeros_like(avg)
+    safety = np.ceil(service_z * std * math.sqrt(lead_time_days))
+    reorder_point = np.ceil(avg * lead_time_days + safety)
+    target = np.ceil(avg * (lead_time_days + review_days) + safety)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cover = np.where(avg > 0, np.maximum(stock, 0) / avg, np.nan)
+    return {
+        "avg": avg,
+        "std": std,
+        "safety": safety.astype(np.int64),
+        "reorder_point": reorder_point.astype(np.int64),
+        "suggested": np.maximum(target - stock, 0).astype(np.int64),
+        "cover": cover,
+    }
+
+
+def _csv_value(v) -> str:
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return ""
+    return str(v)
+
+
+def compute_store(
+    conn,
+    tenant_id: int,
+    store_id: int,
+    window_days: int = settings.REORDER_WINDOW_DAYS,
+    lead_time_days: int = settings.REORDER_LEAD_TIME_DAYS,
+    review_days: int = settings.REORDER_REVIEW_DAYS,
+    service_z: float = settings.REORDER_SERVICE_Z,
+) -> int:
+    """Recalcula reorder_suggestions de una tienda (misma transacción: delete + COPY)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT id FROM products WHERE tenant_id = %s AND is_active ORDER BY id", (tenant_id,)
+        )
+        product_ids = np.asarray([r[0] for r in cur.fetchall()], dtype=np.int64)
+
+    # ventana: los window_days días completos anteriores a hoy
+    start = datetime.now(ZoneInfo(settings.ANALYTICS_TIMEZONE)).date() - timedelta(days=window_days)
+    rows = []
+    if len(product_ids):
+        demand = daily_demand(conn, tenant_id, store_id, product_ids, start, window_days)
+        stock = current_stock(conn, tenant_id, store_id, product_ids)
+        r = reorder_policy(demand, stock, lead_time_days, review_days, service_z)
+
+        # solo productos con movimiento: sin demanda ni stock no hay nada que sugerir
+        for i in np.flatnonzero((r["avg"] > 0) | (stock > 0)):
+            rows.append((
+                tenant_id, store_id, int(product_ids[i]),
+                round(float(r["avg"][i]), 4), round(float(r["std"][i]), 4), int(stock[i]),
+                None if np.isnan(r["cover"][i]) else round(float(r["cover"][i]), 2),
+                int(r["safety"][i]), int(r["reorder_point"][i]), int(r["suggested"][i]), window_days,
+            ))
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "DELETE FROM reorder_suggestions WHERE tenant_id = %s AND store_id = %s", (tenant_id, store_id)
+        )
+        if rows:
+            buf = io.StringIO()
+            for row in rows:
+                buf.write(",".join(_csv_value(v) for v in row))
+                buf.write("\n")
+            buf.seek(0)
+            cur.copy_expert(
+                f"COPY reorder_suggestions ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buf
+            )
+    conn.commit()
+    return len(rows)
+
+
+def compute_tenant(tenant_id: int, **params) -> dict[int, int]:
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM stores WHERE tenant_id = %s ORDER BY id", (tenant_id,))
+            store_ids = [r[0] for r in cur.fetchall()]
+        return {store_id: compute_store(conn, tenant_id, store_id, **params) for store_id in store_ids}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
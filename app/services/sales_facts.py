@@ -0,0 +1,108 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Mantenimiento incremental de sales_facts. Todo es set-based (INSERT ... SELECT
+# agrupado) y corre dentro de la transacción de la venta: si la venta hace rollback,
+# el hecho también. Fecha y hora en hora local (ANALYTICS_TIMEZONE).
+#
+# Reconstrucción vs. incrementales: lock advisory por tenant (de transacción). Las
+# ventas/anulaciones lo toman compartido (no se esperan entre sí) y rebuild_tenant
+# exclusivo, así solo se frenan las escrituras del tenant que se reconstruye.
+
+_GRAIN = """
+    s.tenant_id,
+    s.store_id,
+    COALESCE(s.user_id, 0),
+    s.payment_method,
+    CAST(s.created_at AT TIME ZONE :tz AS DATE),
+    CAST(EXTRACT(HOUR FROM s.created_at AT TIME ZONE :tz) AS SMALLINT)
+"""
+
+_UPSERT = """
+    INSERT INTO sales_facts (
+        tenant_id, store_id, user_id, payment_method, sale_date, hour,
+        sales_count, total, units, voided_count, voided_total
+    )
+    SELECT {grain}, {measures}
+    FROM sales s
+    LEFT JOIN (
+        SELECT sale_id, SUM(quantity) AS units FROM sale_items
+        WHERE sale_id = ANY(:ids) GROUP BY sale_id
+    ) i ON i.sale_id = s.id
+    WHERE s.id = ANY(:ids)
+    GROUP BY 1, 2, 3, 4, 5, 6
+    -- orden fijo de celdas: dos batches concurrentes no se bloquean en cruz
+    ORDER BY 1, 2, 3, 4, 5, 6
+    ON CONFLICT ON CONSTRAINT uq_sales_facts_grain DO UPDATE SET
+        sales_count = sales_facts.sales_count + EXCLUDED.sales_count,
+        total = sales_facts.total + EXCLUDED.total,
+        units = sales_facts.units + EXCLUDED.units,
+        voided_count = sales_facts.voided_count + EXCLUDED.voided_count,
+        voided_total = sales_facts.voided_total + EXCLUDED.voided_total
+"""
+
+_LOCK_SHARED = """
+    SELECT pg_advisory_xact_lock_shared(hashtext('sales_facts'), t.tenant_id)
+    FROM (SELECT DISTINCT tenant_id FROM sales WHERE id = ANY(:ids) ORDER BY 1) t
+"""
+
+_SALE_MEASURES = "COUNT(*), SUM(s.total), COALESCE(SUM(i.units), 0), 0, 0"
+# la anulación mueve la venta de vigentes a anuladas en su celda original
+_VOID_MEASURES = "-COUNT(*), -SUM(s.total), -COALESCE(SUM(i.units), 0), COUNT(*), SUM(s.total)"
+
+
+def record_sales(db: Session, sale_ids: list[int]) -> None:
+    """Suma ventas nuevas (ya flusheadas, con items) a sales_facts."""
+    if sale_ids:
+        db.execute(text(_LOCK_SHARED), {"ids": list(sale_ids)})
+        db.execute(
+            text(_UPSERT.format(grain=_GRAIN, measures=_SALE_MEASURES)),
+            {"ids": list(sale_ids), "tz": settings.ANALYTICS_TIMEZONE},
+        )
+
+
+def record_voids(db: Session, sale_ids: list[int]) -> None:
+    # llamar después de record_shift_void: el turno se bloquea antes que sales_facts
+    if sale_ids:
+        db.execute(text(_LOCK_SHARED), {"ids": list(sale_ids)})
+        db.execute(
+            text(_UPSERT.format(grain=_GRAIN, measures=_VOID_MEASURES)),
+            {"ids": list(sale_ids), "tz": settings.ANALYTICS_TIMEZONE},
+        )
+
+
+def rebuild_tenant(db: Session, tenant_id: int) -> int:
+    """Recalcula sales_facts del tenant desde sales/sale_items (una transacción)."""
+    # espera a las ventas en curso del tenant y frena las nuevas hasta el commit (solo de
+    # este tenant): ninguna venta se pierde ni se cuenta dos veces
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext('sales_facts'), :tid)"), {"tid": tenant_id})
+    db.execute(text("DELETE FROM sales_facts WHERE tenant_id = :tid"), {"tid": tenant_id})
+    result = db.execute(
+        text(f"""
+            INSERT INTO sales_facts (
+                tenant_id, store_id, user_id, payment_method, sale_date, hour,
+                sales_count, total, units, voided_count, voided_total
+            )
+            SELECT {_GRAIN},
+                   COUNT(*) FILTER (WHERE NOT s.is_voided),
+                   COALESCE(SUM(s.total) FILTER (WHERE NOT s.is_voided), 0),
+                   COALESCE(SUM(i.units) FILTER (WHERE NOT s.is_voided), 0),
+                   COUNT(*) FILTER (WHERE s.is_voided),
+                   COALESCE(SUM(s.total) FILTER (WHERE s.is_voided), 0)
+            FROM sales s
+            LEFT JOIN (
+                SELECT si.sale_id, SUM(si.quantity) AS units
+                FROM sale_items si
+                JOIN sales s2 ON s2.id = si.sale_id
+                WHERE s2.tenant_id = :tid
+                GROUP BY si.sale_id
+            ) i ON i.sale_id = s.id
+            WHERE s.tenant_id = :tid
+            GROUP BY 1, 2, 3, 4, 5, 6
+        """),
+        {"tid": tenant_id, "tz": settings.ANALYTICS_TIMEZONE},
+    )
+    db.commit()
+    return result.rowcount
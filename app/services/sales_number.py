@@ -9,3 +9,11 @@ def generate_sale_number(db: Session, tenant_id: int) -> str:
     ).scalar_one()
     next_num = int(last_id) + 1
     return f"V-{next_num:06d}"
+
+
+def generate_sale_numbers(db: Session, tenant_id: int, count: int) -> list[str]:
+    # misma numeración que generate_sale_number, para `count` ventas consecutivas
+    last_id = db.execute(
+        select(func.coalesce(func.max(Sale.id), 0)).where(Sale.tenant_id == tenant_id)
+    ).scalar_one()
+    return [f"V-{int(last_id) + i:06d}" for i in range(1, count + 1)]
@@ -0,0 +1,146 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Totales corrientes del turno de caja. Cada venta/anulación hace un UPDATE de una
+# fila (cash_shifts) en la misma transacción: si la venta hace rollback, el total
+# también. El UPDATE bloquea la fila hasta el commit, así que cerrar el turno
+# (UPDATE ... WHERE closed_at IS NULL) espera a las ventas en curso y ninguna queda
+# fuera del reporte Z.
+#
+# Orden de locks en todas las rutas: primero la fila de cash_shifts y después las
+# celdas de sales_facts (record_sales / record_voids). Invertirlo arma deadlocks
+# entre una venta y una anulación de la misma hora.
+
+_ADD_SALES = """
+    UPDATE cash_shifts SET
+        ticket_count = ticket_count + :tickets,
+        cash_count = cash_count + :cash_count,
+        cash_total = cash_total + :cash_total,
+        yape_count = yape_count + :yape_count,
+        yape_total = yape_total + :yape_total
+    WHERE tenant_id = :tenant_id AND store_id = :store_id AND user_id = :user_id AND closed_at IS NULL
+    RETURNING id
+"""
+
+_ADD_VOID = """
+    UPDATE cash_shifts SET
+        voided_count = voided_count + 1,
+        voided_cash_total = voided_cash_total + :cash,
+        voided_yape_total = voided_yape_total + :yape
+    WHERE {where} AND closed_at IS NULL
+    RETURNING id
+"""
+
+
+def _measures(sales: list[tuple[str, Decimal | float]]) -> dict:
+    # Decimal(str()) para no arrastrar error de float en los totales del día
+    cash = [Decimal(str(t)) for method, t in sales if method == "CASH"]
+    yape = [Decimal(str(t)) for method, t in sales if method == "YAPE"]
+    return {
+        "tickets": len(sales),
+        "cash_count": len(cash),
+        "cash_total": sum(cash, Decimal("0")),
+        "yape_count": len(yape),
+        "yape_total": sum(yape, Decimal("0")),
+    }
+
+
+def record_shift_sales(
+    db: Session, tenant_id: int, store_id: int, user_id: int, sales: list[tuple[str, Decimal | float]]
+) -> int | None:
+    """Suma (payment_method, total) al turno abierto del cajero. Devuelve su id (None: sin turno)."""
+    if not sales:
+        return None
+    return db.execute(
+        text(_ADD_SALES),
+        {"tenant_id": tenant_id, "store_id": store_id, "user_id": user_id, **_measures(sales)},
+    ).scalar_one_or_none()
+
+
+def record_shift_batch(db: Session, tenant_id: int, user_id: int, sales: list) -> dict[int, int]:
+    """Un UPDATE por tienda para un batch de ventas. Devuelve {store_id: shift_id}."""
+    by_store: dict[int, list] = defaultdict(list)
+    for sale in sales:
+        by_store[sale.store_id].append((sale.payment_method, sale.total))
+    shifts = {}
+    # orden fijo de tiendas: dos batches concurrentes no se bloquean en cruz
+    for store_id in sorted(by_store):
+        shift_id = record_shift_sales(db, tenant_id, store_id, user_id, by_store[store_id])
+        if shift_id is not None:
+            shifts[store_id] = shift_id
+    return shifts
+
+
+def record_shift_void(db: Session, sale, user_id: int) -> int | None:
+    """Anulación: va al turno de la venta si sigue abierto; si no, al turno abierto de quien
+    anula en esa tienda y, si no tiene, al turno abierto más antiguo de la tienda.
+
+    El efectivo devuelto sale de una caja abierta, no de un turno ya cuadrado. Si la venta
+    era de un turno y la tienda no tiene ninguno abierto, 409: la devolución no quedaría
+    en ningún reporte Z.
+    """
+    amounts = {
+        "cash": sale.total if sale.payment_method == "CASH" else 0,
+        "yape": sale.total if sale.payment_method == "YAPE" else 0,
+    }
+    if sale.shift_id is not None:
+        shift_id = db.execute(
+            text(_ADD_VOID.format(where="id = :shift_id")), {"shift_id": sale.shift_id, **amounts}
+        ).scalar_one_or_none()
+        if shift_id is not None:
+            return shift_id
+    params = {"tenant_id": sale.tenant_id, "store_id": sale.store_id, "user_id": user_id, **amounts}
+    shift_id = db.execute(
+        text(_ADD_VOID.format(where="tenant_id = :tenant_id AND store_id = :store_id AND user_id = :user_id")),
+        params,
+    ).scalar_one_or_none()
+    if shift_id is None:
+        shift_id = db.execute(
+            text(_ADD_VOID.format(where="""id = (
+                SELECT id FROM cash_shifts
+                WHERE tenant_id = :tenant_id AND store_id = :store_id AND closed_at IS NULL
+                ORDER BY opened_at, id LIMIT 1
+            )""")),
+            params,
+        ).scalar_one_or_none()
+    if shift_id is None and sale.shift_id is not None:
+        raise HTTPException(status_code=409, detail="No open shift in this store to register the refund")
+    return shift_id
+
+
+def z_report(shift) -> dict:
+    # todo sale de la fila del turno: O(1) sin importar cuántos tickets tuvo
+    zero = Decimal("0")
+    opening = shift.opening_cash or zero
+    expected = opening + shift.cash_total - shift.voided_cash_total
+    counted = shift.counted_cash
+    return {
+        "shift_id": shift.id,
+        "store_id": shift.store_id,
+        "user_id": shift.user_id,
+        "opened_at": shift.opened_at,
+        "closed_at": shift.closed_at,
+        "closed_by": shift.closed_by,
+        "is_open": shift.closed_at is None,
+        "ticket_count": shift.ticket_count,
+        "cash_count": shift.cash_count,
+        "cash_total": float(shift.cash_total),
+        "yape_count": shift.yape_count,
+        "yape_total": float(shift.yape_total),
+        "gross_total": float(shift.cash_total + shift.yape_total),
+        "voided_count": shift.voided_count,
+        "voided_cash_total": float(shift.voided_cash_total),
+        "voided_yape_total": float(shift.voided_yape_total),
+        "net_total": float(
+            shift.cash_total + shift.yape_total - shift.voided_cash_total - shift.voided_yape_total
+        ),
+        "opening_cash": float(opening),
+        "expected_cash": float(expected),
+        "counted_cash": float(counted) if counted is not None else None,
+        "cash_difference": float(counted - expected) if counted is not None else None,
+        "close_note": shift.close_note,
+    }
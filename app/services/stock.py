@@ -14,3 +14,22 @@ def get_stock(db: Session, tenant_id: int, store_id: int, product_id: int) -> in
         )
     ).scalar_one()
     return int(total)
+
+
+def stock_subquery(tenant_id: int, store_id: int, product_ids=None):
+    # stock por producto de una tienda en un solo GROUP BY.
+    # product_ids: lista de ids o un select() de ids (se filtra dentro del GROUP BY)
+    stmt = (
+        select(
+            InventoryMovement.product_id.label("product_id"),
+            func.sum(InventoryMovement.quantity * InventoryMovement.direction).label("stock"),
+        )
+        .where(
+            InventoryMovement.tenant_id == tenant_id,
+            InventoryMovement.store_id == store_id,
+        )
+        .group_by(InventoryMovement.product_id)
+    )
+    if product_ids is not None:
+        stmt = stmt.where(InventoryMovement.product_id.in_(product_ids))
+    return stmt.subquery()
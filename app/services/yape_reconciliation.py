@@ -0,0 +1,181 @@
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+COPY_CHUNK_ROWS = 50_000
+MAX_INVALID_ROWS_REPORTED = 100
+
+# nombres de columna aceptados en el extracto (se comparan en minúsculas)
+OPERATION_COLUMNS = ("operation_number", "numero_operacion", "nro_operacion", "operacion")
+AMOUNT_COLUMNS = ("amount", "monto", "importe")
+
+
+def _find_column(header: list[str], names: tuple[str, ...]) -> int:
+    normalized = [h.strip().lower() for h in header]
+    for name in names:
+        if name in normalized:
+            return normalized.index(name)
+    raise HTTPException(status_code=400, detail=f"Statement must have one of the columns: {', '.join(names)}")
+
+
+def load_statement(db: Session, file: BinaryIO) -> dict:
+    """Copia el CSV a la tabla temporal yape_statement (se borra al terminar la transacción).
+
+    Se lee línea a línea y se envía con COPY por bloques: la memoria no depende
+    del tamaño del archivo.
+    """
+    # conexión DBAPI de la sesión (misma transacción): COPY de psycopg2
+    raw = db.connection().connection
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    header = next(reader, None)
+    if not header:
+        raise HTTPException(status_code=400, detail="Empty statement")
+    op_col = _find_column(header, OPERATION_COLUMNS)
+    amount_col = _find_column(header, AMOUNT_COLUMNS)
+
+    invalid = []
+    loaded = 0
+    with raw.cursor() as cur:
+        cur.execute(
+            "CREATE TEMP TABLE yape_statement ("
+            " row_no integer NOT NULL, operation_number varchar(60) NOT NULL, amount numeric(12, 2) NOT NULL"
+            ") ON COMMIT DROP"
+        )
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        pending = 0
+        for row_no, row in enumerate(reader, start=2):
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            try:
+                op = row[op_col].strip()
+                amount = Decimal(row[amount_col].strip().replace(",", ""))
+                if not op or len(op) > 60 or not amount.is_finite():
+                    raise ValueError
+            except (IndexError, ValueError, InvalidOperation):
+                if len(invalid) < MAX_INVALID_ROWS_REPORTED:
+                    invalid.append(row_no)
+                continue
+            writer.writerow((row_no, op, f"{amount:.2f}"))
+            pending += 1
+            loaded += 1
+            if pending == COPY_CHUNK_ROWS:
+                buf.seek(0)
+                cur.copy_expert("COPY yape_statement FROM STDIN WITH (FORMAT csv)", buf)
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                pending = 0
+        if pending:
+            buf.seek(0)
+            cur.copy_expert("COPY yape_statement FROM STDIN WITH (FORMAT csv)", buf)
+
+        # índice + estadísticas: el planner elige hash join con tamaños reales
+        cur.execute("CREATE INDEX ON yape_statement (operation_number)")
+        cur.execute("ANALYZE yape_statement")
+
+    return {"rows_loaded": loaded, "invalid_rows": invalid}
+
+
+_RECONCILE_SQL = """
+    WITH s AS (
+        SELECT id, number, store_id, created_at, total, yape_operation_number AS op
+        FROM sales
+        WHERE tenant_id = :tenant_id
+          AND yape_operation_number IS NOT NULL
+          AND payment_method = 'YAPE'
+          AND NOT is_voided
+          {filters}
+    )
+    SELECT s.id AS sale_id, s.number, s.store_id, s.created_at, s.total, s.op AS sale_op,
+           t.row_no, t.operation_number AS statement_op, t.amount
+    FROM s
+    FULL OUTER JOIN yape_statement t ON t.operation_number = s.op
+"""
+
+
+def reconcile(
+    db: Session,
+    tenant_id: int,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    store_id: int | None = None,
+) -> dict:
+    filters = []
+    params: dict = {"tenant_id": tenant_id}
+    if date_from:
+        filters.append("AND created_at >= :date_from")
+        params["date_from"] = date_from
+    if date_to:
+        filters.append("AND created_at <= :date_to")
+        params["date_to"] = date_to
+    if store_id is not None:
+        filters.append("AND store_id = :store_id")
+        params["store_id"] = store_id
+
+    rows = db.execute(text(_RECONCILE_SQL.format(filters=" ".join(filters))), params).mappings().all()
+
+    matched, mismatch, missing_in_statement, missing_in_system = [], [], [], []
+    sales_by_op: dict[str, set[int]] = {}
+    statement_rows_by_op: dict[str, set[int]] = {}
+
+    # con operaciones duplicadas el join repite filas (cada venta × cada línea del
+    # extracto con ese número); se reportan además en duplicate_*
+    for r in rows:
+        sale = None
+        if r["sale_id"] is not None:
+            sale = {
+                "sale_id": r["sale_id"],
+                "number": r["number"],
+                "store_id": r["store_id"],
+                "created_at": r["created_at"],
+                "total": float(r["total"]),
+                "operation_number": r["sale_op"],
+            }
+            sales_by_op.setdefault(r["sale_op"], set()).add(r["sale_id"])
+        line = None
+        if r["row_no"] is not None:
+            line = {"row": r["row_no"], "operation_number": r["statement_op"], "amount": float(r["amount"])}
+            statement_rows_by_op.setdefault(r["statement_op"], set()).add(r["row_no"])
+
+        if line is None:
+            missing_in_statement.append(sale)
+        elif sale is None:
+            missing_in_system.append(line)
+        elif r["total"] == r["amount"]:
+            matched.append({**sale, "statement_row": line["row"]})
+        else:
+            mismatch.append({**sale, "statement_row": line["row"], "statement_amount": line["amount"]})
+
+    # una operación Yape paga una sola venta: si aparece en varias, alguna está mal registrada
+    duplicate_sales = [
+        {"operation_number": op, "sale_ids": sorted(ids)}
+        for op, ids in sales_by_op.items() if len(ids) > 1
+    ]
+    duplicate_statement = [
+        {"operation_number": op, "rows": sorted(rows_)}
+        for op, rows_ in statement_rows_by_op.items() if len(rows_) > 1
+    ]
+
+    return {
+        "summary": {
+            "matched": len(matched),
+            "amount_mismatch": len(mismatch),
+            "missing_in_statement": len(missing_in_statement),
+            "missing_in_system": len(missing_in_system),
+            "duplicate_operation_numbers": len(duplicate_sales),
+            "duplicate_statement_operations": len(duplicate_statement),
+        },
+        "matched": matched,
+        "amount_mismatch": mismatch,
+        "missing_in_statement": missing_in_statement,
+        "missing_in_system": missing_in_system,
+        "duplicate_operation_numbers": duplicate_sales,
+        "duplicate_statement_operations": duplicate_statement,
+    }
@@ -0,0 +1,102 @@
+"""Compara el camino por defecto de /inventory/stock contra el fast path orjson.
+
+Uso:
+    python -m benchmarks.bench_fast_json --rows 30000
+
+- default: ProductStockResponse construidos a mano + validación contra
+  response_model + json.dumps (lo que hace FastAPI con JSONResponse)
+- fast:    filas -> dict -> orjson.dumps (app.core.responses.rows_response)
+
+No necesita base de datos: las filas se simulan con tuplas como las de SQLAlchemy.
+"""
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse
+from app.schemas.inventory import ProductStockResponse
+from benchmarks.common import run_metadata, write_results
+
+KEYS = ["product_id", "name", "barcode", "category", "price", "stock"]
+
+
+def make_rows(n: int) -> list[tuple]:
+    return [(i, f"Producto {i}", f"77{i:011d}", "Maquillaje", 19.9 + i % 50, i % 37) for i in range(1, n + 1)]
+
+
+def default_path(rows: list[tuple], adapter: TypeAdapter) -> bytes:
+    content = [
+        ProductStockResponse(
+            product_id=r[0], name=r[1], barcode=r[2], category=r[3], price=r[4], stock=int(r[5])
+        )
+        for r in rows
+    ]
+    # FastAPI: valida contra response_model, serializa a tipos JSON y json.dumps
+    validated = adapter.validate_python(content, from_attributes=True)
+    payload = adapter.dump_python(validated, mode="json")
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows: list[tuple], adapter: TypeAdapter) -> bytes:
+    return FastJSONResponse([dict(zip(KEYS, r)) for r in rows]).body
+
+
+def run_case(fn, rows, adapter, repeat: int) -> dict:
+    fn(rows, adapter)  # warmup
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        body = fn(rows, adapter)
+        times.append((time.perf_counter() - t0) * 1000)
+
+    tracemalloc.start()
+    fn(rows, adapter)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(times), 2),
+        "min_ms": round(min(times), 2),
+        "peak_mem_mb": round(peak / 1024 / 1024, 2),
+        "body_bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del fast path JSON")
+    parser.add_argument("--rows", type=int, default=30_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    adapter = TypeAdapter(list[ProductStockResponse])
+
+    # ambos caminos deben producir el mismo documento
+    assert orjson.loads(default_path(rows[:100], adapter)) == orjson.loads(fast_path(rows[:100], adapter))
+
+    default = run_case(default_path, rows, adapter, args.repeat)
+    fast = run_case(fast_path, rows, adapter, args.repeat)
+
+    print(f"{args.rows} filas")
+    print(f"  default: {default['median_ms']:>8.2f} ms  pico {default['peak_mem_mb']:>7.2f} MB")
+    print(f"  fast:    {fast['median_ms']:>8.2f} ms  pico {fast['peak_mem_mb']:>7.2f} MB")
+    print(f"  ahorro:  {default['median_ms'] - fast['median_ms']:>8.2f} ms "
+          f"({default['median_ms'] / fast['median_ms']:.1f}x), "
+          f"{default['peak_mem_mb'] - fast['peak_mem_mb']:.2f} MB")
+
+    if args.output:
+        write_results(args.output, {
+            "meta": run_metadata({"rows": args.rows, "repeat": args.repeat}),
+            "default": default,
+            "fast": fast,
+        })
+
+
+if __name__ == "__main__":
+    main()
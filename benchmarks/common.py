@@ -0,0 +1,58 @@
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    # percentil por interpolación lineal (valores ya ordenados)
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = math.floor(k)
+    hi = math.ceil(k)
+    if lo == hi:
+        return sorted_values[int(k)]
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def latency_summary(latencies_ms: list[float]) -> dict:
+    values = sorted(latencies_ms)
+    return {
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(config: dict) -> dict:
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": config,
+    }
+
+
+def write_results(path: str, results: dict) -> None:
+    # sort_keys + indent: el archivo se puede diffear entre commits
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
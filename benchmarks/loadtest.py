@@ -0,0 +1,266 @@
+"""Load test del workload POS contra la app real (uvicorn + Postgres local).
+
+Uso:
+    uvicorn main:app --workers 4
+    python -m benchmarks.loadtest --email admin@demo.com --password 'Admin123!' \\
+        --store-id 1 --concurrency 20 --duration 60 --output loadtest.json
+
+    # comparar contra una corrida anterior
+    python -m benchmarks.loadtest ... --baseline loadtest_main.json
+
+El usuario debe tener rol ADMIN (crea y anula ventas). La tienda necesita stock
+(ver app/scripts/generate_dataset.py); las ventas rechazadas por stock cuentan
+como error del endpoint.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.common import latency_summary, load_results, run_metadata, write_results
+
+SCENARIOS = ("login", "scan_product", "scan_stock", "create_sale", "void_sale", "dashboard")
+DEFAULT_MIX = "scan_product=35,scan_stock=30,create_sale=15,dashboard=10,login=5,void_sale=5"
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def record(self, endpoint: str, started: float, status: int | None):
+        if not self.recording:
+            return
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        key = str(status) if status is not None else "exception"
+        self.statuses[endpoint][key] += 1
+        if status is None or status >= 400:
+            self.errors[endpoint] += 1
+
+
+class Workload:
+    def __init__(self, args, client: httpx.AsyncClient, stats: Stats):
+        self.args = args
+        self.client = client
+        self.stats = stats
+        self.token: str | None = None
+        self.products: list[dict] = []
+        self.sale_ids: list[int] = []
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            resp = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, started, None)
+            return None
+        self.stats.record(endpoint, started, resp.status_code)
+        return resp
+
+    async def setup(self, rng: random.Random):
+        resp = await self.client.post(
+            "/auth/login", json={"email": self.args.email, "password": self.args.password}
+        )
+        resp.raise_for_status()
+        self.token = resp.json()["access_token"]
+
+        resp = await self.client.get("/products", headers=self.headers)
+        resp.raise_for_status()
+        active = [p for p in resp.json() if p["is_active"]]
+        if not active:
+            raise SystemExit("El tenant no tiene productos activos")
+        active.sort(key=lambda p: p["id"])
+        self.products = rng.sample(active, min(self.args.catalog_sample, len(active)))
+
+    # ---- escenarios ----
+
+    async def login(self, rng: random.Random):
+        await self.request(
+            "POST /auth/login", "POST", "/auth/login",
+            json={"email": self.args.email, "password": self.args.password},
+        )
+
+    async def scan_product(self, rng: random.Random):
+        p = rng.choice(self.products)
+        await self.request(
+            "GET /products/by-barcode/{barcode}", "GET",
+            f"/products/by-barcode/{p['barcode']}", headers=self.headers,
+        )
+
+    async def scan_stock(self, rng: random.Random):
+        p = rng.choice(self.products)
+        await self.request(
+            "GET /inventory/stock/by-barcode", "GET", "/inventory/stock/by-barcode",
+            params={"store_id": self.args.store_id, "barcode": p["barcode"]},
+            headers=self.headers,
+        )
+
+    async def create_sale(self, rng: random.Random):
+        lines = rng.sample(self.products, min(rng.randint(1, 4), len(self.products)))
+        payment = "YAPE" if rng.random() < 0.35 else "CASH"
+        body = {
+            "store_id": self.args.store_id,
+            "payment_method": payment,
+            "yape_operation_number": f"{rng.randrange(10**8):08d}" if payment == "YAPE" else None,
+            "items": [{"product_id": p["id"], "quantity": rng.randint(1, 2)} for p in lines],
+        }
+        resp = await self.request("POST /sales", "POST", "/sales", json=body, headers=self.headers)
+        if resp is not None and resp.status_code == 201:
+            self.sale_ids.append(resp.json()["id"])
+
+    async def void_sale(self, rng: random.Random):
+        if not self.sale_ids:
+            # aún no hay ventas propias que anular
+            await self.create_sale(rng)
+            return
+        sale_id = self.sale_ids.pop(rng.randrange(len(self.sale_ids)))
+        await self.request(
+            "POST /sales/{sale_id}/void", "POST", f"/sales/{sale_id}/void",
+            json={"reason": "loadtest"}, headers=self.headers,
+        )
+
+    async def dashboard(self, rng: random.Random):
+        await self.request(
+            "GET /dashboard/summary", "GET", "/dashboard/summary",
+            params={"store_id": self.args.store_id}, headers=self.headers,
+        )
+
+
+def parse_mix(mix: str) -> list[tuple[str, float]]:
+    out = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Escenario desconocido: {name}")
+        out.append((name, float(weight or 1)))
+    return out
+
+
+async def worker(idx: int, workload: Workload, mix, deadline: float, budget: list[int], args):
+    rng = random.Random(args.seed * 1000 + idx)
+    names = [n for n, _ in mix]
+    weights = [w for _, w in mix]
+    while time.perf_counter() < deadline:
+        if budget is not None:
+            if budget[0] <= 0:
+                return
+            budget[0] -= 1
+        scenario = rng.choices(names, weights=weights)[0]
+        await getattr(workload, scenario)(rng)
+        if args.think_ms:
+            await asyncio.sleep(args.think_ms / 1000)
+
+
+async def run(args) -> dict:
+    stats = Stats()
+    mix = parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        workload = Workload(args, client, stats)
+        await workload.setup(random.Random(args.seed))
+
+        if args.warmup > 0:
+            warm_deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(
+                worker(i, workload, mix, warm_deadline, None, args) for i in range(args.concurrency)
+            ))
+
+        stats.recording = True
+        budget = [args.requests] if args.requests else None
+        started = time.perf_counter()
+        deadline = started + (args.duration if args.duration else float("inf"))
+        await asyncio.gather(*(
+            worker(i, workload, mix, deadline, budget, args) for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    total_requests = 0
+    total_errors = 0
+    for endpoint, latencies in sorted(stats.latencies.items()):
+        count = len(latencies)
+        errors = stats.errors[endpoint]
+        total_requests += count
+        total_errors += errors
+        endpoints[endpoint] = {
+            "count": count,
+            "errors": errors,
+            "error_rate": round(errors / count, 4),
+            "throughput_rps": round(count / elapsed, 2),
+            "status_codes": dict(stats.statuses[endpoint]),
+            **latency_summary(latencies),
+        }
+
+    config = {k: v for k, v in vars(args).items() if k not in ("password", "output", "baseline")}
+    return {
+        "meta": run_metadata(config),
+        "totals": {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total_requests,
+            "errors": total_errors,
+            "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+            "throughput_rps": round(total_requests / elapsed, 2),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def print_report(results: dict, baseline: dict | None = None):
+    header = f"{'endpoint':40} {'count':>7} {'err%':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, e in results["endpoints"].items():
+        line = (
+            f"{endpoint:40} {e['count']:>7} {e['error_rate'] * 100:>6.2f} {e['throughput_rps']:>8.1f} "
+            f"{e['p50_ms']:>8.1f} {e['p95_ms']:>8.1f} {e['p99_ms']:>8.1f}"
+        )
+        if baseline and endpoint in baseline.get("endpoints", {}):
+            old = baseline["endpoints"][endpoint]["p95_ms"]
+            if old:
+                line += f"   p95 {((e['p95_ms'] - old) / old) * 100:+.1f}%"
+        print(line)
+    t = results["totals"]
+    print(f"\n{t['requests']} requests en {t['elapsed_s']}s -> {t['throughput_rps']} req/s, "
+          f"errores {t['error_rate'] * 100:.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test del workload POS")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--store-id", type=int, required=True)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="escenario=peso,... (ej: scan_product=50,create_sale=10)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="segundos (0 = usar --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="total de requests (0 = usar --duration)")
+    parser.add_argument("--warmup", type=float, default=5, help="segundos sin registrar métricas")
+    parser.add_argument("--think-ms", type=float, default=0)
+    parser.add_argument("--catalog-sample", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="loadtest_results.json")
+    parser.add_argument("--baseline", default=None, help="resultado previo para comparar p95")
+    args = parser.parse_args()
+
+    if not args.duration and not args.requests:
+        parser.error("--duration o --requests debe ser > 0")
+
+    results = asyncio.run(run(args))
+    write_results(args.output, results)
+    print_report(results, load_results(args.baseline) if args.baseline else None)
+    print(f"Resultados: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Microbenchmarks deterministas de las funciones calientes.
+
+Uso (contra una base local sembrada, ver app/scripts/generate_dataset.py):
+    python -m benchmarks.microbench --save-baseline      # guarda la línea base
+    python -m benchmarks.microbench --compare            # falla (exit 1) si algo empeora > --tolerance
+
+Cada benchmark se calienta, se mide en --repeat rondas de N llamadas con el GC
+apagado, y se reporta la mediana por llamada. Los datos de serialización son
+sintéticos y fijos; los de base de datos salen de la última fila del kardex.
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.dependencies import get_current_user
+from app.core.security import create_access_token
+from app.models.inventory_movement import InventoryMovement
+from app.models.user import User
+from app.schemas.inventory import ProductStockResponse
+from app.schemas.product import ProductResponse
+from app.schemas.sales import SaleResponse
+from app.services.sales_number import generate_sale_number
+from app.services.stock import get_stock
+from benchmarks.common import load_results, run_metadata, write_results
+
+DEFAULT_BASELINE = ".benchmarks/microbench_baseline.json"
+SERIALIZATION_SIZES = (10, 1_000, 50_000)
+
+
+def measure(fn, number: int, repeat: int, warmup: int = 3) -> dict:
+    for _ in range(warmup):
+        fn()
+    rounds = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            rounds.append((time.perf_counter() - t0) / number * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "median_us": round(statistics.median(rounds), 3),
+        "min_us": round(min(rounds), 3),
+        "stdev_us": round(statistics.stdev(rounds), 3) if len(rounds) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+# =========================
+# datos sintéticos fijos
+# =========================
+
+def _products(n: int) -> list:
+    return [
+        SimpleNamespace(
+            id=i, name=f"Producto {i}", category="Maquillaje", barcode=f"77{i:011d}",
+            price=19.9 + i % 50, image_url=None, is_active=True,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def _product_stock(n: int) -> list[dict]:
+    return [
+        {"product_id": i, "name": f"Producto {i}", "barcode": f"77{i:011d}",
+         "category": "Maquillaje", "price": 19.9 + i % 50, "stock": i % 37}
+        for i in range(1, n + 1)
+    ]
+
+
+def _sales(n: int) -> list:
+    return [
+        SimpleNamespace(
+            id=i, number=f"V-{i:06d}", store_id=1, payment_method="CASH" if i % 3 else "YAPE",
+            yape_operation_number=None if i % 3 else f"{i:08d}", total=59.7,
+            items=[
+                SimpleNamespace(product_id=p, quantity=1 + p % 3, unit_price=19.9, subtotal=19.9 * (1 + p % 3))
+                for p in range(1, 1 + i % 4 + 1)
+            ],
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def serialization_benchmarks(repeat: int) -> dict:
+    # mismo camino que FastAPI con response_model: validar + serializar a JSON
+    cases = {
+        "ProductResponse": (TypeAdapter(list[ProductResponse]), _products),
+        "ProductStockResponse": (TypeAdapter(list[ProductStockResponse]), _product_stock),
+        "SaleResponse": (TypeAdapter(list[SaleResponse]), _sales),
+    }
+    out = {}
+    for name, (adapter, factory) in cases.items():
+        for size in SERIALIZATION_SIZES:
+            rows = factory(size)
+            number = max(1, 20_000 // size)
+            out[f"serialize[{name}x{size}]"] = measure(
+                lambda: adapter.dump_json(adapter.validate_python(rows, from_attributes=True)),
+                number=number, repeat=repeat,
+            )
+    return out
+
+
+def db_benchmarks(repeat: int) -> dict:
+    db = SessionLocal()
+    try:
+        mv = db.execute(
+            select(InventoryMovement).order_by(InventoryMovement.id.desc()).limit(1)
+        ).scalar_one_or_none()
+        if mv is None:
+            raise SystemExit("La base no tiene movimientos; ejecuta app/scripts/generate_dataset.py")
+        user = db.execute(
+            select(User).where(User.tenant_id == mv.tenant_id, User.is_active == True).order_by(User.id).limit(1)
+        ).scalar_one()
+
+        token = create_access_token({"sub": str(user.id), "tenant_id": user.tenant_id, "role_id": user.role_id})
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        claims = {"sub": str(user.id), "tenant_id": user.tenant_id, "role_id": user.role_id}
+        tenant_id, store_id, product_id = mv.tenant_id, mv.store_id, mv.product_id
+
+        return {
+            "get_stock": measure(lambda: get_stock(db, tenant_id, store_id, product_id), number=50, repeat=repeat),
+            "generate_sale_number": measure(lambda: generate_sale_number(db, tenant_id), number=50, repeat=repeat),
+            "get_current_user": measure(lambda: get_current_user(credentials, db), number=50, repeat=repeat),
+            "create_access_token": measure(
+                lambda: create_access_token(claims, expires_delta=timedelta(minutes=60)), number=2_000, repeat=repeat,
+            ),
+        }
+    finally:
+        db.close()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    print(f"{'benchmark':45} {'baseline µs':>12} {'actual µs':>12} {'delta':>8}")
+    for name, cur in results["benchmarks"].items():
+        old = baseline.get("benchmarks", {}).get(name)
+        if not old:
+            print(f"{name:45} {'-':>12} {cur['median_us']:>12.2f}      new")
+            continue
+        delta = (cur["median_us"] - old["median_us"]) / old["median_us"]
+        flag = "  REGRESSION" if delta > tolerance else ""
+        print(f"{name:45} {old['median_us']:>12.2f} {cur['median_us']:>12.2f} {delta * 100:>+7.1f}%{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks de servicios y serializadores")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--only", choices=["db", "serialization"], default=None)
+    parser.add_argument("--output", default=None, help="guardar resultados en JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="regresión permitida (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    benchmarks = {}
+    if args.only in (None, "db"):
+        benchmarks.update(db_benchmarks(args.repeat))
+    if args.only in (None, "serialization"):
+        benchmarks.update(serialization_benchmarks(args.repeat))
+
+    results = {
+        "meta": run_metadata({"repeat": args.repeat, "only": args.only}),
+        "benchmarks": benchmarks,
+    }
+
+    if args.output:
+        write_results(args.output, results)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        write_results(args.baseline, results)
+        print(f"Línea base guardada en {args.baseline} ({datetime.now():%Y-%m-%d %H:%M})")
+
+    if args.compare:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regresiones sobre {args.tolerance * 100:.0f}%")
+            sys.exit(1)
+    elif not args.save_baseline:
+        for name, r in benchmarks.items():
+            print(f"{name:45} {r['median_us']:>12.2f} µs  (min {r['min_us']:.2f}, ±{r['stdev_us']:.2f})")
+
+
+if __name__ == "__main__":
+    main()
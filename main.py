@@ -1,4 +1,6 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from app.core.idempotency import idempotency_middleware
+from app.core.request_context import begin_request, end_request
 from app.routers.auth import router as auth_router
 from app.routers.admin import router as admin_router
 from app.routers.stores import router as stores_router
@@ -8,10 +10,31 @@ from app.routers.inventory import router as inventory_router
 from app.routers.sales import router as sales_router
 from app.routers.tenants import router as tenants_router
 from app.routers.dashboard import router as dashboard_router
+from app.routers.scan import router as scan_router
+from app.routers.exports import router as exports_router
+from app.routers.analytics import router as analytics_router
+from app.routers.reports import router as reports_router
+from app.routers.reconciliation import router as reconciliation_router
+from app.routers.shifts import router as shifts_router
+from app.routers.jobs import router as jobs_router
 
 
 app = FastAPI(title="Cosmetica SaaS API")
 
+# Idempotency-Key en POST/PUT/PATCH/DELETE (queda dentro del request context)
+app.middleware("http")(idempotency_middleware)
+
+
+@app.middleware("http")
+async def request_context_middleware(request: Request, call_next):
+    # ruta/tenant disponibles para el slow query log
+    token = begin_request(request.method, request.scope)
+    try:
+        return await call_next(request)
+    finally:
+        end_request(token)
+
+
 app.include_router(auth_router)
 app.include_router(admin_router)
 app.include_router(stores_router)
@@ -21,6 +44,13 @@ app.include_router(inventory_router)
 app.include_router(sales_router)
 app.include_router(tenants_router)
 app.include_router(dashboard_router)
+app.include_router(scan_router)
+app.include_router(exports_router)
+app.include_router(analytics_router)
+app.include_router(reports_router)
+app.include_router(reconciliation_router)
+app.include_router(shifts_router)
+app.include_router(jobs_router)
 
 @app.get("/")
 def root():